@@ -0,0 +1,74 @@
+"""
+Utterance-to-action cache for Friday Assistant
+Remembers the fully resolved action for recent transcripts so repeated commands
+skip intent parsing, fuzzy matching and the app/folder lookup
+"""
+
+import os
+import re
+import threading
+from collections import OrderedDict
+
+
+def normalize_transcript(text):
+    """Lowercase, drop punctuation Whisper adds and collapse whitespace"""
+    text = re.sub(r"[^\w\s']", " ", text.lower())
+    return " ".join(text.split())
+
+
+class ActionCache:
+    """Bounded LRU from normalized transcript to resolved action dict
+
+    An action may carry a 'path'; entries whose path no longer exists are dropped
+    on lookup. Call invalidate() whenever APP_MAP or FOLDER_MAP changes.
+    """
+    def __init__(self, maxsize=64):
+        self.maxsize = maxsize
+        self.entries = OrderedDict()
+        self.lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.stale = 0
+        self.evictions = 0
+
+    def get(self, text):
+        key = normalize_transcript(text)
+        with self.lock:
+            action = self.entries.get(key)
+            if action is None:
+                self.misses += 1
+                return None
+            path = action.get('path')
+            if path and os.path.isabs(path) and not os.path.exists(path):
+                del self.entries[key]
+                self.stale += 1
+                self.misses += 1
+                return None
+            self.entries.move_to_end(key)
+            self.hits += 1
+            return dict(action)
+
+    def put(self, text, action):
+        key = normalize_transcript(text)
+        with self.lock:
+            self.entries[key] = dict(action)
+            self.entries.move_to_end(key)
+            while len(self.entries) > self.maxsize:
+                self.entries.popitem(last=False)
+                self.evictions += 1
+
+    def invalidate(self):
+        with self.lock:
+            self.entries.clear()
+
+    def stats(self):
+        with self.lock:
+            lookups = self.hits + self.misses
+            return {
+                'hits': self.hits,
+                'misses': self.misses,
+                'stale': self.stale,
+                'evictions': self.evictions,
+                'size': len(self.entries),
+                'hit_rate': round(self.hits / lookups, 3) if lookups else 0.0,
+            }
@@ -3,7 +3,7 @@ import time
 import threading
 import sounddevice as sd
 import pyttsx3
-from difflib import get_close_matches
+from difflib import get_close_matches, SequenceMatcher
 import sys
 import numpy as np
 from datetime import datetime
@@ -40,67 +40,198 @@ except ImportError:
     REGISTRY_AVAILABLE = False
     print("⚠️  winreg not available - registry search disabled")
 
-try:
-    from pycaw.pycaw import AudioUtilities, IAudioEndpointVolume
-    from comtypes import CLSCTX_ALL
-    from ctypes import cast, POINTER
-    from ctypes.wintypes import DWORD
-    AUDIO_CONTROL_AVAILABLE = True
-except ImportError:
-    AUDIO_CONTROL_AVAILABLE = False
+from volume_control import VolumeSession, PYCAW_AVAILABLE as AUDIO_CONTROL_AVAILABLE
+if not AUDIO_CONTROL_AVAILABLE:
     print("⚠️  pycaw not available - volume control features disabled")
 
 from config import *
 from logger import setup_logging
-from elevenlabs_voice import speak_with_elevenlabs, is_elevenlabs_ready
+from elevenlabs_voice import (speak_with_elevenlabs, is_elevenlabs_ready, prerender_with_elevenlabs,
+                              warm_up_elevenlabs, elevenlabs_voice)
+from file_index import FileIndex
+from index_watcher import IndexWatcher
+from crawler import crawl, CrawlRules, DEFAULT_EXCLUDES as DEFAULT_CRAWL_EXCLUDES
+from launcher_index import LauncherIndex, default_sources
+from command_host import CommandHost, PowerShellTransport
+from metrics_sampler import MetricsSampler
+from screenshot_writer import ScreenshotWriter
+from usage_store import UsageStore
+from launch_predictor import LaunchPredictor
+from action_cache import ActionCache
+from speech_queue import SpeechQueue, URGENT, HIGH, NORMAL, LOW
+from tts_pipeline import split_segments
+from tts_failover import FailoverSpeaker, CircuitBreaker
+from local_tts import LocalTTSWorker, speech_timeout
+from session_profiler import SessionProfiler, parse_request as parse_profile_request
+from performance import PerformanceSettings
 
 logger = setup_logging()
 
+# On-demand profiling: FRIDAY_PROFILE=5 (next 5 commands) or FRIDAY_PROFILE=30s, the config flag, or "start profiling"
+session_profiler = SessionProfiler(PROFILE_DIR)
+_profile_request = parse_profile_request(os.environ.get("FRIDAY_PROFILE"))
+if _profile_request:
+    session_profiler.start(*_profile_request)
+elif PROFILE_ON_START:
+    session_profiler.start(PROFILE_UTTERANCES, PROFILE_SECONDS)
+
+# Tuning values come from the active performance profile plus this machine's overrides file
+perf = PerformanceSettings(PERFORMANCE_PROFILES, PERFORMANCE_PROFILE, PERFORMANCE_OVERRIDES_FILE,
+                           poll_interval=PERFORMANCE_POLL_INTERVAL)
+
+whisper_models = {}  # model size -> loaded model, for the sizes currently in use
+whisper_models_lock = threading.Lock()
+
+def load_whisper_models():
+    """Load the profile's wake and command models, reusing ones already loaded"""
+    global wake_word_model, command_model, whisper_models
+    with whisper_models_lock:
+        wake_name, command_name = perf.WHISPER_WAKE_MODEL, perf.WHISPER_COMMAND_MODEL
+        models = {}
+        for name, role in ((wake_name, "wake word detection"), (command_name, "command recognition")):
+            if name not in models:
+                if name in whisper_models:
+                    models[name] = whisper_models[name]
+                else:
+                    print(f"Loading {name} model for {role}...")
+                    models[name] = whisper.load_model(name)
+        # Swap both at once; sizes no longer used are freed
+        wake_word_model, command_model = models[wake_name], models[command_name]
+        whisper_models = models
+
 # Load Whisper models
 print("Loading Whisper models...")
-print("Loading tiny model for wake word detection...")
-wake_word_model = whisper.load_model(WHISPER_WAKE_MODEL)
-print("Loading base model for command recognition...")
-command_model = whisper.load_model(WHISPER_COMMAND_MODEL)
+load_whisper_models()
 print("Whisper models loaded successfully!")
 
 SEARCH_ROOT = os.path.expanduser("~")
 
+# Shared pruning rules for every directory crawl
+CRAWL_RULES = CrawlRules(excludes=DEFAULT_CRAWL_EXCLUDES | set(CRAWL_EXCLUDES))
+
+# Persistent filename index - built in the background on first run
+file_index = FileIndex(FILE_INDEX_PATH, SEARCH_ROOT, rules=CRAWL_RULES, workers=CRAWL_WORKERS)
+if not file_index.is_ready():
+    print("Building file index in background...")
+    file_index.build_async()
+
 # === IMMEDIATE IMPACT IMPROVEMENTS ===
 
 class AppCache:
-    """Caching system for discovered apps and folders"""
+    """Stale-while-revalidate cache for discovered apps and folders
+    
+    Each entry keeps its path and mtime. The cached maps are served at startup
+    straight away and revalidated against the disk in the background.
+    """
     def __init__(self):
         self.cache_file = "app_cache.json"
         self.cache_age_limit = 3600  # 1 hour
+        self.lock = threading.Lock()
         self.cache = self.load_cache()
     
+    @staticmethod
+    def _entry_mtime(path):
+        # Built-ins like "notepad.exe" are resolved by Windows, not by path
+        if not os.path.isabs(path):
+            return None
+        try:
+            return os.stat(path).st_mtime
+        except OSError:
+            return -1
+    
     def load_cache(self):
         try:
             if os.path.exists(self.cache_file):
                 with open(self.cache_file, 'r') as f:
                     data = json.load(f)
-                    # Check if cache is still valid
-                    if time.time() - data.get('timestamp', 0) < self.cache_age_limit:
-                        return data
+                # Migrate the old {name: path} layout
+                for kind in ('apps', 'folders'):
+                    entries = data.get(kind, {})
+                    data[kind] = {
+                        name: entry if isinstance(entry, dict) else {'path': entry, 'mtime': None}
+                        for name, entry in entries.items()
+                    }
+                return data
             return {'timestamp': 0, 'apps': {}, 'folders': {}}
         except:
             return {'timestamp': 0, 'apps': {}, 'folders': {}}
     
+    def get_map(self, kind):
+        """Cached {name: path} map, served regardless of age"""
+        return {name: entry['path'] for name, entry in self.cache.get(kind, {}).items()}
+    
     def save_cache(self, apps, folders):
-        self.cache = {
-            'timestamp': time.time(),
-            'apps': apps,
-            'folders': folders
-        }
+        with self.lock:
+            self.cache = {
+                'timestamp': time.time(),
+                'apps': {name: {'path': path, 'mtime': self._entry_mtime(path)} for name, path in apps.items()},
+                'folders': {name: {'path': path, 'mtime': self._entry_mtime(path)} for name, path in folders.items()}
+            }
+            self._write()
+    
+    def _write(self):
+        # Write to a temp file and rename so a crash never leaves a half-written cache
         try:
-            with open(self.cache_file, 'w') as f:
+            tmp_file = self.cache_file + ".tmp"
+            with open(tmp_file, 'w') as f:
                 json.dump(self.cache, f)
+            os.replace(tmp_file, self.cache_file)
         except:
             pass
     
     def is_valid(self):
         return time.time() - self.cache.get('timestamp', 0) < self.cache_age_limit
+    
+    def diff(self, kind, discovered):
+        """Compare cached entries with a fresh discovery; returns (changed, removed)"""
+        cached = self.cache.get(kind, {})
+        changed = {}
+        for name, path in discovered.items():
+            entry = cached.get(name)
+            mtime = self._entry_mtime(path)
+            if not entry or entry['path'] != path or entry.get('mtime') != mtime:
+                changed[name] = {'path': path, 'mtime': mtime}
+        removed = [name for name in cached if name not in discovered]
+        return changed, removed
+    
+    def apply_diff(self, kind, changed, removed):
+        with self.lock:
+            entries = dict(self.cache.get(kind, {}))
+            entries.update(changed)
+            for name in removed:
+                entries.pop(name, None)
+            self.cache[kind] = entries
+    
+    def evict(self, kind, name):
+        """Drop a single entry whose path turned out to be gone"""
+        with self.lock:
+            entries = dict(self.cache.get(kind, {}))
+            if entries.pop(name, None) is not None:
+                self.cache[kind] = entries
+                self._write()
+    
+    def revalidate_async(self, discoverers, on_update):
+        """Rerun discovery in the background and report diffs via on_update(kind, changed, removed)"""
+        def run():
+            dirty = False
+            for kind, discover in discoverers.items():
+                try:
+                    changed, removed = self.diff(kind, discover())
+                except Exception as e:
+                    logger.warning(f"Background {kind} discovery failed: {e}")
+                    continue
+                if changed or removed:
+                    self.apply_diff(kind, changed, removed)
+                    on_update(kind, {name: entry['path'] for name, entry in changed.items()}, removed)
+                    dirty = True
+            with self.lock:
+                self.cache['timestamp'] = time.time()
+                if dirty:
+                    self._write()
+        
+        thread = threading.Thread(target=run, daemon=True, name="app-cache-revalidate")
+        thread.start()
+        return thread
 
 class VoiceActivityDetector:
     """Simple Voice Activity Detection to reduce CPU usage"""
@@ -120,6 +251,32 @@ class VoiceActivityDetector:
         # Return True if we detected voice recently
         return (time.time() - self.last_voice_time) < self.silence_duration
 
+# CPU, memory, disk and battery are sampled in the background into a rolling window
+metrics_sampler = MetricsSampler(interval=perf.METRICS_SAMPLE_INTERVAL, window=METRICS_WINDOW) if PSUTIL_AVAILABLE else None
+if metrics_sampler:
+    metrics_sampler.start()
+
+# Screenshots are compressed and saved on a background worker
+screenshot_writer = ScreenshotWriter(
+    image_format=SCREENSHOT_FORMAT,
+    compress_level=SCREENSHOT_COMPRESS_LEVEL,
+    max_queued=SCREENSHOT_MAX_QUEUED
+) if SCREENSHOT_AVAILABLE else None
+
+# Speaker endpoint is activated once and reused for every volume command
+volume_session = VolumeSession() if AUDIO_CONTROL_AVAILABLE else None
+
+# One long-lived PowerShell shared by all system commands (Windows only)
+command_host = CommandHost(PowerShellTransport()) if sys.platform == "win32" else None
+if command_host:
+    command_host.start_async()
+
+def run_powershell(cmd, timeout=10):
+    """Run a PowerShell command in the persistent host; returns CommandResult"""
+    if command_host is None:
+        raise OSError("PowerShell is only available on Windows")
+    return command_host.run(cmd, timeout=timeout)
+
 class SystemController:
     """Advanced system operations controller with graceful fallbacks"""
     
@@ -130,7 +287,7 @@ class SystemController:
             # Fallback: Use PowerShell
             try:
                 cmd = f"[Audio]::Volume = {level / 100.0}"
-                subprocess.run(["powershell", "-Command", cmd], capture_output=True, timeout=5)
+                run_powershell(cmd, timeout=5)
                 return True
             except:
                 # Final fallback: nircmd (if available)
@@ -141,16 +298,13 @@ class SystemController:
                     return False
         
         try:
-            devices = AudioUtilities.GetSpeakers()
-            interface = devices.Activate(IAudioEndpointVolume._iid_, CLSCTX_ALL, None)
-            volume = cast(interface, POINTER(IAudioEndpointVolume))
-            volume.SetMasterScalarVolume(level / 100.0, None)
+            volume_session.set(level)
             return True
         except:
             # Fallback to PowerShell method
             try:
                 cmd = f"[Audio]::Volume = {level / 100.0}"
-                subprocess.run(["powershell", "-Command", cmd], capture_output=True, timeout=5)
+                run_powershell(cmd, timeout=5)
                 return True
             except:
                 return False
@@ -162,10 +316,18 @@ class SystemController:
             return None  # Skip if no audio control available
         
         try:
-            devices = AudioUtilities.GetSpeakers()
-            interface = devices.Activate(IAudioEndpointVolume._iid_, CLSCTX_ALL, None)
-            volume = cast(interface, POINTER(IAudioEndpointVolume))
-            return int(volume.GetMasterScalarVolume() * 100)
+            return volume_session.get()
+        except:
+            return None
+    
+    @staticmethod
+    def adjust_volume(delta):
+        """Change volume by delta percent in a single endpoint round-trip; returns the new level"""
+        if not AUDIO_CONTROL_AVAILABLE:
+            return None
+        
+        try:
+            return volume_session.adjust(delta)
         except:
             return None
     
@@ -175,8 +337,8 @@ class SystemController:
         try:
             # PowerShell command for brightness
             cmd = f"(Get-WmiObject -Namespace root/WMI -Class WmiMonitorBrightnessMethods).WmiSetBrightness(1,{level})"
-            result = subprocess.run(["powershell", "-Command", cmd], capture_output=True, timeout=10)
-            return result.returncode == 0
+            result = run_powershell(cmd, timeout=10)
+            return result.ok
         except:
             return False
     
@@ -186,9 +348,9 @@ class SystemController:
         if not PSUTIL_AVAILABLE:
             # Basic fallback without psutil
             try:
-                result = subprocess.run("wmic cpu get loadpercentage /value", shell=True, capture_output=True, text=True)
-                cpu_line = [line for line in result.stdout.split('\n') if 'LoadPercentage' in line]
-                cpu_percent = int(cpu_line[0].split('=')[1]) if cpu_line else None
+                result = run_powershell("(Get-CimInstance Win32_Processor | Measure-Object -Property LoadPercentage -Average).Average")
+                cpu_text = result.output.strip()
+                cpu_percent = int(float(cpu_text)) if result.ok and cpu_text else None
                 
                 return {
                     'cpu': cpu_percent or 0,
@@ -201,26 +363,12 @@ class SystemController:
                 return None
         
         try:
-            cpu_percent = psutil.cpu_percent(interval=1)
-            memory = psutil.virtual_memory()
-            disk = psutil.disk_usage('C:')
-            
-            info = {
-                'cpu': cpu_percent,
-                'memory_percent': memory.percent,
-                'memory_available': round(memory.available / (1024**3), 1),
-                'disk_percent': round((disk.used / disk.total) * 100, 1),
-                'disk_free': round(disk.free / (1024**3), 1)
-            }
-            
-            try:
-                battery = psutil.sensors_battery()
-                if battery:
-                    info['battery'] = round(battery.percent)
-                    info['battery_plugged'] = battery.power_plugged
-            except:
-                pass  # Battery info not critical
-            
+            # Read the latest background sample instead of blocking on cpu_percent(interval=1)
+            info = metrics_sampler.latest()
+            if info is None:
+                return None
+            info['cpu_average'] = metrics_sampler.average('cpu')
+            info['cpu_trend'] = metrics_sampler.trend('cpu')
             return info
         except:
             return None
@@ -244,7 +392,7 @@ class SystemController:
                 $graphics.CopyFromScreen($bounds.Location, [System.Drawing.Point]::Empty, $bounds.Size)
                 $bitmap.Save('{fallback_filename}')
                 """
-                subprocess.run(["powershell", "-Command", cmd], timeout=15)
+                run_powershell(cmd, timeout=15)
                 return fallback_filename
             except:
                 return None
@@ -254,11 +402,10 @@ class SystemController:
                 timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
                 screenshots_dir = os.path.join(os.path.expanduser("~"), "Pictures", "Screenshots")
                 os.makedirs(screenshots_dir, exist_ok=True)
-                filename = os.path.join(screenshots_dir, f"screenshot_{timestamp}.png")
+                filename = os.path.join(screenshots_dir, f"screenshot_{timestamp}{screenshot_writer.extension}")
             
-            screenshot = ImageGrab.grab()
-            screenshot.save(filename)
-            return filename
+            # Encoding and writing happen in the background - return as soon as the screen is grabbed
+            return screenshot_writer.capture(filename)
         except:
             return None
     
@@ -289,60 +436,21 @@ class SystemController:
 
 class ContextualIntelligence:
     """Contextual awareness and learning"""
+    # Actions whose target can be launched again, and the kind of target they open
+    LAUNCH_KINDS = {"open_app": "app", "open_app_and_search": "app", "open_folder": "folder"}
+    
     def __init__(self):
         self.usage_file = "usage_patterns.json"
-        self.load_usage_patterns()
-    
-    def load_usage_patterns(self):
-        try:
-            if os.path.exists(self.usage_file):
-                with open(self.usage_file, 'r') as f:
-                    self.patterns = json.load(f)
-            else:
-                self.patterns = {
-                    'app_usage': {},
-                    'hourly_usage': {},
-                    'command_frequency': {}
-                }
-        except:
-            self.patterns = {
-                'app_usage': {},
-                'hourly_usage': {},
-                'command_frequency': {}
-            }
+        self.store = UsageStore(self.usage_file, flush_interval=USAGE_FLUSH_INTERVAL,
+                                top_k=SUGGESTION_TOP_K, half_life_days=SUGGESTION_HALF_LIFE_DAYS)
     
     def save_usage_patterns(self):
-        try:
-            with open(self.usage_file, 'w') as f:
-                json.dump(self.patterns, f)
-        except:
-            pass
+        self.store.flush()
     
     def log_command(self, command, app_name=None):
-        """Log command usage for learning"""
+        """Log command usage for learning - O(1), written to disk in the background"""
         hour = datetime.now().hour
-        
-        # Log command frequency
-        if command in self.patterns['command_frequency']:
-            self.patterns['command_frequency'][command] += 1
-        else:
-            self.patterns['command_frequency'][command] = 1
-        
-        # Log hourly usage
-        if str(hour) in self.patterns['hourly_usage']:
-            self.patterns['hourly_usage'][str(hour)] += 1
-        else:
-            self.patterns['hourly_usage'][str(hour)] = 1
-        
-        # Log app usage with time
-        if app_name:
-            if app_name in self.patterns['app_usage']:
-                self.patterns['app_usage'][app_name]['count'] += 1
-                self.patterns['app_usage'][app_name]['hours'].append(hour)
-            else:
-                self.patterns['app_usage'][app_name] = {'count': 1, 'hours': [hour]}
-        
-        self.save_usage_patterns()
+        self.store.record(command, app_name, hour, kind=self.LAUNCH_KINDS.get(command))
     
     def get_time_based_greeting(self):
         """Get contextual greeting based on time"""
@@ -358,29 +466,33 @@ class ContextualIntelligence:
     
     def get_suggested_apps(self, limit=3):
         """Get app suggestions based on current time and usage patterns"""
-        current_hour = datetime.now().hour
-        suggestions = []
-        
-        for app, data in self.patterns['app_usage'].items():
-            if current_hour in data['hours']:
-                suggestions.append((app, data['count']))
-        
-        # Sort by usage count and return top suggestions
-        suggestions.sort(key=lambda x: x[1], reverse=True)
-        return [app for app, count in suggestions[:limit]]
+        # Read straight from the per-hour top-k index - no scan over all apps
+        return self.store.suggest_apps(datetime.now().hour, limit)
+    
+    def predict_targets(self, hour, limit=3):
+        """Likely launch targets for an hour as (kind, name), best first"""
+        return self.store.suggest_targets(hour, limit)
 
 # Initialize components
 app_cache = AppCache()
-vad = VoiceActivityDetector()
+vad = VoiceActivityDetector(energy_threshold=perf.VAD_ENERGY_THRESHOLD)
 system_controller = SystemController()
 contextual_ai = ContextualIntelligence()
 
+def apply_performance_settings(changed):
+    """Push a hot-reloaded profile into the components that copied its values"""
+    vad.energy_threshold = perf.VAD_ENERGY_THRESHOLD
+    if metrics_sampler:
+        metrics_sampler.interval = perf.METRICS_SAMPLE_INTERVAL
+    if changed & {"WHISPER_WAKE_MODEL", "WHISPER_COMMAND_MODEL"}:
+        # Keep listening with the current models while the new ones load
+        threading.Thread(target=load_whisper_models, daemon=True, name="whisper-reload").start()
+
+perf.add_listener(apply_performance_settings)
+perf.start()
+
 def discover_applications():
-    """Dynamically discover installed applications with caching"""
-    # Check cache first
-    if app_cache.is_valid():
-        return app_cache.cache['apps']
-    
+    """Dynamically discover installed applications"""
     app_map = {
         # Built-in Windows apps (always available)
         "notepad": "notepad.exe",
@@ -431,12 +543,16 @@ def discover_applications():
     
     return app_map
 
+# Scan for additional folders on Desktop and common locations
+FOLDER_SCAN_PATHS = [
+    os.path.join(os.path.expanduser("~"), "OneDrive/Desktop"),
+    os.path.join(os.path.expanduser("~"), "Desktop"),
+    "D:\\",
+    "E:\\",
+]
+
 def discover_folders():
-    """Dynamically discover common folders with caching"""
-    # Check cache first
-    if app_cache.is_valid():
-        return app_cache.cache['folders']
-    
+    """Dynamically discover common folders"""
     user_home = os.path.expanduser("~")
     
     folder_map = {
@@ -449,48 +565,94 @@ def discover_folders():
         "desktop": os.path.join(user_home, "Desktop"),
     }
     
-    # Scan for additional folders on Desktop and common locations
-    additional_paths = [
-        os.path.join(user_home, "OneDrive/Desktop"),
-        os.path.join(user_home, "Desktop"),
-        "D:\\",
-        "E:\\",
-    ]
-    
     common_folder_names = ["Games", "Projects", "Work", "Screenshots", "Wallpaper", "Karthik"]
     
-    for base_path in additional_paths:
-        if not os.path.exists(base_path):
-            continue
-        try:
-            for item in os.listdir(base_path):
-                item_path = os.path.join(base_path, item)
-                if os.path.isdir(item_path):
-                    # Add common folders with simple names
-                    folder_key = item.lower().replace(" ", "")
-                    if folder_key not in folder_map:
-                        folder_map[folder_key] = item_path
-        except (PermissionError, FileNotFoundError):
-            continue
+    folder_rules = CrawlRules(excludes=CRAWL_RULES.excludes, max_depth=1, include_files=False)
+    for item in crawl(FOLDER_SCAN_PATHS, rules=folder_rules, workers=1):
+        # Add common folders with simple names
+        folder_key = item.name.lower().replace(" ", "")
+        if folder_key not in folder_map:
+            folder_map[folder_key] = item.path
     
     return folder_map
 
-# Initialize dynamic maps with caching
-print("Discovering installed applications...")
-APP_MAP = discover_applications()
-print(f"Found {len(APP_MAP)} applications")
+# Resolved actions for repeated utterances; cleared whenever the maps change
+action_cache = ActionCache(ACTION_CACHE_SIZE)
+
+# Revalidation, the index watcher and evict-on-failure all update the maps from their own threads
+discovery_lock = threading.Lock()
 
-print("Discovering folders...")
-FOLDER_MAP = discover_folders()
-print(f"Found {len(FOLDER_MAP)} folders")
+def apply_discovery_update(kind, changed, removed):
+    """Swap in an updated map in one step so readers never see a half-applied diff"""
+    global APP_MAP, FOLDER_MAP
+    # Copy and swap under one lock, or overlapping updates would drop each other's changes
+    with discovery_lock:
+        current = APP_MAP if kind == 'apps' else FOLDER_MAP
+        updated = dict(current)
+        updated.update(changed)
+        for name in removed:
+            updated.pop(name, None)
+        if kind == 'apps':
+            APP_MAP = updated
+        else:
+            FOLDER_MAP = updated
+    action_cache.invalidate()
+    logger.info(f"Discovery update for {kind}: {len(changed)} changed, {len(removed)} removed")
 
-# Save to cache
-if not app_cache.is_valid():
+# Initialize dynamic maps - serve the cache immediately and revalidate in the background
+APP_MAP = app_cache.get_map('apps')
+FOLDER_MAP = app_cache.get_map('folders')
+if APP_MAP or FOLDER_MAP:
+    print(f"Loaded {len(APP_MAP)} applications and {len(FOLDER_MAP)} folders from cache")
+    app_cache.revalidate_async(
+        {'apps': discover_applications, 'folders': discover_folders},
+        apply_discovery_update
+    )
+else:
+    print("Discovering installed applications...")
+    APP_MAP = discover_applications()
+    print(f"Found {len(APP_MAP)} applications")
+    
+    print("Discovering folders...")
+    FOLDER_MAP = discover_folders()
+    print(f"Found {len(FOLDER_MAP)} folders")
+    
+    # Save to cache
     app_cache.save_cache(APP_MAP, FOLDER_MAP)
 
-# Audio settings for Whisper
+# Usage files from before launch kinds were recorded: keep their counts for targets that are known apps
+contextual_ai.store.seed_suggestions(lambda name: name in APP_MAP)
+
+def update_folder_map(kind, path, is_dir, dest=None):
+    """Keep FOLDER_MAP in sync with folder changes reported by the index watcher"""
+    if not is_dir:
+        return
+    scan_paths = [os.path.normcase(os.path.normpath(p)) for p in FOLDER_SCAN_PATHS]
+    changed, removed = {}, []
+    if kind in ("deleted", "moved"):
+        removed = [key for key, folder_path in FOLDER_MAP.items()
+                   if os.path.normcase(folder_path) == os.path.normcase(path)]
+    new_path = dest if kind == "moved" else path if kind == "created" else None
+    if new_path and os.path.normcase(os.path.dirname(new_path)) in scan_paths:
+        folder_key = os.path.basename(new_path).lower().replace(" ", "")
+        if folder_key not in FOLDER_MAP or folder_key in removed:
+            changed[folder_key] = new_path
+    if changed or removed:
+        removed = [key for key in removed if key not in changed]
+        apply_discovery_update('folders', changed, removed)
+
+# Launcher sources are scanned in the background (and rescanned as the index ages) instead of per request
+launcher_index = LauncherIndex(default_sources(CRAWL_RULES), negative_ttl=LAUNCHER_NEGATIVE_TTL,
+                               max_age=LAUNCHER_INDEX_MAX_AGE, build_wait=LAUNCHER_BUILD_WAIT)
+launcher_index.build_async()
+
+# Apply creates, renames and deletes incrementally instead of rescanning
+index_watcher = IndexWatcher(file_index, scan_rate=WATCHER_SCAN_RATE)
+index_watcher.add_listener(update_folder_map)
+index_watcher.start()
+
+# Audio settings for Whisper (chunk length and thresholds come from the performance profile)
 SAMPLE_RATE = 16000
-CHUNK_DURATION = 3.0  # seconds - longer for better stability
 WAKE_WORDS = ["maya", "hey maya", "hello maya"]
 
 # Enhanced Voice System Setup with Configuration Support
@@ -508,60 +670,103 @@ except:
     logger.info("Using default voice configuration")
 
 # TTS Engine Setup
-engine = pyttsx3.init()
-voices = engine.getProperty('voices')
+def create_tts_engine():
+    """Create and configure the pyttsx3 engine - runs on the local TTS worker thread"""
+    engine = pyttsx3.init()
+    voices = engine.getProperty('voices')
 
-if voice_config:
-    # Use configured voice
-    try:
-        engine.setProperty('voice', voice_config["voice_id"])
-        engine.setProperty('rate', voice_config["rate"])
-        engine.setProperty('volume', voice_config["volume"])
-        logger.info(f"Using configured voice: {voice_config['voice_name']}")
-    except:
-        logger.warning("Could not load configured voice, using default")
-        engine.setProperty('rate', 170)
-        engine.setProperty('volume', VOICE_VOLUME)
-else:
-    # Use best available voice
-    selected_voice = None
+    if voice_config:
+        # Use configured voice
+        try:
+            engine.setProperty('voice', voice_config["voice_id"])
+            engine.setProperty('rate', voice_config["rate"])
+            engine.setProperty('volume', voice_config["volume"])
+            logger.info(f"Using configured voice: {voice_config['voice_name']}")
+        except:
+            logger.warning("Could not load configured voice, using default")
+            engine.setProperty('rate', 170)
+            engine.setProperty('volume', VOICE_VOLUME)
+    else:
+        # Use best available voice
+        selected_voice = None
     
-    # Priority order: Zira (female) > Hazel (British) > David (male)
-    voice_priority = ["Zira", "Hazel", "David"]
+        # Priority order: Zira (female) > Hazel (British) > David (male)
+        voice_priority = ["Zira", "Hazel", "David"]
     
-    for priority_voice in voice_priority:
-        for voice in voices:
-            if priority_voice in voice.name:
-                selected_voice = voice
+        for priority_voice in voice_priority:
+            for voice in voices:
+                if priority_voice in voice.name:
+                    selected_voice = voice
+                    break
+            if selected_voice:
                 break
+    
         if selected_voice:
-            break
+            engine.setProperty('voice', selected_voice.id)
+            logger.info(f"Using voice: {selected_voice.name}")
+        else:
+            logger.warning("No preferred voice found, using system default")
     
-    if selected_voice:
-        engine.setProperty('voice', selected_voice.id)
-        logger.info(f"Using voice: {selected_voice.name}")
-    else:
-        logger.warning("No preferred voice found, using system default")
+        engine.setProperty('rate', 170)
+        engine.setProperty('volume', VOICE_VOLUME)
     
-    engine.setProperty('rate', 170)
-    engine.setProperty('volume', VOICE_VOLUME)
+    return engine
+
+# One long-lived thread owns the engine; everything else queues utterances to it
+local_tts = LocalTTSWorker(create_tts_engine)
+local_tts.start()
+
+def speak_locally(text):
+    """System voice (pyttsx3) - blocks until the last segment has been spoken"""
+    # Queue each sentence separately so the first starts without rendering the rest
+    utterances = [local_tts.speak(segment) for segment in split_segments(text) or [text]]
+    # A hung speech driver must not hold up the speech queue forever
+    if not utterances[-1].wait(speech_timeout(text, VOICE_RATE)):
+        logger.warning("System voice stopped responding - restarting it")
+        local_tts.restart()
+
+# ElevenLabs first (premium quality) - skipped for a while after repeated failures
+tts_failover = FailoverSpeaker(
+    speak_with_elevenlabs,
+    speak_locally,
+    CircuitBreaker(ELEVENLABS_FAILURE_THRESHOLD, ELEVENLABS_COOLDOWN),
+    is_remote_ready=is_elevenlabs_ready,
+    is_cached=elevenlabs_voice.has_cached,
+)
 
-def speak(text, show_text=True):
+def render_speech(text):
+    """Play one utterance and block until it finishes - runs on the speech queue's worker"""
+    breaker_state = tts_failover.breaker.state
+    backend = tts_failover.speak(text)
+    if backend == "remote":
+        stats = elevenlabs_voice.last_stats
+        if stats:
+            logger.debug(f"TTS first audio after {stats.first_audio * 1000:.0f} ms")
+    elif is_elevenlabs_ready() and breaker_state != "open":
+        # Only logged when ElevenLabs was actually tried, not while its circuit is open
+        logger.warning(f"ElevenLabs failed ({tts_failover.last_error or 'no audio'}), "
+                       f"falling back to system voice (circuit {tts_failover.breaker.state})")
+
+def stop_speech():
+    """Cut off the utterance currently playing on either backend"""
+    elevenlabs_voice.stop()
+    local_tts.interrupt()
+
+speech_queue = SpeechQueue(render_speech, stop=stop_speech)
+
+def speak(text, show_text=True, priority=NORMAL, key=None, interrupt=False):
+    """Queue text to be spoken and return immediately
+
+    Messages with the same key replace older ones still waiting; interrupt cuts
+    off less urgent speech.
+    """
     if show_text:
         print(text)
-    
-    # Try ElevenLabs first (premium quality)
-    if is_elevenlabs_ready():
-        success = speak_with_elevenlabs(text)
-        if success:
-            return
-        else:
-            logger.warning("ElevenLabs failed, falling back to system voice")
-    
-    # Fallback to system voice
-    time.sleep(0.2)
-    engine.say(text)
-    engine.runAndWait()
+    return speech_queue.say(text, priority, key, interrupt)
+
+def speak_and_wait(text, show_text=True, priority=NORMAL, timeout=None):
+    """Speak and block until playback has finished"""
+    return speak(text, show_text, priority).wait(timeout)
 
 def transcribe_audio_chunk(audio_data, model=None):
     """Transcribe audio chunk using specified Whisper model"""
@@ -588,7 +793,8 @@ def transcribe_audio_chunk(audio_data, model=None):
             audio_data = np.pad(audio_data, (0, min_length - len(audio_data)))
         
         # Use Whisper directly on audio array (no file needed)
-        result = model.transcribe(audio_data, language="en")
+        with session_profiler.stage("asr"):
+            result = model.transcribe(audio_data, language="en", **perf.WHISPER_DECODE)
         return result["text"].strip().lower()
         
     except Exception as e:
@@ -598,13 +804,14 @@ def transcribe_audio_chunk(audio_data, model=None):
 def contains_wake_word(text):
     """Check if transcribed text contains wake word - handles Whisper mishearing 'alexa'"""
     text = text.lower().strip()
-    print(f"🔍 Checking for wake word in: '{text}'")
+    # Runs on every audio window - trace at debug level only (lazy %-formatting)
+    logger.debug("Checking for wake word in: '%s'", text)
     
     # Primary wake words (what user intends to say)
     primary_words = ["maya", "hey maya", "hello maya", "alexa", "hey alexa", "hello alexa"]
     for wake_word in primary_words:
         if wake_word in text:
-            print(f"✅ Direct match found: '{wake_word}'")
+            logger.debug("Direct match found: '%s'", wake_word)
             return True
     
     # Common Whisper mishearings of "alexa" - these are what Whisper thinks "alexa" sounds like
@@ -615,22 +822,22 @@ def contains_wake_word(text):
     
     for mishearing in whisper_mishearings:
         if mishearing in text:
-            print(f"✅ ALEXA DETECTED! Whisper heard '{mishearing}' but you likely said 'alexa'")
+            logger.debug("Whisper heard '%s' - treating it as 'alexa'", mishearing)
             return True
     
     # Maya alternatives (original female name options)
     maya_alternatives = ["mia", "mya", "maria", "may", "mai", "maia", "mira", "mila", "myra", "miya"]
     for alt in maya_alternatives:
         if alt in text:
-            print(f"✅ Maya alternative detected: '{alt}'")
+            logger.debug("Maya alternative detected: '%s'", alt)
             return True
     
     # Short utterances (1-3 letters) - probably trying to say wake word
     if len(text.strip()) <= 3 and len(text.strip()) >= 1:
-        print(f"✅ SHORT UTTERANCE! '{text}' - assuming you're trying to say wake word")
+        logger.debug("Short utterance '%s' - assuming it's the wake word", text)
         return True
     
-    print(f"❌ No wake word detected")
+    logger.debug("No wake word detected")
     return False
 
 def extract_command_after_wake_word(text):
@@ -648,7 +855,50 @@ def extract_command_after_wake_word(text):
 def cleanup():
     """Cleanup resources before exit"""
     try:
-        engine.stop()
+        # Let a queued "Goodbye!" finish
+        speech_queue.wait_idle(timeout=5)
+    except:
+        pass
+    try:
+        local_tts.shutdown()
+    except:
+        pass
+    try:
+        index_watcher.stop()
+    except:
+        pass
+    try:
+        launch_predictor.stop()
+    except:
+        pass
+    try:
+        perf.stop()
+    except:
+        pass
+    try:
+        logger.info(f"Action cache stats: {action_cache.stats()}")
+        logger.info(f"TTS phrase cache stats: {elevenlabs_voice.cache.stats()}")
+    except:
+        pass
+    try:
+        if command_host:
+            command_host.stop()
+    except:
+        pass
+    try:
+        if metrics_sampler:
+            metrics_sampler.stop()
+    except:
+        pass
+    try:
+        # Write out any usage counts still waiting for the periodic flush
+        contextual_ai.store.close()
+    except:
+        pass
+    try:
+        if screenshot_writer:
+            # Let queued screenshots finish writing before exit
+            screenshot_writer.stop()
     except:
         pass
 
@@ -662,89 +912,27 @@ def smart_find_application(app_name):
     
     # First, check the discovered APP_MAP
     if app_name in APP_MAP:
-        return APP_MAP[app_name]
-    
-    # Strategy 1: Windows Registry search
-    try:
-        import winreg
-        def search_registry_for_app(name):
-            registry_paths = [
-                (winreg.HKEY_LOCAL_MACHINE, r"SOFTWARE\Microsoft\Windows\CurrentVersion\Uninstall"),
-                (winreg.HKEY_CURRENT_USER, r"SOFTWARE\Microsoft\Windows\CurrentVersion\Uninstall"),
-            ]
-            
-            for hkey, path in registry_paths:
-                try:
-                    with winreg.OpenKey(hkey, path) as key:
-                        for i in range(winreg.QueryInfoKey(key)[0]):
-                            try:
-                                subkey_name = winreg.EnumKey(key, i)
-                                with winreg.OpenKey(key, subkey_name) as subkey:
-                                    try:
-                                        display_name = winreg.QueryValueEx(subkey, "DisplayName")[0]
-                                        if name.lower() in display_name.lower():
-                                            try:
-                                                install_location = winreg.QueryValueEx(subkey, "InstallLocation")[0]
-                                                # Look for .exe files in install location
-                                                if os.path.exists(install_location):
-                                                    for file in os.listdir(install_location):
-                                                        if file.lower().endswith('.exe') and name.lower() in file.lower():
-                                                            return os.path.join(install_location, file)
-                                            except FileNotFoundError:
-                                                pass
-                                    except FileNotFoundError:
-                                        pass
-                            except (OSError, FileNotFoundError):
-                                continue
-                except (OSError, FileNotFoundError):
-                    continue
-            return None
-        
-        registry_result = search_registry_for_app(app_name)
-        if registry_result:
-            return registry_result
-    except ImportError:
-        pass
-    
-    # Strategy 2: Start Menu search
-    try:
-        start_menu_paths = [
-            os.path.expanduser("~/AppData/Roaming/Microsoft/Windows/Start Menu/Programs"),
-            r"C:\ProgramData\Microsoft\Windows\Start Menu\Programs"
-        ]
-        
-        for start_path in start_menu_paths:
-            if os.path.exists(start_path):
-                for root, dirs, files in os.walk(start_path):
-                    for file in files:
-                        if file.lower().endswith('.lnk') and app_name.lower() in file.lower():
-                            return os.path.join(root, file)
-    except Exception:
-        pass
-    
-    # Strategy 3: Common paths search
-    import glob
-    common_paths = [
-        rf"C:\Program Files\**\{app_name}*.exe",
-        rf"C:\Program Files (x86)\**\{app_name}*.exe",
-        os.path.expanduser(f"~/AppData/Local/**/{app_name}*.exe"),
-        os.path.expanduser(f"~/Desktop/**/{app_name}*.lnk"),
-        os.path.expanduser(f"~/OneDrive/Desktop/**/{app_name}*.lnk"),
-    ]
-    
-    for pattern in common_paths:
-        matches = glob.glob(pattern, recursive=True)
-        if matches:
-            return matches[0]
-    
-    return None
+        app_path = APP_MAP[app_name]
+        if not os.path.isabs(app_path) or os.path.exists(app_path):
+            return app_path
+        # Cached path is gone - evict it and fall through to a fresh search
+        apply_discovery_update('apps', {}, [app_name])
+        app_cache.evict('apps', app_name)
+    
+    # Registry, Start Menu and common install paths - indexed once, misses cached
+    return launcher_index.find(app_name)
 
 def smart_find_folder(folder_name):
     """Smart folder finder with multiple strategies"""
     
     # First, check the discovered FOLDER_MAP
     if folder_name in FOLDER_MAP:
-        return FOLDER_MAP[folder_name]
+        folder_path = FOLDER_MAP[folder_name]
+        if os.path.exists(folder_path):
+            return folder_path
+        # Cached path is gone - evict it and fall through to a fresh search
+        apply_discovery_update('folders', {}, [folder_name])
+        app_cache.evict('folders', folder_name)
     
     # Strategy 1: Search common locations
     search_locations = [
@@ -757,36 +945,38 @@ def smart_find_folder(folder_name):
         "E:\\",
     ]
     
-    for location in search_locations:
-        if not os.path.exists(location):
-            continue
-        
-        try:
-            for item in os.listdir(location):
-                if os.path.isdir(os.path.join(location, item)):
-                    # Check for exact or partial matches
-                    if (folder_name.lower() == item.lower() or 
-                        folder_name.lower() in item.lower() or 
-                        item.lower() in folder_name.lower()):
-                        return os.path.join(location, item)
-        except (PermissionError, FileNotFoundError):
-            continue
+    top_level_rules = CrawlRules(excludes=CRAWL_RULES.excludes, max_depth=1, include_files=False)
+    for item in crawl(search_locations, rules=top_level_rules, workers=1):
+        # Check for exact or partial matches
+        if (folder_name.lower() == item.name.lower() or 
+            folder_name.lower() in item.name.lower() or 
+            item.name.lower() in folder_name.lower()):
+            return item.path
     
     # Strategy 2: Deep search (limited depth to avoid slowness)
-    user_home = os.path.expanduser("~")
-    for root, dirs, files in os.walk(user_home):
-        # Limit depth to avoid too much searching
-        depth = root.replace(user_home, '').count(os.sep)
-        if depth > 3:  # Only search 3 levels deep
-            dirs[:] = []  # Don't go deeper
-            continue
-        
-        for dir_name in dirs:
-            if folder_name.lower() in dir_name.lower():
-                return os.path.join(root, dir_name)
+    deep_rules = CrawlRules(excludes=CRAWL_RULES.excludes, max_depth=4, include_files=False)
+    # Single worker: threaded crawls yield in completion order, and the first match wins here
+    for item in crawl(os.path.expanduser("~"), rules=deep_rules, workers=1):
+        if folder_name.lower() in item.name.lower():
+            return item.path
     
     return None
 
+# Resolve the apps and folders usually opened at this hour before they're asked for
+launch_predictor = LaunchPredictor(
+    lambda hour: contextual_ai.predict_targets(hour, PREFETCH_TARGETS),
+    {'app': smart_find_application, 'folder': smart_find_folder},
+    limit=PREFETCH_TARGETS,
+    min_interval=PREFETCH_MIN_INTERVAL,
+    # Optionally render "Opening X" into the phrase cache too, so the reply plays instantly
+    presynthesize=(lambda text: is_elevenlabs_ready() and prerender_with_elevenlabs(text))
+                  if PREFETCH_PRESYNTHESIZE else None,
+)
+launch_predictor.start()
+
+if TTS_WARMUP_ON_START and is_elevenlabs_ready():
+    threading.Thread(target=warm_up_elevenlabs, daemon=True, name="tts-warm-up").start()
+
 def parse_intent_local(user_input):
     """Enhanced intent parser with system operations and contextual intelligence"""
     user_input = user_input.lower().strip()
@@ -799,6 +989,14 @@ def parse_intent_local(user_input):
     user_input = re.sub(r'\b(could you|can you|please|would you)\b', '', user_input).strip()
     user_input = re.sub(r'\b(my|the)\b', '', user_input).strip()
     
+    # Profiling of live sessions ("start profiling", "profile the next 3 commands", "stop profiling")
+    match = re.search(r'\b(start|stop|begin|end) profiling\b|\bprofile\s+(?:the\s+)?next\s+(\d+)', user_input)
+    if match:
+        if match.group(1) in ('stop', 'end'):
+            return {"action": "profile", "state": "stop", "confidence": 0.9}
+        return {"action": "profile", "state": "start",
+                "value": int(match.group(2)) if match.group(2) else PROFILE_UTTERANCES, "confidence": 0.9}
+    
     # === NEW: SYSTEM OPERATIONS ===
     # Volume control patterns
     volume_patterns = [
@@ -1057,65 +1255,123 @@ def get_file_type(filename):
     return common_extensions.get(ext, 'file')
 
 def search_files(query, search_type="file", extensions=None):
+    # Use the persistent index once it has been built
+    if file_index.is_ready():
+        return file_index.search(query, search_type=search_type, extensions=extensions)
+    
+    # Fallback: crawl the disk while the index is still being built
     matches = []
-    for root, dirs, files in os.walk(SEARCH_ROOT):
-        # Skip system directories and hidden folders
-        if any(part.startswith('.') for part in root.split(os.sep)):
+    for item in crawl(SEARCH_ROOT, rules=CRAWL_RULES, workers=CRAWL_WORKERS):
+        if item.is_dir != (search_type == "folder"):
             continue
-        
-        items = files if search_type == "file" else dirs
-        for item in items:
-            # Skip hidden files
-            if item.startswith('.'):
+        if extensions and not any(item.name.lower().endswith(ext) for ext in extensions):
+            continue
+        if query.lower() in item.name.lower():
+            # Prioritize desktop and documents locations
+            priority = 2 if "Desktop" in item.path else 1 if "Documents" in item.path else 0
+            matches.append((item.path, priority))
+    
+    # Sort by priority (higher first), then path length (shorter paths first), then path for a stable order
+    matches.sort(key=lambda x: (-x[1], len(x[0]), x[0]))
+    return [m[0] for m in matches] 
+
+def stream_search_candidates(query, search_type="file", extensions=None, deadline=None):
+    """Yield (path, priority) matches in priority order: Desktop, then Documents, then the rest"""
+    if file_index.is_ready():
+        yield from file_index.iter_search(query, search_type=search_type, extensions=extensions)
+        return
+    
+    # Fallback while the index is being built: crawl the likely places first
+    user_home = os.path.expanduser("~")
+    priority_roots = [
+        (2, [os.path.join(user_home, "Desktop"), os.path.join(user_home, "OneDrive/Desktop")]),
+        (1, [os.path.join(user_home, "Documents"), os.path.join(user_home, "OneDrive/Documents")]),
+    ]
+    crawled = [root for _, roots in priority_roots for root in roots]
+    priority_roots.append((0, [SEARCH_ROOT]))
+    
+    for priority, roots in priority_roots:
+        rules = CRAWL_RULES
+        if priority == 0:
+            rules = CrawlRules(excludes=CRAWL_RULES.excludes, exclude_paths=crawled)
+        # Single worker keeps the order (and so the early-stopped result) the same from run to run
+        for item in crawl(roots, rules=rules, workers=1):
+            if deadline and time.monotonic() > deadline:
+                return
+            if item.is_dir != (search_type == "folder"):
                 continue
-                
-            if extensions and not any(item.lower().endswith(ext) for ext in extensions):
+            if extensions and not any(item.name.lower().endswith(ext) for ext in extensions):
                 continue
-            if query.lower() in item.lower():
-                full_path = os.path.join(root, item)
-                # Prioritize desktop and documents locations
-                priority = 2 if "Desktop" in full_path else 1 if "Documents" in full_path else 0
-                matches.append((full_path, priority))
-    
-    # Sort by priority (higher first) and then by path length (shorter paths first)
-    matches.sort(key=lambda x: (-x[1], len(x[0])))
-    return [m[0] for m in matches] 
+            if query.lower() in item.name.lower():
+                yield item.path, priority
+
+def match_score(query, filename):
+    """Similarity between the spoken name and a filename, with or without its extension"""
+    name = filename.lower()
+    stem = os.path.splitext(name)[0]
+    return max(SequenceMatcher(None, query, name).ratio(), SequenceMatcher(None, query, stem).ratio())
+
+def find_best_match(query, search_type="file", extensions=None,
+                    confidence=FILE_SEARCH_CONFIDENCE, time_budget=FILE_SEARCH_TIME_BUDGET):
+    """Score candidates as they stream in and stop at the first confident match or when time runs out"""
+    query = query.lower().strip()
+    deadline = time.monotonic() + time_budget
+    best_path, best_score, best_key = None, 0.0, None
+    fallback, fallback_key = None, None
+    
+    for path, priority in stream_search_candidates(query, search_type, extensions, deadline):
+        score = match_score(query, os.path.basename(path))
+        # Location, then path length, then the path itself - equal scores resolve the same way every run
+        key = (-priority, len(path), path)
+        if score > best_score or (score == best_score and best_key is not None and key < best_key):
+            best_path, best_score, best_key = path, score, key
+        # Without a close match, prefer the best location and then the shortest path
+        if fallback_key is None or key < fallback_key:
+            fallback, fallback_key = path, key
+        if best_score >= confidence or time.monotonic() > deadline:
+            break
+    
+    if best_score >= 0.6:
+        return best_path
+    return fallback
 
 def open_best_match(query, search_type="file", extensions=None):
     try:
-        results = search_files(query, search_type=search_type, extensions=extensions)
-        if results:
-            best = get_close_matches(query, [os.path.basename(r) for r in results], n=1, cutoff=0.6)
-            if best:
-                for r in results:
-                    if best[0] in r:
-                        try:
-                            file_type = get_file_type(r)
-                            location = "Desktop" if "Desktop" in r else "Documents" if "Documents" in r else "computer"
-                            os.startfile(r)
-                            return f"Opening {best[0]}, a {file_type} from your {location}"
-                        except Exception as e:
-                            print(f"Error opening {best[0]}: {e}")
-                            return f"Sorry, I couldn't open {best[0]}"
-            else:
-                try:
-                    filename = os.path.basename(results[0])
-                    file_type = get_file_type(results[0])
-                    location = "Desktop" if "Desktop" in results[0] else "Documents" if "Documents" in results[0] else "computer"
-                    os.startfile(results[0])
-                    return f"Opening {filename}, a {file_type} from your {location}"
-                except Exception as e:
-                    print(f"Error opening {os.path.basename(results[0])}: {e}")
-                    return f"Sorry, I couldn't open {os.path.basename(results[0])}"
-        return "Couldn't find a match for that file."
+        path = find_best_match(query, search_type=search_type, extensions=extensions)
+        if not path:
+            return "Couldn't find a match for that file."
+        
+        filename = os.path.basename(path)
+        try:
+            file_type = get_file_type(path)
+            location = "Desktop" if "Desktop" in path else "Documents" if "Documents" in path else "computer"
+            os.startfile(path)
+            return f"Opening {filename}, a {file_type} from your {location}"
+        except Exception as e:
+            print(f"Error opening {filename}: {e}")
+            return f"Sorry, I couldn't open {filename}"
     except Exception as e:
         print(f"Error in open_best_match: {e}")
         return "Sorry, something went wrong while searching."
 
 def handle_command_with_ai(user_input, test_mode=False):
     """Handle command using local intent parsing"""
-    # Parse the command using local intent parser
-    intent_result = parse_intent_local(user_input)
+    with session_profiler.stage("action"):
+        result = run_command(user_input, test_mode)
+    if not test_mode:
+        session_profiler.utterance_done()
+    return result
+
+def run_command(user_input, test_mode=False):
+    """Resolve and execute one command; True ends the conversation"""
+    with session_profiler.stage("intent"):
+        # Repeated utterances reuse the action (and path) resolved last time
+        intent_result = action_cache.get(user_input)
+        if intent_result is None:
+            intent_result = parse_intent_local(user_input)
+            if intent_result.get("action") not in ("open_app", "open_folder"):
+                # Path-based actions are cached once their path has been resolved
+                action_cache.put(user_input, intent_result)
     
     action = intent_result.get("action", "unknown")
     target = intent_result.get("target", "")
@@ -1127,14 +1383,26 @@ def handle_command_with_ai(user_input, test_mode=False):
         # Log command for contextual learning
         contextual_ai.log_command(action, target)
     
+    if action == "profile":
+        if intent_result.get("state") == "stop":
+            summary = session_profiler.stop()
+            speak("Profile saved" if summary else "Profiling wasn't running")
+        else:
+            count = intent_result.get("value", PROFILE_UTTERANCES)
+            if session_profiler.start(utterances=count, seconds=PROFILE_SECONDS):
+                speak(f"Profiling the next {count} commands")
+            else:
+                speak("Profiling is already running")
+        return False
+    
     # === NEW: SYSTEM OPERATIONS HANDLING ===
     if action == "set_volume":
         value = intent_result.get("value", 50)
         success = system_controller.set_volume(value)
         if success:
-            speak(f"Volume set to {value} percent")
+            speak(f"Volume set to {value} percent", key="volume")
         else:
-            speak("Sorry, I couldn't change the volume")
+            speak("Sorry, I couldn't change the volume", key="volume")
         return False
     
     elif action == "get_volume":
@@ -1147,14 +1415,9 @@ def handle_command_with_ai(user_input, test_mode=False):
     
     elif action == "volume_change":
         direction = intent_result.get("direction", "up")
-        current_volume = system_controller.get_volume()
-        if current_volume is not None:
-            new_volume = min(100, max(0, current_volume + (10 if direction == "up" else -10)))
-            success = system_controller.set_volume(new_volume)
-            if success:
-                speak(f"Volume turned {direction} to {new_volume} percent")
-            else:
-                speak("Sorry, I couldn't change the volume")
+        new_volume = system_controller.adjust_volume(10 if direction == "up" else -10)
+        if new_volume is not None:
+            speak(f"Volume turned {direction} to {new_volume} percent")
         else:
             speak("Sorry, I couldn't adjust the volume")
         return False
@@ -1163,6 +1426,8 @@ def handle_command_with_ai(user_input, test_mode=False):
         info = system_controller.get_system_info()
         if info:
             response = f"System status: CPU usage {info['cpu']}%, "
+            if info.get('cpu_trend') in ('rising', 'falling'):
+                response = f"System status: CPU usage {info['cpu']}% and {info['cpu_trend']}, "
             response += f"Memory usage {info['memory_percent']}%, "
             response += f"{info['memory_available']} GB available, "
             response += f"Disk {info['disk_percent']}% used, {info['disk_free']} GB free"
@@ -1191,17 +1456,17 @@ def handle_command_with_ai(user_input, test_mode=False):
                 speak(f"System will shutdown in {delay} seconds")
                 system_controller.shutdown_system(delay)
             else:
-                speak("Shutting down the system")
+                speak_and_wait("Shutting down the system", priority=URGENT)
                 system_controller.shutdown_system()
         elif power_type in ["restart", "reboot"]:
             if delay > 0:
                 speak(f"System will restart in {delay} seconds")
                 system_controller.restart_system(delay)
             else:
-                speak("Restarting the system")
+                speak_and_wait("Restarting the system", priority=URGENT)
                 system_controller.restart_system()
         elif power_type in ["sleep", "hibernate"]:
-            speak("Putting system to sleep")
+            speak_and_wait("Putting system to sleep", priority=URGENT)
             subprocess.run("rundll32.exe powrprof.dll,SetSuspendState 0,1,0", shell=True)
         return False
     
@@ -1222,9 +1487,10 @@ def handle_command_with_ai(user_input, test_mode=False):
     
     if action == "open_app":
         if target:
-            # Use smart application finder
-            app_path = smart_find_application(target)
+            # Cached or predicted targets are already resolved; otherwise use smart application finder
+            app_path = intent_result.get("path") or launch_predictor.lookup('app', target) or smart_find_application(target)
             if app_path and os.path.exists(app_path):
+                action_cache.put(user_input, dict(intent_result, path=app_path))
                 try:
                     os.startfile(app_path)
                     speak(f"Opening {target}")
@@ -1236,6 +1502,7 @@ def handle_command_with_ai(user_input, test_mode=False):
                 if best_match:
                     backup_path = smart_find_application(best_match[0])
                     if backup_path:
+                        action_cache.put(user_input, dict(intent_result, target=best_match[0], path=backup_path))
                         try:
                             os.startfile(backup_path)
                             speak(f"Opening {best_match[0]}")
@@ -1279,9 +1546,10 @@ def handle_command_with_ai(user_input, test_mode=False):
     
     elif action == "open_folder":
         if target:
-            # Use smart folder finder
-            folder_path = smart_find_folder(target)
+            # Cached or predicted targets are already resolved; otherwise use smart folder finder
+            folder_path = intent_result.get("path") or launch_predictor.lookup('folder', target) or smart_find_folder(target)
             if folder_path and os.path.exists(folder_path):
+                action_cache.put(user_input, dict(intent_result, path=folder_path))
                 try:
                     os.startfile(folder_path)
                     speak(f"Opening {target} folder")
@@ -1293,6 +1561,7 @@ def handle_command_with_ai(user_input, test_mode=False):
                 if best_match:
                     backup_path = smart_find_folder(best_match[0])
                     if backup_path:
+                        action_cache.put(user_input, dict(intent_result, target=best_match[0], path=backup_path))
                         try:
                             os.startfile(backup_path)
                             speak(f"Opening {best_match[0]} folder")
@@ -1345,7 +1614,8 @@ def handle_command():
             
             # Convert buffer to numpy array
             if len(audio_buffer) > 0:
-                audio_data = np.array(list(audio_buffer))
+                with session_profiler.stage("capture"):
+                    audio_data = np.array(list(audio_buffer))
                 
                 print("Processing your speech...")
                 command_text = transcribe_audio_chunk(audio_data, command_model)
@@ -1368,7 +1638,7 @@ def handle_command():
 
 def start_assistant():
     wake_detected = threading.Event()
-    audio_buffer = deque(maxlen=int(SAMPLE_RATE * CHUNK_DURATION * 0.8))  # Reduced buffer size
+    audio_buffer = deque(maxlen=int(SAMPLE_RATE * perf.CHUNK_DURATION * 0.8))  # Reduced buffer size
     
     print("Voice Assistant is starting...")
     print("Say 'Maya' or 'Hey Maya' to activate")
@@ -1377,24 +1647,36 @@ def start_assistant():
         speak("Voice Assistant is ready")
         
         def audio_callback(indata, frames, time_info, status):
+            nonlocal audio_buffer
             if status:
                 # Only log severe status issues
                 if 'overflow' not in str(status).lower():
                     logger.warning(f'Audio callback status: {status}')
             
+            # Don't listen to our own voice while a reply is playing
+            if speech_queue.is_speaking():
+                audio_buffer.clear()
+                return
+            
+            # Resize the window if the performance profile changed
+            window = int(SAMPLE_RATE * perf.CHUNK_DURATION * 0.8)
+            if audio_buffer.maxlen != window:
+                audio_buffer = deque(audio_buffer, maxlen=window)
+            
             # Add new audio data to buffer
             audio_buffer.extend(indata[:, 0])
             
             # Process when buffer is full (less frequent processing)
-            if len(audio_buffer) >= int(SAMPLE_RATE * CHUNK_DURATION * 0.8):
+            if len(audio_buffer) >= window:
                 try:
-                    # Convert buffer to numpy array
-                    audio_data = np.array(list(audio_buffer))
-                    
-                    # === VOICE ACTIVITY DETECTION ===
-                    # Only skip if energy is very low to avoid missing wake words
-                    energy = np.sqrt(np.mean(audio_data ** 2))
-                    if energy < 0.0005:  # Very low threshold
+                    with session_profiler.stage("capture"):
+                        # Convert buffer to numpy array
+                        audio_data = np.array(list(audio_buffer))
+                        
+                        # === VOICE ACTIVITY DETECTION ===
+                        # Only skip if energy is very low to avoid missing wake words
+                        energy = np.sqrt(np.mean(audio_data ** 2))
+                    if energy < perf.WAKE_ENERGY_THRESHOLD:  # Very low threshold
                         audio_buffer.clear()
                         return
                     
@@ -1402,15 +1684,17 @@ def start_assistant():
                     text = transcribe_audio_chunk(audio_data, wake_word_model)
                     
                     if text:
-                        print(f"Heard: {text}")
+                        logger.debug("Heard: %s", text)
                         if contains_wake_word(text):
                             print(f"✅ Wake word detected in: {text}")
+                            # Resolve likely targets while the command is still being spoken
+                            launch_predictor.on_wake()
                             # Check if there's a command after the wake word
                             command = extract_command_after_wake_word(text)
                             if command:
                                 print(f"Command detected: {command}")
                                 # Process the command immediately using command model
-                                speak("Yes")
+                                speak("Yes", priority=HIGH, interrupt=True)
                                 result = handle_command_with_ai(command)
                                 if result:
                                     print("Conversation ended. Say 'Maya' to start again.")
@@ -1427,13 +1711,18 @@ def start_assistant():
         def continuous_conversation():
             """Session-based conversation with command timeout resets"""
             print("💬 Starting conversation session...")
-            speak("I'm listening...")
+            # Finish speaking before the microphone starts recording
+            speak_and_wait("I'm listening...", priority=HIGH)
             
             session_active = True
             
             while session_active:
+                # The previous reply plays while its action runs; wait for it before recording
+                speech_queue.wait_idle(timeout=30)
+                
                 # Listen for command with timeout - each command resets the timer
-                audio_buffer = deque(maxlen=int(SAMPLE_RATE * COMMAND_TIMEOUT))  
+                command_timeout = perf.COMMAND_TIMEOUT
+                audio_buffer = deque(maxlen=int(SAMPLE_RATE * command_timeout))  
                 command_received = False
                 
                 def command_callback(indata, frames, time_info, status):
@@ -1442,7 +1731,7 @@ def start_assistant():
                     audio_buffer.extend(indata[:, 0])
                 
                 try:
-                    print(f"Session active - listening for command... ({COMMAND_TIMEOUT} seconds)")
+                    print(f"Session active - listening for command... ({command_timeout} seconds)")
                     
                     with sd.InputStream(
                         samplerate=SAMPLE_RATE,
@@ -1452,13 +1741,14 @@ def start_assistant():
                     ):
                         # Listen for configured timeout duration
                         start_time = time.time()
-                        while time.time() - start_time < COMMAND_TIMEOUT:
+                        while time.time() - start_time < command_timeout:
                             time.sleep(0.1)
                             
                             # Check if we have enough audio to process
-                            if len(audio_buffer) > int(SAMPLE_RATE * 2):  # At least 2 seconds of audio
+                            if len(audio_buffer) > int(SAMPLE_RATE * perf.MIN_COMMAND_AUDIO):  # Enough audio for a command
                                 # Convert buffer to numpy array
-                                audio_data = np.array(list(audio_buffer))
+                                with session_profiler.stage("capture"):
+                                    audio_data = np.array(list(audio_buffer))
                                 
                                 print("Processing your speech...")
                                 command_text = transcribe_audio_chunk(audio_data, command_model)
@@ -1470,7 +1760,7 @@ def start_assistant():
                                     handle_command_with_ai(command_text)
                                     command_received = True
                                     # Session continues - reset timeout for next command
-                                    print(f"Command executed. Session continues for another {COMMAND_TIMEOUT} seconds...")
+                                    print(f"Command executed. Session continues for another {command_timeout} seconds...")
                                     break
                                 
                                 # Clear buffer for next attempt
@@ -1478,7 +1768,7 @@ def start_assistant():
                         
                         if not command_received:
                             # No command within timeout - end session silently
-                            print(f"Session timeout after {COMMAND_TIMEOUT} seconds.")
+                            print(f"Session timeout after {command_timeout} seconds.")
                             session_active = False
                             
                 except Exception as e:
@@ -1523,9 +1813,10 @@ class VoiceAssistant:
     
     def __init__(self):
         """Initialize the voice assistant"""
-        self.context = ContextualIntelligence()
-        self.cache = AppCache()
-        self.vad = VoiceActivityDetector()
+        # Share the module's instances - a second UsageStore/AppCache would overwrite the same files
+        self.context = contextual_ai
+        self.cache = app_cache
+        self.vad = vad
         print("Voice Assistant initialized")
     
     def parse_intent_local(self, text):
@@ -0,0 +1,189 @@
+"""
+Persistent command host for Friday Assistant
+Keeps one shell process (PowerShell on Windows) running and feeds it commands
+over a pipe, so system actions don't pay process startup every time
+"""
+
+import sys
+import time
+import uuid
+import queue
+import base64
+import threading
+import subprocess
+from collections import namedtuple
+
+CommandResult = namedtuple("CommandResult", ["ok", "output"])
+
+
+class CommandTimeout(Exception):
+    """The host didn't finish a command in time and was restarted"""
+
+
+class PowerShellTransport:
+    """Frames commands for a long-lived powershell.exe reading from stdin"""
+    argv = ["powershell", "-NoLogo", "-NoProfile", "-NonInteractive", "-Command", "-"]
+    init_commands = ["$ProgressPreference = 'SilentlyContinue'"]
+    marker_newline = False  # Out-String -Stream always ends its output with a full line
+
+    def wrap(self, command, marker):
+        # Base64 keeps multi-line scripts on one stdin line
+        encoded = base64.b64encode(command.encode("utf-8")).decode("ascii")
+        # Errors stop only this command; the session's preference is put back afterwards
+        return (
+            "$__ok = 1; $__eap = $ErrorActionPreference; $ErrorActionPreference = 'Stop'; "
+            f"try {{ Invoke-Expression ([Text.Encoding]::UTF8.GetString([Convert]::FromBase64String('{encoded}'))) | Out-String -Stream }} "
+            "catch { $__ok = 0; Write-Output $_.Exception.Message } "
+            "finally { $ErrorActionPreference = $__eap }; "
+            f"Write-Output ('{marker}' + $__ok)\n"
+        )
+
+    def parse_status(self, text):
+        return text.strip() == "1"
+
+
+class PosixShellTransport:
+    """Frames commands for /bin/sh - used to exercise the host on Linux"""
+    argv = ["/bin/sh"]
+    init_commands = []
+    marker_newline = True
+
+    def wrap(self, command, marker):
+        # The marker goes on a line of its own even if the output didn't end with a newline
+        return f"{command}\n__status=$?; echo; echo \"{marker}$__status\"\n"
+
+    def parse_status(self, text):
+        return text.strip() == "0"
+
+
+class CommandHost:
+    """One long-lived shell process shared by all system actions"""
+    def __init__(self, transport=None, default_timeout=10):
+        self.transport = transport or (PowerShellTransport() if sys.platform == "win32" else PosixShellTransport())
+        self.default_timeout = default_timeout
+        self.process = None
+        self.lines = None
+        self.lock = threading.Lock()
+        self.restarts = 0
+
+    def _reader(self, stream, lines):
+        for line in iter(stream.readline, ""):
+            lines.put(line)
+        lines.put(None)  # Process exited
+
+    def start(self):
+        """Spawn the host process (called automatically on first use)"""
+        creationflags = getattr(subprocess, "CREATE_NO_WINDOW", 0)
+        self.process = subprocess.Popen(
+            self.transport.argv,
+            stdin=subprocess.PIPE,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.STDOUT,
+            text=True,
+            bufsize=1,
+            creationflags=creationflags,
+        )
+        self.lines = queue.Queue()
+        threading.Thread(target=self._reader, args=(self.process.stdout, self.lines),
+                         daemon=True, name="command-host-reader").start()
+        for command in self.transport.init_commands:
+            self.process.stdin.write(command + "\n")
+        self.process.stdin.flush()
+
+    def start_async(self):
+        """Warm the host up in the background so the first command is fast"""
+        def run():
+            with self.lock:
+                if not self.is_alive():
+                    try:
+                        self.start()
+                    except OSError as e:
+                        print(f"Command host failed to start: {e}")
+        threading.Thread(target=run, daemon=True, name="command-host-start").start()
+
+    def is_alive(self):
+        return self.process is not None and self.process.poll() is None
+
+    def stop(self):
+        if self.process is None:
+            return
+        try:
+            self.process.kill()
+            self.process.wait(timeout=2)
+        except Exception:
+            pass
+        self.process = None
+
+    def restart(self):
+        self.stop()
+        self.restarts += 1
+        self.start()
+
+    def run(self, command, timeout=None):
+        """Run a command in the host; returns CommandResult or raises CommandTimeout
+
+        timeout covers the whole command, however much output it prints.
+        """
+        timeout = timeout or self.default_timeout
+        deadline = time.monotonic() + timeout
+        with self.lock:
+            if not self.is_alive():
+                if self.process is not None:
+                    self.restarts += 1
+                self.start()
+
+            marker = f"__FRIDAY_DONE_{uuid.uuid4().hex}__"
+            try:
+                self.process.stdin.write(self.transport.wrap(command, marker))
+                self.process.stdin.flush()
+            except (OSError, ValueError):
+                # Host died between commands - restart and retry once
+                self.restart()
+                self.process.stdin.write(self.transport.wrap(command, marker))
+                self.process.stdin.flush()
+
+            output = []
+            while True:
+                try:
+                    line = self.lines.get(timeout=max(0, deadline - time.monotonic()))
+                except queue.Empty:
+                    # Stuck command - kill the host so the next request gets a fresh one
+                    self.stop()
+                    self.restarts += 1
+                    raise CommandTimeout(f"Command timed out after {timeout}s")
+                if line is None:
+                    self.process = None
+                    self.restarts += 1
+                    return CommandResult(False, "".join(output))
+                if line.startswith(marker):
+                    ok = self.transport.parse_status(line[len(marker):])
+                    text = "".join(output)
+                    if self.transport.marker_newline:
+                        text = text[:-1]  # The newline written before the marker
+                    return CommandResult(ok, text)
+                output.append(line)
+
+
+if __name__ == "__main__":
+    # Compare a persistent host against spawning a new shell per command
+    import time
+
+    host = CommandHost()
+    command = "echo hello" if sys.platform != "win32" else "Write-Output hello"
+    argv = host.transport.argv[:-2] + ["-Command", command] if sys.platform == "win32" else ["/bin/sh", "-c", command]
+
+    runs = 20
+    start = time.perf_counter()
+    for _ in range(runs):
+        subprocess.run(argv, capture_output=True)
+    spawn_ms = (time.perf_counter() - start) * 1000 / runs
+
+    host.run(command)  # Startup is paid once
+    start = time.perf_counter()
+    for _ in range(runs):
+        result = host.run(command)
+    host_ms = (time.perf_counter() - start) * 1000 / runs
+    host.stop()
+
+    print(f"spawn per command: {spawn_ms:7.2f} ms")
+    print(f"persistent host:   {host_ms:7.2f} ms (last output: {result.output.strip()!r}, ok={result.ok})")
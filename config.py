@@ -4,12 +4,115 @@ from pathlib import Path
 # Voice Settings
 VOICE_RATE = 170
 VOICE_VOLUME = 1.0
+ELEVENLABS_STREAMING = True  # Start playing ElevenLabs audio while it is still downloading
+TTS_PREBUFFER_MS = 200  # Audio buffered before streamed playback starts
+TTS_BUFFER_MS = 3000  # Jitter buffer cap; the download pauses when it is full
+ELEVENLABS_FIRST_BYTE_DEADLINE = 1.5  # Seconds to wait for ElevenLabs audio before using the local voice
+ELEVENLABS_REQUEST_TIMEOUT = 10  # Hard limit for any single ElevenLabs request
+ELEVENLABS_FAILURE_THRESHOLD = 3  # Consecutive failures before ElevenLabs is skipped
+ELEVENLABS_COOLDOWN = 60  # Seconds ElevenLabs is skipped before being tried again
+TTS_CACHE_DIR = "tts_cache"  # Rendered phrases, keyed by voice, settings and text
+TTS_CACHE_MAX_MB = 50  # Least recently used phrases are deleted past this size
+TTS_CACHE_HOT_MB = 4  # Phrases also kept in memory
+TTS_WARMUP_ON_START = False  # Pre-render TTS_WARMUP_PHRASES in the background at startup (uses API credits)
+TTS_WARMUP_PHRASES = [
+    "Yes", "I'm listening...", "Voice Assistant is ready", "Goodbye!",
+    "Sorry, I didn't catch that.", "Searching for the folder...",
+    "What application would you like me to open?", "Which folder would you like me to open?",
+]
 
 # Whisper Settings
 WHISPER_WAKE_MODEL = "tiny"  # Fast model for wake word detection
 WHISPER_COMMAND_MODEL = "base"  # Accurate model for command recognition
 
+# Logging Settings
+LOG_LEVEL = "INFO"  # "DEBUG" turns on wake-word and audio tracing
+LOG_MAX_BYTES = 5 * 1024 * 1024  # logs/assistant.log rotates at this size
+LOG_BACKUP_COUNT = 3  # Rotated log files kept
+
+# Profiling Settings (also FRIDAY_PROFILE=5 or FRIDAY_PROFILE=30s, or say "start profiling")
+PROFILE_ON_START = False  # Profile the first commands after startup
+PROFILE_UTTERANCES = 5  # Commands captured per profiling run
+PROFILE_SECONDS = None  # Optional time limit for a run, in seconds
+PROFILE_DIR = "profiles"  # Timestamped .prof files and summaries go here
+
 # Command Settings
 COMMAND_TIMEOUT = 30  # Listen for commands for 30 seconds after wake word
 COMMAND_PHRASE_LIMIT = 7
 
+
+# File Search Settings
+FILE_INDEX_PATH = "file_index.db"  # SQLite filename index, rebuilt in background when missing
+WATCHER_SCAN_RATE = 200  # Max directories/sec the background index watcher touches
+CRAWL_WORKERS = 4  # Threads used by the directory crawler
+CRAWL_EXCLUDES = []  # Extra folder names to skip, on top of node_modules, .git, venvs, etc.
+FILE_SEARCH_CONFIDENCE = 0.9  # Stop searching once a filename matches this well
+FILE_SEARCH_TIME_BUDGET = 2.0  # Seconds before opening the best match found so far
+LAUNCHER_NEGATIVE_TTL = 300  # Seconds to remember that an app name wasn't found
+LAUNCHER_INDEX_MAX_AGE = 1800  # Seconds before the launcher index is rebuilt in the background
+LAUNCHER_BUILD_WAIT = 10  # Seconds a lookup waits for the first build before searching directly
+
+# System Metrics Settings
+METRICS_SAMPLE_INTERVAL = 5.0  # Seconds between background CPU/memory/disk/battery samples
+METRICS_WINDOW = 12  # Samples kept for averages and trends (12 x 5s = 1 minute)
+
+# Screenshot Settings
+SCREENSHOT_FORMAT = "png"  # "png", "jpeg", or "bmp" (uncompressed fast path)
+SCREENSHOT_COMPRESS_LEVEL = 1  # PNG zlib level 0-9; 1 is much faster than PIL's default 6
+SCREENSHOT_MAX_QUEUED = 3  # Captures waiting to be written before new ones are refused
+
+# Usage Learning Settings
+USAGE_FLUSH_INTERVAL = 30  # Seconds between background saves of usage_patterns.json
+SUGGESTION_TOP_K = 5  # Apps kept per hour in the suggestion index
+SUGGESTION_HALF_LIFE_DAYS = 14  # A launch counts half as much after this many days
+PREFETCH_TARGETS = 3  # Predicted apps/folders resolved ahead of time
+PREFETCH_MIN_INTERVAL = 60  # Seconds before a wake word may trigger another prefetch
+PREFETCH_PRESYNTHESIZE = False  # Also pre-render "Opening X" for predicted targets (uses ElevenLabs credits)
+ACTION_CACHE_SIZE = 64  # Recent utterances whose resolved action is remembered
+
+# Performance Profiles
+# Each profile sets the audio, speech recognition and sampling knobs together. A machine
+# picks a profile and overrides single keys in PERFORMANCE_OVERRIDES_FILE, e.g.
+#   {"profile": "low-power", "COMMAND_TIMEOUT": 20}
+# The file is re-read while the assistant runs; new model sizes load in the background.
+PERFORMANCE_PROFILE = "balanced"
+PERFORMANCE_OVERRIDES_FILE = "performance.json"  # Per-machine settings, not checked in
+PERFORMANCE_POLL_INTERVAL = 2.0  # Seconds between checks of the overrides file
+PERFORMANCE_PROFILES = {
+    # Desktop on mains power: shorter wake windows, a shorter wait before commands, no decode retries
+    "low-latency": {
+        "CHUNK_DURATION": 2.0,
+        "COMMAND_TIMEOUT": COMMAND_TIMEOUT,
+        "WAKE_ENERGY_THRESHOLD": 0.0005,
+        "VAD_ENERGY_THRESHOLD": 0.001,
+        "MIN_COMMAND_AUDIO": 1.5,
+        "WHISPER_WAKE_MODEL": "tiny",
+        "WHISPER_COMMAND_MODEL": "base",
+        "WHISPER_DECODE": {"temperature": 0.0, "condition_on_previous_text": False, "without_timestamps": True},
+        "METRICS_SAMPLE_INTERVAL": METRICS_SAMPLE_INTERVAL,
+    },
+    # Previous fixed behaviour
+    "balanced": {
+        "CHUNK_DURATION": 3.0,  # Seconds of audio per wake-word check
+        "COMMAND_TIMEOUT": COMMAND_TIMEOUT,  # Seconds a session listens after the wake word
+        "WAKE_ENERGY_THRESHOLD": 0.0005,  # Quieter wake windows are dropped without running Whisper
+        "VAD_ENERGY_THRESHOLD": 0.001,
+        "MIN_COMMAND_AUDIO": 2.0,  # Seconds recorded before a command is transcribed
+        "WHISPER_WAKE_MODEL": WHISPER_WAKE_MODEL,
+        "WHISPER_COMMAND_MODEL": WHISPER_COMMAND_MODEL,
+        "WHISPER_DECODE": {},  # Extra whisper transcribe() options (beam_size, temperature, fp16, ...)
+        "METRICS_SAMPLE_INTERVAL": METRICS_SAMPLE_INTERVAL,
+    },
+    # Laptop on battery: fewer, longer wake windows, one shared tiny model, fewer background samples
+    "low-power": {
+        "CHUNK_DURATION": 4.0,
+        "COMMAND_TIMEOUT": 20,
+        "WAKE_ENERGY_THRESHOLD": 0.002,
+        "VAD_ENERGY_THRESHOLD": 0.002,
+        "MIN_COMMAND_AUDIO": 2.0,
+        "WHISPER_WAKE_MODEL": "tiny",
+        "WHISPER_COMMAND_MODEL": "tiny",
+        "WHISPER_DECODE": {"temperature": 0.0, "fp16": False, "condition_on_previous_text": False},
+        "METRICS_SAMPLE_INTERVAL": 15.0,
+    },
+}
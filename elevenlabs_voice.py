@@ -4,25 +4,43 @@ Provides ultra-realistic AI voices
 """
 
 import os
-import tempfile
+import sys
+import threading
 import pygame
 from elevenlabs import ElevenLabs, VoiceSettings
 import json
 from pathlib import Path
+from config import (ELEVENLABS_STREAMING, TTS_PREBUFFER_MS, TTS_BUFFER_MS,
+                    TTS_CACHE_DIR, TTS_CACHE_MAX_MB, TTS_CACHE_HOT_MB, TTS_WARMUP_PHRASES,
+                    ELEVENLABS_FIRST_BYTE_DEADLINE, ELEVENLABS_REQUEST_TIMEOUT)
+from tts_stream import StreamingPlayer, SOUNDDEVICE_AVAILABLE
+from tts_cache import PhraseCache, phrase_key
+from tts_pipeline import split_segments, pipelined_chunks
+
+# Raw 16-bit PCM can be played as it arrives and needs no decoding; MP3 would need the whole file first
+STREAM_FORMAT = "pcm_22050"
+STREAM_SAMPLE_RATE = 22050
+SPEAK_SETTINGS = {"stability": 0.6, "similarity_boost": 0.8, "style": 0.0, "use_speaker_boost": True}
 
 class ElevenLabsVoice:
     def __init__(self):
         self.api_key = None
         self.voice_id = None
         self.voice_name = "Aria (Default)"
+        self.base_url = None  # Optional API override, e.g. tts_stub_server for testing
         self.client = None
+        self.player = StreamingPlayer(STREAM_SAMPLE_RATE, prebuffer_ms=TTS_PREBUFFER_MS, buffer_ms=TTS_BUFFER_MS)
+        self.last_stats = None
+        self.stop_event = threading.Event()  # Cuts off the pygame fallback
+        self.cache = PhraseCache(TTS_CACHE_DIR, TTS_CACHE_MAX_MB * 1024**2, TTS_CACHE_HOT_MB * 1024**2)
         self.load_config()
         
-        # Initialize pygame for audio playback
-        try:
-            pygame.mixer.init()
-        except:
-            print("⚠️ Could not initialize audio playback")
+        # pygame is only the fallback output, set up to take our PCM buffers as-is
+        if not SOUNDDEVICE_AVAILABLE:
+            try:
+                pygame.mixer.init(frequency=STREAM_SAMPLE_RATE, size=-16, channels=1)
+            except:
+                print("⚠️ Could not initialize audio playback")
         
     def load_config(self):
         """Load ElevenLabs configuration"""
@@ -33,9 +51,10 @@ class ElevenLabsVoice:
                     self.api_key = config.get("api_key")
                     self.voice_id = config.get("voice_id") 
                     self.voice_name = config.get("voice_name", "Aria")
+                    self.base_url = config.get("base_url")
                     
                 if self.api_key:
-                    self.client = ElevenLabs(api_key=self.api_key)
+                    self.client = self._make_client(self.api_key)
                     return True
         except Exception as e:
             print(f"Error loading ElevenLabs config: {e}")
@@ -55,7 +74,13 @@ class ElevenLabsVoice:
         self.api_key = api_key
         self.voice_id = voice_id
         self.voice_name = voice_name
-        self.client = ElevenLabs(api_key=api_key)
+        self.client = self._make_client(api_key)
+    
+    def _make_client(self, api_key):
+        # Bound every request so a hung connection can't stall speech indefinitely
+        if self.base_url:
+            return ElevenLabs(api_key=api_key, base_url=self.base_url, timeout=ELEVENLABS_REQUEST_TIMEOUT)
+        return ElevenLabs(api_key=api_key, timeout=ELEVENLABS_REQUEST_TIMEOUT)
         
     def setup_api_key(self):
         """Interactive API key setup"""
@@ -134,6 +159,29 @@ class ElevenLabsVoice:
                 
         return False
     
+    def play_pcm(self, audio):
+        """Play 16-bit PCM straight from memory; returns once playback has finished"""
+        if SOUNDDEVICE_AVAILABLE:
+            # Persistent output stream, completion signalled by the audio callback
+            self.last_stats = self.player.play([audio])
+            return
+        sound = pygame.mixer.Sound(buffer=audio)
+        self.stop_event.clear()
+        sound.play()
+        # Poll so stop() can cut playback short
+        while pygame.mixer.get_busy() and not self.stop_event.wait(0.02):
+            pass
+    
+    def stop(self):
+        """Cut off the current utterance"""
+        self.player.stop()
+        self.stop_event.set()
+        if not SOUNDDEVICE_AVAILABLE:
+            try:
+                pygame.mixer.stop()
+            except:
+                pass
+    
     def test_voice(self, voice_id, text):
         """Test a voice by generating and playing sample audio"""
         try:
@@ -143,42 +191,16 @@ class ElevenLabsVoice:
             audio_generator = self.client.text_to_speech.convert(
                 voice_id=voice_id,
                 optimize_streaming_latency="0",
-                output_format="mp3_22050_32",
+                output_format=STREAM_FORMAT,
                 text=text,
-                voice_settings=VoiceSettings(
-                    stability=0.5,
-                    similarity_boost=0.8,
-                    style=0.0,
-                    use_speaker_boost=True
-                )
+                voice_settings=VoiceSettings(**dict(SPEAK_SETTINGS, stability=0.5))
             )
             
-            # Convert generator to bytes
-            audio_bytes = b"".join(audio_generator)
-            
-            # Save to temporary file and play
-            with tempfile.NamedTemporaryFile(delete=False, suffix='.mp3') as temp_file:
-                temp_file.write(audio_bytes)
-                temp_path = temp_file.name
-            
-            # Play the audio
+            # Play the audio straight from memory
             try:
-                pygame.mixer.music.load(temp_path)
-                pygame.mixer.music.play()
-                
-                # Wait for playback to complete
-                import time
-                while pygame.mixer.music.get_busy():
-                    time.sleep(0.1)
-                    
+                self.play_pcm(b"".join(audio_generator))
             except Exception as e:
                 print(f"Audio playback error: {e}")
-            
-            # Clean up
-            try:
-                os.unlink(temp_path)
-            except:
-                pass
                 
             return True
             
@@ -186,54 +208,90 @@ class ElevenLabsVoice:
             print(f"Voice test error: {e}")
             return False
     
-    def speak(self, text):
-        """Generate speech using ElevenLabs"""
-        if not self.client or not self.api_key or not self.voice_id:
+    def _stream_request(self, text):
+        return self.client.text_to_speech.stream(
+            voice_id=self.voice_id,
+            optimize_streaming_latency="0",
+            output_format=STREAM_FORMAT,
+            text=text,
+            voice_settings=VoiceSettings(**SPEAK_SETTINGS)
+        )
+    
+    def _cache_key(self, text):
+        return phrase_key("elevenlabs", self.voice_id, dict(SPEAK_SETTINGS, format=STREAM_FORMAT), text)
+    
+    def _segment_chunks(self, text):
+        """Audio for one segment - from the phrase cache, or streamed and then cached"""
+        key = self._cache_key(text)
+        audio = self.cache.get(key)
+        if audio is not None:
+            # Rendered before - no network round-trip
+            yield audio
+            return
+        
+        rendered = []
+        for chunk in self._stream_request(text):
+            rendered.append(chunk)
+            yield chunk
+        # Only complete renderings are cached
+        self.cache.put(key, b"".join(rendered))
+    
+    def speak_streaming(self, text):
+        """Play audio chunks as they arrive instead of after the whole download;
+        long replies are rendered sentence by sentence, one segment ahead of playback"""
+        segments = split_segments(text) or [text]
+        # Give up quickly if the first audio is late so the local voice can take over
+        self.last_stats = self.player.play(pipelined_chunks(segments, self._segment_chunks),
+                                           first_byte_timeout=ELEVENLABS_FIRST_BYTE_DEADLINE)
+        return True
+    
+    def has_cached(self, text):
+        """True if every segment of text can be played without a network request"""
+        if not self.voice_id:
             return False
-            
-        try:
-            audio_generator = self.client.text_to_speech.convert(
-                voice_id=self.voice_id,
-                optimize_streaming_latency="0",
-                output_format="mp3_22050_32",
-                text=text,
-                voice_settings=VoiceSettings(
-                    stability=0.6,
-                    similarity_boost=0.8,
-                    style=0.0,
-                    use_speaker_boost=True
-                )
-            )
-            
-            # Convert generator to bytes
-            audio_bytes = b"".join(audio_generator)
-            
-            # Play the audio
-            with tempfile.NamedTemporaryFile(delete=False, suffix='.mp3') as temp_file:
-                temp_file.write(audio_bytes)
-                temp_path = temp_file.name
-            
+        return all(self.cache.contains(self._cache_key(segment)) for segment in split_segments(text) or [text])
+    
+    def prerender(self, text):
+        """Render a phrase into the cache without playing it; True if anything was rendered now
+
+        Cached per segment, the same way speak() looks the audio up.
+        """
+        if not self.is_configured():
+            return False
+        rendered = False
+        for segment in split_segments(text) or [text]:
+            if self.cache.contains(self._cache_key(segment)):
+                continue
             try:
-                pygame.mixer.music.load(temp_path)
-                pygame.mixer.music.play()
-                
-                # Wait for playback to complete
-                import time
-                while pygame.mixer.music.get_busy():
-                    time.sleep(0.1)
-                    
-            finally:
-                # Clean up
-                try:
-                    os.unlink(temp_path)
-                except:
+                for _ in self._segment_chunks(segment):
                     pass
-                    
-            return True
-            
-        except Exception as e:
-            print(f"ElevenLabs speech error: {e}")
+                rendered = True
+            except Exception as e:
+                print(f"Could not pre-render '{segment}': {e}")
+        return rendered
+    
+    def warm_up(self, phrases=None):
+        """Pre-render a phrase list so those responses play instantly"""
+        rendered = sum(1 for phrase in (phrases or TTS_WARMUP_PHRASES) if self.prerender(phrase))
+        print(f"TTS cache warm-up: {rendered} phrases rendered, {self.cache.stats()}")
+        return rendered
+    
+    def speak(self, text):
+        """Generate speech using ElevenLabs
+
+        Returns False if not configured. Request and playback errors, including a
+        stream that breaks after the first audio, are raised to the caller.
+        """
+        if not self.client or not self.api_key or not self.voice_id:
             return False
+        
+        if ELEVENLABS_STREAMING and SOUNDDEVICE_AVAILABLE:
+            return self.speak_streaming(text)
+            
+        # Whole reply first, then play from memory
+        segments = split_segments(text) or [text]
+        self.play_pcm(b"".join(pipelined_chunks(segments, self._segment_chunks)))
+        return True
     
     def is_configured(self):
         """Check if ElevenLabs is properly configured"""
@@ -254,7 +312,24 @@ def is_elevenlabs_ready():
     """Check if ElevenLabs is configured and ready"""
     return elevenlabs_voice.is_configured()
 
+def prerender_with_elevenlabs(text):
+    """Cache a phrase's audio ahead of time"""
+    return elevenlabs_voice.prerender(text)
+
+def warm_up_elevenlabs(phrases=None):
+    """Pre-render the common responses into the phrase cache"""
+    return elevenlabs_voice.warm_up(phrases)
+
 if __name__ == "__main__":
+    if "--warm-up" in sys.argv:
+        # python elevenlabs_voice.py --warm-up [phrase ...]
+        phrases = [arg for arg in sys.argv[1:] if arg != "--warm-up"]
+        if not elevenlabs_voice.is_configured():
+            print("❌ ElevenLabs is not configured")
+        else:
+            warm_up_elevenlabs(phrases or None)
+        sys.exit(0)
+    
     print("🎙️ ElevenLabs Voice Setup for Friday")
     print("=" * 40)
     
@@ -262,7 +337,10 @@ if __name__ == "__main__":
         print(f"✅ Already configured with voice: {elevenlabs_voice.voice_name}")
         test = input("\\nTest current voice? (y/n): ").lower()
         if test == 'y':
-            elevenlabs_voice.speak("Hello! I'm Friday, your advanced AI assistant with ElevenLabs voice!")
+            try:
+                elevenlabs_voice.speak("Hello! I'm Friday, your advanced AI assistant with ElevenLabs voice!")
+            except Exception as e:
+                print(f"❌ ElevenLabs speech error: {e}")
     else:
         print("Setting up ElevenLabs for the first time...")
         success = elevenlabs_voice.setup_api_key()
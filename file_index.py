@@ -0,0 +1,313 @@
+"""
+Persistent filename index for Friday Assistant
+Stores every file and folder under the search root in SQLite so lookups
+don't have to walk the disk on each request
+"""
+
+import os
+import sqlite3
+import threading
+import time
+
+from crawler import crawl, CrawlRules
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS entries (
+    id INTEGER PRIMARY KEY,
+    path TEXT NOT NULL UNIQUE,
+    parent TEXT NOT NULL,
+    basename TEXT NOT NULL,
+    ext TEXT NOT NULL,
+    mtime REAL NOT NULL,
+    is_dir INTEGER NOT NULL
+);
+CREATE INDEX IF NOT EXISTS entries_basename ON entries (basename COLLATE NOCASE);
+CREATE INDEX IF NOT EXISTS entries_parent ON entries (parent);
+CREATE TABLE IF NOT EXISTS meta (
+    key TEXT PRIMARY KEY,
+    value TEXT
+);
+"""
+
+# Trigram FTS keeps substring matches fast; needs SQLite 3.34+
+FTS_SCHEMA = """
+CREATE VIRTUAL TABLE IF NOT EXISTS entries_fts USING fts5(
+    basename, content='entries', content_rowid='id', tokenize='trigram'
+);
+CREATE TRIGGER IF NOT EXISTS entries_ai AFTER INSERT ON entries BEGIN
+    INSERT INTO entries_fts(rowid, basename) VALUES (new.id, new.basename);
+END;
+CREATE TRIGGER IF NOT EXISTS entries_ad AFTER DELETE ON entries BEGIN
+    INSERT INTO entries_fts(entries_fts, rowid, basename) VALUES ('delete', old.id, old.basename);
+END;
+CREATE TRIGGER IF NOT EXISTS entries_au AFTER UPDATE ON entries BEGIN
+    INSERT INTO entries_fts(entries_fts, rowid, basename) VALUES ('delete', old.id, old.basename);
+    INSERT INTO entries_fts(rowid, basename) VALUES (new.id, new.basename);
+END;
+"""
+
+BATCH_SIZE = 5000
+SCHEMA_VERSION = "2"
+
+
+def _escape_like(text):
+    """Escape LIKE wildcards so text matches literally (with ESCAPE '\\')"""
+    return text.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+
+
+class FileIndex:
+    """SQLite-backed index of file and folder names under a root directory"""
+    def __init__(self, db_path="file_index.db", root=None, rules=None, workers=4):
+        self.db_path = db_path
+        self.root = root or os.path.expanduser("~")
+        self.rules = rules or CrawlRules()
+        self.workers = workers
+        self.local = threading.local()
+        self.build_lock = threading.Lock()
+        self.build_thread = None
+        self.fts_available = self._create_schema()
+
+    def _connect(self):
+        """Get a connection for the calling thread"""
+        conn = getattr(self.local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.db_path, timeout=30)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            # Lets INSERT OR REPLACE fire the delete trigger that keeps the FTS table in sync
+            conn.execute("PRAGMA recursive_triggers=ON")
+            self.local.conn = conn
+        return conn
+
+    def _create_schema(self):
+        conn = self._connect()
+        try:
+            row = conn.execute("SELECT value FROM meta WHERE key = 'schema_version'").fetchone()
+            if not row or row[0] != SCHEMA_VERSION:
+                # Old layout - drop it and let the next build repopulate
+                conn.executescript(
+                    "DROP TABLE IF EXISTS entries_fts; DROP TABLE IF EXISTS entries; DROP TABLE IF EXISTS meta;")
+        except sqlite3.OperationalError:
+            pass  # Fresh database
+        conn.executescript(SCHEMA)
+        with conn:
+            self._set_meta(conn, "schema_version", SCHEMA_VERSION)
+        try:
+            conn.executescript(FTS_SCHEMA)
+            return True
+        except sqlite3.OperationalError:
+            # Older SQLite without fts5/trigram - fall back to LIKE queries
+            return False
+
+    def _get_meta(self, key):
+        row = self._connect().execute("SELECT value FROM meta WHERE key = ?", (key,)).fetchone()
+        return row[0] if row else None
+
+    def _set_meta(self, conn, key, value):
+        conn.execute("INSERT OR REPLACE INTO meta (key, value) VALUES (?, ?)", (key, str(value)))
+
+    def is_ready(self):
+        """Check if the index holds a complete scan of the current root"""
+        try:
+            return self._get_meta("root") == self.root and self._get_meta("last_build") is not None
+        except sqlite3.Error:
+            return False
+
+    def is_building(self):
+        return bool(self.build_thread and self.build_thread.is_alive())
+
+    def is_indexable(self, path):
+        """Check if a path lives under the root and outside pruned folders"""
+        return self.rules.allows_path(self.root, path)
+
+    @staticmethod
+    def _make_row(full_path, is_dir, entry=None):
+        name = os.path.basename(full_path)
+        try:
+            # DirEntry.stat() is free on Windows - the listing already carries it
+            mtime = (entry.stat(follow_symlinks=False) if entry else os.stat(full_path)).st_mtime
+        except OSError:
+            mtime = 0.0
+        ext = "" if is_dir else os.path.splitext(name)[1].lower()
+        return (full_path, os.path.dirname(full_path), name, ext, mtime, int(is_dir))
+
+    def _scan(self, top=None):
+        """Yield index rows under top (default: the root), skipping pruned folders"""
+        for item in crawl(top or self.root, rules=self.rules, workers=self.workers):
+            yield self._make_row(item.path, item.is_dir, item.entry)
+
+    def _insert(self, conn, rows):
+        conn.executemany(
+            "INSERT OR REPLACE INTO entries (path, parent, basename, ext, mtime, is_dir) VALUES (?, ?, ?, ?, ?, ?)",
+            rows)
+
+    def build(self):
+        """Rebuild the whole index from disk"""
+        with self.build_lock:
+            start = time.time()
+            conn = self._connect()
+            count = 0
+            with conn:
+                conn.execute("DELETE FROM entries")
+                batch = []
+                for row in self._scan():
+                    batch.append(row)
+                    if len(batch) >= BATCH_SIZE:
+                        self._insert(conn, batch)
+                        count += len(batch)
+                        batch = []
+                if batch:
+                    self._insert(conn, batch)
+                    count += len(batch)
+                self._set_meta(conn, "root", self.root)
+                self._set_meta(conn, "last_build", time.time())
+            print(f"Indexed {count} items in {time.time() - start:.1f}s")
+            return count
+
+    def build_async(self):
+        """Build the index on a background thread"""
+        if self.is_building():
+            return self.build_thread
+
+        def run():
+            try:
+                self.build()
+            except Exception as e:
+                print(f"File index build error: {e}")
+
+        self.build_thread = threading.Thread(target=run, daemon=True, name="file-index-build")
+        self.build_thread.start()
+        return self.build_thread
+
+    # === Incremental updates (used by index_watcher) ===
+
+    def add_path(self, path):
+        """Add or refresh a single path; new folders are indexed with their contents"""
+        if not self.is_indexable(path) or not os.path.exists(path):
+            return 0
+        is_dir = os.path.isdir(path)
+        rows = [self._make_row(path, is_dir)]
+        if is_dir:
+            rows.extend(self._scan(path))
+        conn = self._connect()
+        with conn:
+            self._insert(conn, rows)
+        return len(rows)
+
+    def remove_path(self, path):
+        """Remove a path and everything below it"""
+        # Case-sensitive range over the UNIQUE path index: everything starting with
+        # "path/" sorts before "path" + the character after the separator.
+        # (LIKE ignores case, so removing Foo would also remove foo/...)
+        base = path.rstrip(os.sep)
+        low = base + os.sep
+        high = base + chr(ord(os.sep) + 1)
+        conn = self._connect()
+        with conn:
+            cur = conn.execute("DELETE FROM entries WHERE path = ? OR (path >= ? AND path < ?)", (base, low, high))
+        return cur.rowcount
+
+    def move_path(self, old_path, new_path):
+        """Apply a rename or move"""
+        self.remove_path(old_path)
+        return self.add_path(new_path)
+
+    def children(self, directory):
+        """Names of the indexed entries directly inside a directory"""
+        return set(self.child_entries(directory))
+
+    def child_entries(self, directory):
+        """{name: is_dir} for the indexed entries directly inside a directory"""
+        rows = self._connect().execute("SELECT basename, is_dir FROM entries WHERE parent = ?", (directory,)).fetchall()
+        return {r[0]: bool(r[1]) for r in rows}
+
+    def directories(self):
+        """All indexed directories, including the root"""
+        rows = self._connect().execute("SELECT path FROM entries WHERE is_dir = 1").fetchall()
+        return [self.root] + [r[0] for r in rows]
+
+    def last_build(self):
+        """When the index last matched the disk (a full build or a startup reconcile)"""
+        value = self._get_meta("last_build")
+        return float(value) if value else 0.0
+
+    def mark_synced(self, timestamp):
+        conn = self._connect()
+        with conn:
+            self._set_meta(conn, "last_build", timestamp)
+
+    def iter_search(self, query, search_type="file", extensions=None, page_size=32):
+        """Yield (path, priority) matches lazily, Desktop first, then Documents, then the rest
+
+        Rows are fetched a page at a time (doubling up to 1024), so a caller that
+        stops after the first few matches only pays for a small top-N query.
+        """
+        query = query.lower().strip()
+        if not query:
+            return
+
+        is_dir = 1 if search_type == "folder" else 0
+        # Prioritize desktop and documents locations, then shorter paths
+        priority_sql = ("CASE WHEN instr(e.path, 'Desktop') > 0 THEN 2 "
+                        "WHEN instr(e.path, 'Documents') > 0 THEN 1 ELSE 0 END")
+        if self.fts_available and len(query) >= 3:
+            # Trigram MATCH is case-insensitive and works on substrings
+            source = "entries_fts f JOIN entries e ON e.id = f.rowid WHERE entries_fts MATCH ?"
+            params = ['"' + query.replace('"', '""') + '"']
+        else:
+            source = "entries e WHERE e.basename LIKE ? ESCAPE '\\'"
+            params = ["%" + _escape_like(query) + "%"]
+        params.append(is_dir)
+        ext_sql = ""
+        if extensions:
+            ext_sql = " AND (" + " OR ".join("e.path LIKE ? ESCAPE '\\'" for _ in extensions) + ")"
+            params.extend("%" + _escape_like(ext) for ext in extensions)
+        # Keyset paging: each page continues after the last row of the previous one, on a
+        # total order (path breaks ties), so rows written in between can't shift the pages
+        sql = (f"SELECT path, priority FROM (SELECT e.path AS path, {priority_sql} AS priority FROM {source} "
+               f"AND e.is_dir = ?{ext_sql}) "
+               "WHERE ? IS NULL OR (-priority, length(path), path) > (?, ?, ?) "
+               "ORDER BY -priority, length(path), path LIMIT ?")
+        conn = self._connect()
+        last = None
+        while True:
+            after = last or (None, None, None)
+            rows = conn.execute(sql, params + [after[0], *after, page_size]).fetchall()
+            for path, priority in rows:
+                yield path, priority
+            if len(rows) < page_size:
+                return
+            path, priority = rows[-1]
+            last = (-priority, len(path), path)
+            page_size = min(page_size * 2, 1024)
+
+    def search(self, query, search_type="file", extensions=None, limit=None):
+        """Find paths whose basename contains the query, best locations first"""
+        results = []
+        page_size = min(limit, 1024) if limit else 32
+        for path, _ in self.iter_search(query, search_type, extensions, page_size):
+            results.append(path)
+            if limit and len(results) >= limit:
+                break
+        return results
+
+    def count(self):
+        return self._connect().execute("SELECT COUNT(*) FROM entries").fetchone()[0]
+
+
+if __name__ == "__main__":
+    import sys
+
+    index = FileIndex(root=sys.argv[1] if len(sys.argv) > 1 else None)
+    if not index.is_ready():
+        index.build()
+    print(f"{index.count()} items indexed under {index.root}")
+    while True:
+        q = input("\nSearch (blank to quit): ").strip()
+        if not q:
+            break
+        start = time.perf_counter()
+        results = index.search(q)
+        print(f"{len(results)} matches in {(time.perf_counter() - start) * 1000:.1f} ms")
+        for r in results[:10]:
+            print(f"  {r}")
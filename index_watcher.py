@@ -0,0 +1,354 @@
+"""
+Incremental index maintenance for Friday Assistant
+Applies file creates, renames and deletes to the file and folder indexes as
+they happen, using inotify on Linux and a throttled polling scan elsewhere
+"""
+
+import os
+import sys
+import time
+import struct
+import select
+import threading
+import ctypes
+import ctypes.util
+from array import array
+
+from crawler import crawl, CrawlRules
+from path_table import PathTable
+
+# inotify event masks (from <sys/inotify.h>)
+IN_MOVED_FROM = 0x00000040
+IN_MOVED_TO = 0x00000080
+IN_CREATE = 0x00000100
+IN_DELETE = 0x00000200
+IN_DELETE_SELF = 0x00000400
+IN_MOVE_SELF = 0x00000800
+IN_Q_OVERFLOW = 0x00004000
+IN_IGNORED = 0x00008000
+IN_ONLYDIR = 0x01000000
+IN_ISDIR = 0x40000000
+WATCH_MASK = IN_CREATE | IN_DELETE | IN_MOVED_FROM | IN_MOVED_TO | IN_DELETE_SELF | IN_MOVE_SELF | IN_ONLYDIR
+
+EVENT_HEADER = struct.Struct("iIII")
+
+
+class Throttle:
+    """Caps background work to a fixed number of operations per second"""
+    def __init__(self, rate):
+        self.interval = 1.0 / rate if rate else 0.0
+        self.next_time = time.monotonic()
+
+    def wait(self, stop_event=None):
+        if not self.interval:
+            return
+        now = time.monotonic()
+        if self.next_time > now:
+            if stop_event:
+                stop_event.wait(self.next_time - now)
+            else:
+                time.sleep(self.next_time - now)
+        self.next_time = max(now, self.next_time) + self.interval
+
+
+def _lower_thread_priority():
+    """Make the calling thread yield CPU to speech recognition (Linux only)"""
+    try:
+        os.setpriority(os.PRIO_PROCESS, threading.get_native_id(), 10)
+    except (AttributeError, OSError):
+        pass
+
+
+class InotifyBackend:
+    """Linux inotify watcher - one watch per indexed directory"""
+    def __init__(self, watcher):
+        self.watcher = watcher
+        libc_name = ctypes.util.find_library("c")
+        if not sys.platform.startswith("linux") or not libc_name:
+            raise OSError("inotify is only available on Linux")
+        self.libc = ctypes.CDLL(libc_name, use_errno=True)
+        self.fd = self.libc.inotify_init()
+        if self.fd < 0:
+            raise OSError(ctypes.get_errno(), "inotify_init failed")
+        self.watches = {}  # wd -> directory path
+
+    def add_watch(self, path):
+        wd = self.libc.inotify_add_watch(self.fd, os.fsencode(path), WATCH_MASK)
+        if wd < 0:
+            err = ctypes.get_errno()
+            # ENOSPC means max_user_watches is exhausted - caller falls back to polling
+            raise OSError(err, f"inotify_add_watch failed for {path}")
+        self.watches[wd] = path
+
+    def add_tree(self, top, stop_event, since=None):
+        """Watch a directory and all indexable directories under it
+
+        With since (a timestamp the index was in sync at), directories modified
+        after it are reconciled with the index once their watch is in place, to
+        pick up changes made while nothing was watching. Returns False if stopped.
+        """
+        for directory in [top] + self.watcher.subdirectories(top):
+            if stop_event.is_set():
+                return False
+            try:
+                self.add_watch(directory)
+            except OSError as e:
+                if e.errno == 28:  # ENOSPC
+                    raise
+            if since is not None:
+                try:
+                    changed = os.stat(directory).st_mtime > since
+                except OSError:
+                    changed = False
+                if changed:
+                    self.watcher.reconcile(directory)
+            self.watcher.throttle.wait(stop_event)
+        return True
+
+    def _rename_watches(self, old_path, new_path):
+        prefix = old_path + os.sep
+        for wd, path in list(self.watches.items()):
+            if path == old_path:
+                self.watches[wd] = new_path
+            elif path.startswith(prefix):
+                self.watches[wd] = new_path + path[len(old_path):]
+
+    def run(self, stop_event):
+        index = self.watcher.index
+        started = time.time()
+        # The index is persistent - catch up on whatever changed while the assistant wasn't running
+        if self.add_tree(index.root, stop_event, since=index.last_build()):
+            index.mark_synced(started)
+        while not stop_event.is_set():
+            ready, _, _ = select.select([self.fd], [], [], 0.5)
+            if not ready:
+                continue
+            data = os.read(self.fd, 64 * 1024)
+            self._handle_events(data, stop_event)
+
+    def _handle_events(self, data, stop_event):
+        pending_moves = {}  # cookie -> (old path, is_dir)
+        offset = 0
+        while offset < len(data):
+            wd, mask, cookie, length = EVENT_HEADER.unpack_from(data, offset)
+            offset += EVENT_HEADER.size
+            name = os.fsdecode(data[offset:offset + length].rstrip(b"\0"))
+            offset += length
+
+            if mask & IN_Q_OVERFLOW:
+                # Events were dropped - only a full rebuild can recover
+                self.watcher.request_rebuild()
+                continue
+            if mask & IN_IGNORED:
+                self.watches.pop(wd, None)
+                continue
+            parent = self.watches.get(wd)
+            if parent is None or not name:
+                continue
+
+            path = os.path.join(parent, name)
+            is_dir = bool(mask & IN_ISDIR)
+            if mask & IN_CREATE:
+                self.watcher.apply("created", path, is_dir)
+                if is_dir:
+                    self.add_tree(path, stop_event)
+            elif mask & IN_DELETE:
+                self.watcher.apply("deleted", path, is_dir)
+            elif mask & IN_MOVED_FROM:
+                pending_moves[cookie] = (path, is_dir)
+            elif mask & IN_MOVED_TO:
+                if cookie in pending_moves:
+                    old_path, _ = pending_moves.pop(cookie)
+                    self.watcher.apply("moved", old_path, is_dir, dest=path)
+                    if is_dir:
+                        self._rename_watches(old_path, path)
+                else:
+                    # Moved in from outside the watched tree
+                    self.watcher.apply("created", path, is_dir)
+                    if is_dir:
+                        self.add_tree(path, stop_event)
+
+        # Moved out of the watched tree
+        for old_path, is_dir in pending_moves.values():
+            self.watcher.apply("deleted", old_path, is_dir)
+
+    def close(self):
+        try:
+            os.close(self.fd)
+        except OSError:
+            pass
+
+
+class PollingBackend:
+    """Portable fallback - checks directory mtimes round-robin at a throttled rate"""
+    def __init__(self, watcher):
+        self.watcher = watcher
+        # Watched directories live in a compact PathTable with a parallel mtime array;
+        # -1 marks ancestor nodes that were interned but are not polled themselves
+        self.dirs = PathTable()
+        self.mtimes = array("d")
+
+    def _watch(self, directory, mtime):
+        idx = self.dirs.add(directory, is_dir=True)
+        while len(self.mtimes) < len(self.dirs):
+            self.mtimes.append(-1.0)
+        self.mtimes[idx] = mtime
+        return idx
+
+    def _is_watched(self, path):
+        idx = self.dirs.find_dir(path)
+        return idx is not None and self.mtimes[idx] >= 0
+
+    def run(self, stop_event):
+        index = self.watcher.index
+        baseline = index.last_build()
+        for directory in index.directories():
+            self._watch(directory, baseline)
+
+        while not stop_event.is_set():
+            polled = False
+            for idx in range(len(self.dirs)):
+                if stop_event.is_set():
+                    return
+                if self.mtimes[idx] < 0 or self.dirs.is_removed(idx):
+                    continue
+                polled = True
+                self.watcher.throttle.wait(stop_event)
+                self._check_directory(idx)
+            if not polled:
+                stop_event.wait(1.0)
+
+    def _check_directory(self, idx):
+        # A directory's mtime changes whenever an entry is created, deleted or renamed in it
+        directory = self.dirs.path(idx)
+        try:
+            mtime = os.stat(directory).st_mtime
+        except OSError:
+            self.dirs.remove_tree(idx)
+            return
+        if mtime <= self.mtimes[idx]:
+            return
+        self.mtimes[idx] = mtime
+
+        created, deleted = self.watcher.reconcile(directory)
+        for path in deleted:
+            if self._is_watched(path):
+                self.dirs.remove_tree(self.dirs.find_dir(path))
+        for path in created:
+            for d in [path] + self.watcher.subdirectories(path):
+                self._watch(d, time.time())
+
+    def close(self):
+        pass
+
+
+class IndexWatcher:
+    """Keeps a FileIndex (and any registered listeners) in sync with the disk"""
+    def __init__(self, index, scan_rate=200, use_inotify=True):
+        self.index = index
+        self.throttle = Throttle(scan_rate)
+        self.use_inotify = use_inotify
+        self.listeners = []
+        self.backend = None
+        self.stop_event = threading.Event()
+        self.thread = None
+
+    def add_listener(self, callback):
+        """Register callback(kind, path, is_dir, dest) for every applied change"""
+        self.listeners.append(callback)
+
+    def apply(self, kind, path, is_dir, dest=None):
+        """Apply one change to the index and notify listeners"""
+        target = dest if kind == "moved" else path
+        if kind != "deleted" and os.path.exists(os.path.join(os.path.dirname(target), "pyvenv.cfg")):
+            return  # Inside a virtualenv, which the crawler prunes
+        try:
+            if kind == "created":
+                self.index.add_path(path)
+            elif kind == "deleted":
+                self.index.remove_path(path)
+            elif kind == "moved":
+                self.index.move_path(path, dest)
+        except Exception as e:
+            print(f"Index update error for {path}: {e}")
+
+        for callback in self.listeners:
+            try:
+                callback(kind, path, is_dir, dest)
+            except Exception as e:
+                print(f"Index listener error: {e}")
+
+    def reconcile(self, directory):
+        """Diff one directory's entries against the index and apply the difference
+
+        Returns (created directories, deleted directories).
+        """
+        try:
+            on_disk = {e.name for e in os.scandir(directory) if not self.index.rules.is_excluded(e.name)}
+        except OSError:
+            return [], []
+        if "pyvenv.cfg" in on_disk:
+            return [], []  # Virtualenv contents are never indexed
+        indexed = self.index.child_entries(directory)
+
+        created, deleted = [], []
+        for name in indexed.keys() - on_disk:
+            path = os.path.join(directory, name)
+            self.apply("deleted", path, indexed[name])
+            if indexed[name]:
+                deleted.append(path)
+        for name in on_disk - indexed.keys():
+            path = os.path.join(directory, name)
+            is_dir = os.path.isdir(path)
+            self.apply("created", path, is_dir)
+            if is_dir:
+                created.append(path)
+        return created, deleted
+
+    def subdirectories(self, top):
+        """All directories below top that the index covers"""
+        rules = self.index.rules
+        dir_rules = CrawlRules(skip_hidden=rules.skip_hidden, excludes=rules.excludes, include_files=False)
+        return [item.path for item in crawl(top, rules=dir_rules, workers=1)]
+
+    def request_rebuild(self):
+        self.index.build_async()
+
+    def _create_backend(self):
+        if self.use_inotify:
+            try:
+                return InotifyBackend(self)
+            except OSError:
+                pass
+        return PollingBackend(self)
+
+    def _run(self):
+        _lower_thread_priority()
+        # Watching needs a complete index to diff against
+        while not self.index.is_ready() and not self.stop_event.is_set():
+            self.stop_event.wait(1.0)
+
+        self.backend = self._create_backend()
+        try:
+            self.backend.run(self.stop_event)
+        except OSError as e:
+            if isinstance(self.backend, PollingBackend):
+                raise
+            print(f"inotify unavailable ({e}), falling back to polling")
+            self.backend.close()
+            self.backend = PollingBackend(self)
+            self.backend.run(self.stop_event)
+        finally:
+            self.backend.close()
+
+    def start(self):
+        if self.thread and self.thread.is_alive():
+            return
+        self.stop_event.clear()
+        self.thread = threading.Thread(target=self._run, daemon=True, name="index-watcher")
+        self.thread.start()
+
+    def stop(self):
+        self.stop_event.set()
+        if self.thread:
+            self.thread.join(timeout=2)
@@ -0,0 +1,101 @@
+"""
+Predictive prefetch of likely launch targets for Friday Assistant
+At each hour boundary and on wake-word detection, the apps and folders most used
+at this hour are resolved ahead of time, so the likely command skips the lookup
+"""
+
+import os
+import time
+import threading
+from datetime import datetime
+
+
+class LaunchPredictor:
+    """Pre-resolves the top predicted targets on a background thread
+
+    predict(hour) returns [(kind, name), ...] best first; resolvers maps each kind
+    ('app', 'folder') to a function returning a path or None. presynthesize, if
+    given, is called with the response text for each resolved target.
+    """
+    def __init__(self, predict, resolvers, limit=3, min_interval=60, presynthesize=None):
+        self.predict = predict
+        self.resolvers = resolvers
+        self.limit = limit
+        self.min_interval = min_interval
+        self.presynthesize = presynthesize
+        self.resolved = {}  # (kind, name) -> path
+        self.lock = threading.Lock()
+        self.running = threading.Lock()  # One prefetch at a time
+        self.stop_event = threading.Event()
+        self.thread = None
+        self.last_run = (None, 0.0)  # (hour, timestamp)
+        self.hits = 0
+        self.misses = 0
+
+    def prefetch(self, hour=None):
+        """Resolve the predicted targets for an hour now; returns how many resolved"""
+        hour = datetime.now().hour if hour is None else hour
+        if not self.running.acquire(blocking=False):
+            return 0
+        try:
+            resolved = {}
+            for kind, name in self.predict(hour)[:self.limit]:
+                resolver = self.resolvers.get(kind)
+                if resolver is None:
+                    continue
+                try:
+                    path = resolver(name)
+                except Exception as e:
+                    print(f"Prefetch of {name} failed: {e}")
+                    continue
+                # Resolvers evict stale entries; only keep paths that are really there
+                if path and (not os.path.isabs(path) or os.path.exists(path)):
+                    resolved[(kind, name)] = path
+                    if self.presynthesize:
+                        self.presynthesize(f"Opening {name} folder" if kind == 'folder' else f"Opening {name}")
+            with self.lock:
+                self.resolved = resolved
+            self.last_run = (hour, time.time())
+            return len(resolved)
+        finally:
+            self.running.release()
+
+    def prefetch_async(self, hour=None):
+        threading.Thread(target=self.prefetch, args=(hour,), daemon=True, name="launch-prefetch").start()
+
+    def on_wake(self):
+        """Wake word heard - refresh predictions unless we just did for this hour"""
+        hour = datetime.now().hour
+        last_hour, last_time = self.last_run
+        if last_hour == hour and time.time() - last_time < self.min_interval:
+            return
+        self.prefetch_async(hour)
+
+    def lookup(self, kind, name):
+        """Pre-resolved path for a target, or None if it wasn't predicted or is gone"""
+        with self.lock:
+            path = self.resolved.get((kind, name))
+        if path and (not os.path.isabs(path) or os.path.exists(path)):
+            self.hits += 1
+            return path
+        self.misses += 1
+        return None
+
+    def _run(self):
+        self.prefetch()
+        while True:
+            now = datetime.now()
+            until_next_hour = 3600 - (now.minute * 60 + now.second + now.microsecond / 1e6)
+            if self.stop_event.wait(until_next_hour + 1):
+                return
+            self.prefetch()
+
+    def start(self):
+        if self.thread and self.thread.is_alive():
+            return
+        self.stop_event.clear()
+        self.thread = threading.Thread(target=self._run, daemon=True, name="launch-predictor")
+        self.thread.start()
+
+    def stop(self):
+        self.stop_event.set()
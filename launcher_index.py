@@ -0,0 +1,330 @@
+"""
+Unified launcher index for Friday Assistant
+Collects launchable apps from every source once (registry, Start Menu,
+Program Files, Linux .desktop files) and answers lookups from memory,
+including a TTL'd negative cache for names that don't exist
+"""
+
+import os
+import sys
+import time
+import threading
+
+from crawler import crawl, CrawlRules, scan_directory
+
+try:
+    import winreg
+    REGISTRY_AVAILABLE = True
+except ImportError:
+    REGISTRY_AVAILABLE = False
+
+
+class LauncherSource:
+    """A place launchable apps can be found; yields (display name, path) pairs"""
+    name = "source"
+
+    def entries(self):
+        raise NotImplementedError
+
+
+class StaticSource(LauncherSource):
+    """Fixed list of entries - handy as a fake in tests"""
+    name = "static"
+
+    def __init__(self, entries):
+        self.items = list(entries.items()) if isinstance(entries, dict) else list(entries)
+
+    def entries(self):
+        return iter(self.items)
+
+
+class RegistrySource(LauncherSource):
+    """Executables in the install locations listed under the Uninstall hive"""
+    name = "registry"
+
+    def entries(self):
+        if not REGISTRY_AVAILABLE:
+            return
+        registry_paths = [
+            (winreg.HKEY_LOCAL_MACHINE, r"SOFTWARE\Microsoft\Windows\CurrentVersion\Uninstall"),
+            (winreg.HKEY_CURRENT_USER, r"SOFTWARE\Microsoft\Windows\CurrentVersion\Uninstall"),
+        ]
+        for hkey, path in registry_paths:
+            try:
+                with winreg.OpenKey(hkey, path) as key:
+                    for i in range(winreg.QueryInfoKey(key)[0]):
+                        try:
+                            with winreg.OpenKey(key, winreg.EnumKey(key, i)) as subkey:
+                                install_location = winreg.QueryValueEx(subkey, "InstallLocation")[0]
+                        except (OSError, FileNotFoundError):
+                            continue
+                        if not install_location or not os.path.isdir(install_location):
+                            continue
+                        try:
+                            with os.scandir(install_location) as it:
+                                for entry in it:
+                                    # Keyed by the exe name so helpers like uninstall.exe don't match the app
+                                    if entry.name.lower().endswith('.exe'):
+                                        yield os.path.splitext(entry.name)[0], entry.path
+                        except OSError:
+                            continue
+            except (OSError, FileNotFoundError):
+                continue
+
+
+class StartMenuSource(LauncherSource):
+    """Shortcuts in the per-user and all-users Start Menu"""
+    name = "start_menu"
+
+    def __init__(self, rules=None):
+        self.rules = rules
+        self.roots = [
+            os.path.expanduser("~/AppData/Roaming/Microsoft/Windows/Start Menu/Programs"),
+            r"C:\ProgramData\Microsoft\Windows\Start Menu\Programs",
+        ]
+
+    def entries(self):
+        for item in crawl(self.roots, rules=self.rules):
+            if not item.is_dir and item.name.lower().endswith('.lnk'):
+                yield os.path.splitext(item.name)[0], item.path
+
+
+class CommonPathsSource(LauncherSource):
+    """Executables under Program Files and AppData, shortcuts on the Desktop
+
+    Each directory's matches and subdirectories are remembered along with its
+    mtime, which changes whenever an entry is added, removed or renamed in it.
+    Rebuilds only list the directories whose mtime moved and stat the rest.
+    """
+    name = "common_paths"
+
+    def __init__(self, rules=None, roots=None):
+        self.rules = rules or CrawlRules()
+        self.roots = roots or [
+            (r"C:\Program Files", '.exe'),
+            (r"C:\Program Files (x86)", '.exe'),
+            (os.path.expanduser("~/AppData/Local"), '.exe'),
+            (os.path.expanduser("~/Desktop"), '.lnk'),
+            (os.path.expanduser("~/OneDrive/Desktop"), '.lnk'),
+        ]
+        self.listings = {}  # (directory, ext) -> (mtime_ns, [(name, path)], [subdirectory])
+        self.scanned = 0    # Directories listed by the last pass
+
+    def _listing(self, path, depth, ext, previous):
+        try:
+            mtime = os.stat(path).st_mtime_ns
+        except OSError:
+            return None
+        cached = previous.get((path, ext))
+        if cached is not None and cached[0] == mtime:
+            return cached
+        self.scanned += 1
+        results, subdirs = scan_directory(path, depth, self.rules)
+        matches = [(os.path.splitext(item.name)[0], item.path) for item in results
+                   if not item.is_dir and item.name.lower().endswith(ext)]
+        return mtime, matches, subdirs
+
+    def entries(self):
+        # Read from the last complete pass and swap in a new one, so directories
+        # that are gone drop out and concurrent passes never share a dict
+        previous, listings = self.listings, {}
+        self.scanned = 0
+        for root, ext in self.roots:
+            stack = [(root, 1)] if os.path.isdir(root) else []
+            while stack:
+                path, depth = stack.pop()
+                listing = self._listing(path, depth, ext, previous)
+                if listing is None:
+                    continue
+                listings[(path, ext)] = listing
+                yield from listing[1]
+                stack.extend((subdir, depth + 1) for subdir in reversed(listing[2]))
+        self.listings = listings
+
+
+class DesktopFileSource(LauncherSource):
+    """freedesktop.org .desktop entries on Linux"""
+    name = "desktop_files"
+
+    def __init__(self, dirs=None):
+        self.dirs = dirs or [
+            os.path.expanduser("~/.local/share/applications"),
+            "/usr/local/share/applications",
+            "/usr/share/applications",
+        ]
+
+    @staticmethod
+    def parse(path):
+        """Return the Name of a visible [Desktop Entry], or None"""
+        name = None
+        in_entry = False
+        try:
+            with open(path, encoding="utf-8", errors="replace") as f:
+                for line in f:
+                    line = line.strip()
+                    if line.startswith('['):
+                        in_entry = line == "[Desktop Entry]"
+                    elif in_entry and line.startswith("Name=") and name is None:
+                        name = line[5:]
+                    elif in_entry and line in ("NoDisplay=true", "Hidden=true"):
+                        return None
+        except OSError:
+            return None
+        return name
+
+    def entries(self):
+        for directory in self.dirs:
+            for item in crawl(directory, rules=CrawlRules(skip_hidden=False, excludes=[]), workers=1):
+                if item.is_dir or not item.name.endswith(".desktop"):
+                    continue
+                name = self.parse(item.path)
+                if name:
+                    yield name, item.path
+                    # Also match on the file name, e.g. "firefox" for "Firefox Web Browser"
+                    yield os.path.splitext(item.name)[0], item.path
+
+
+def default_sources(rules=None):
+    """Sources that make sense on this platform"""
+    if sys.platform == "win32":
+        return [RegistrySource(), StartMenuSource(rules), CommonPathsSource(rules)]
+    return [DesktopFileSource()]
+
+
+class LauncherIndex:
+    """In-memory app lookup built from all sources, with a negative cache
+
+    The index is rebuilt in the background once it is older than max_age, or
+    when a remembered miss expires (the app may have been installed since), so
+    lookups never wait on a refresh. Until the first build finishes, lookups
+    wait up to build_wait seconds and then search the sources directly.
+    """
+    def __init__(self, sources=None, negative_ttl=300, max_age=1800, build_wait=10):
+        self.sources = sources if sources is not None else default_sources()
+        self.negative_ttl = negative_ttl
+        self.max_age = max_age
+        self.build_wait = build_wait
+        self.entries = []        # (lowercase name, path, source rank)
+        self.built_at = None
+        self.hits = {}           # query -> path
+        self.misses = {}         # query -> expiry time
+        self.lock = threading.Lock()
+        self.built = threading.Event()
+        self.build_thread = None
+        self.start_lock = threading.Lock()
+        self.stats = {'hits': 0, 'negative_hits': 0, 'lookups': 0, 'builds': 0, 'direct_searches': 0}
+
+    def build(self):
+        """Collect entries from every source"""
+        entries = []
+        for rank, source in enumerate(self.sources):
+            try:
+                for name, path in source.entries():
+                    entries.append((name.lower(), path, rank))
+            except Exception as e:
+                print(f"Launcher source {source.name} failed: {e}")
+        with self.lock:
+            self.entries = entries
+            self.built_at = time.monotonic()
+            self.stats['builds'] += 1
+            self.hits.clear()
+            self.misses.clear()
+        self.built.set()
+        return len(entries)
+
+    def build_async(self):
+        """Build on a background thread; lookups keep using the current entries meanwhile"""
+        with self.start_lock:
+            if self.build_thread and self.build_thread.is_alive():
+                return self.build_thread
+            self.build_thread = threading.Thread(target=self.build, daemon=True, name="launcher-index-build")
+            self.build_thread.start()
+            return self.build_thread
+
+    @staticmethod
+    def _best(query, entries):
+        # Best source first, then exact name, prefix, substring, shorter paths (path breaks ties,
+        # since threaded crawls list entries in a different order each time)
+        best, best_key = None, None
+        for name, path, rank in entries:
+            if query not in name:
+                continue
+            match_type = 0 if name == query else 1 if name.startswith(query) else 2
+            key = (rank, match_type, len(path), path)
+            if best_key is None or key < best_key:
+                best, best_key = path, key
+        return best
+
+    def _search(self, query):
+        return self._best(query, self.entries)
+
+    def _search_sources(self, query):
+        """Linear search straight over the sources, for when no index is available"""
+        for rank, source in enumerate(self.sources):
+            try:
+                path = self._best(query, ((name.lower(), path, rank) for name, path in source.entries()))
+            except Exception as e:
+                print(f"Launcher source {source.name} failed: {e}")
+                continue
+            if path:
+                return path  # Earlier sources outrank anything later ones could find
+        return None
+
+    def find(self, app_name):
+        """Path of the best launcher for app_name, or None"""
+        query = app_name.lower().strip()
+        if not query:
+            return None
+        if not self.built.is_set():
+            # Restarts a build whose thread died
+            self.build_async()
+            if not self.built.wait(self.build_wait):
+                with self.lock:
+                    self.stats['direct_searches'] += 1
+                return self._search_sources(query)
+
+        refresh = self.max_age is not None and time.monotonic() - self.built_at > self.max_age
+        with self.lock:
+            self.stats['lookups'] += 1
+            path = self.hits.get(query)
+            if path is not None and not os.path.exists(path):
+                del self.hits[query]
+                path = None
+            expiry = self.misses.get(query)
+            if path is not None:
+                self.stats['hits'] += 1
+            elif expiry is not None and time.monotonic() < expiry:
+                self.stats['negative_hits'] += 1
+                path = None
+            else:
+                # A miss that has expired may have been installed since - refresh behind this answer
+                refresh = refresh or expiry is not None
+                path = self._search(query)
+                if path:
+                    self.misses.pop(query, None)
+                    self.hits[query] = path
+                else:
+                    self.misses[query] = time.monotonic() + self.negative_ttl
+        if refresh:
+            self.build_async()
+        return path
+
+    def invalidate(self):
+        """Forget cached answers and rebuild from the sources"""
+        with self.lock:
+            self.hits.clear()
+            self.misses.clear()
+        return self.build_async()
+
+
+if __name__ == "__main__":
+    index = LauncherIndex()
+    start = time.perf_counter()
+    count = index.build()
+    print(f"Indexed {count} launchers in {(time.perf_counter() - start) * 1000:.0f} ms")
+    while True:
+        q = input("\nApp name (blank to quit): ").strip()
+        if not q:
+            break
+        start = time.perf_counter()
+        print(f"{index.find(q)} ({(time.perf_counter() - start) * 1000:.2f} ms)")
@@ -0,0 +1,261 @@
+"""
+Dedicated pyttsx3 worker for Friday Assistant
+One long-lived thread creates and owns the engine and pumps its event loop;
+other threads hand it utterances through a queue and can interrupt it
+"""
+
+import time
+import queue
+import itertools
+import threading
+
+
+def speech_timeout(text, rate_wpm=170, margin=2.0, base=5.0):
+    """Generous upper bound on how long speaking text should take, in seconds"""
+    chars_per_second = rate_wpm * 6 / 60  # ~6 characters per word, spaces included
+    return base + margin * len(text) / chars_per_second
+
+
+class LocalUtterance:
+    def __init__(self, text, name):
+        self.text = text
+        self.name = name
+        self.queued_at = time.perf_counter()
+        self.started_at = None
+        self.interrupted = False
+        self.done = threading.Event()
+
+    def wait(self, timeout=None):
+        return self.done.wait(timeout)
+
+
+class LocalTTSWorker:
+    """Runs a pyttsx3 engine on its own thread with an external event loop
+
+    engine_factory() is called on the worker thread, since SAPI/COM objects
+    belong to the thread that created them.
+    """
+    def __init__(self, engine_factory, idle_wait=0.05, busy_wait=0.005):
+        self.engine_factory = engine_factory
+        self.idle_wait = idle_wait
+        self.busy_wait = busy_wait
+        self.requests = queue.Queue()
+        self.names = itertools.count()
+        self.current = None
+        self.interrupt_event = threading.Event()
+        self.stop_event = threading.Event()
+        self.ready = threading.Event()
+        self.thread = None
+        self.error = None
+        self.restarts = 0
+
+    def start(self):
+        if self.thread and self.thread.is_alive():
+            return
+        self.stop_event.clear()
+        # The thread keeps its own events, so a restart() can't be confused by an abandoned one
+        self.thread = threading.Thread(target=self._run, args=(self.stop_event, self.interrupt_event),
+                                       daemon=True, name="local-tts")
+        self.thread.start()
+
+    def speak(self, text):
+        """Queue text; returns a LocalUtterance whose done event is set when it finishes"""
+        self.start()
+        utterance = LocalUtterance(text, f"utterance-{next(self.names)}")
+        self.requests.put(utterance)
+        if self.error:
+            self._drain()  # No engine - don't leave callers waiting
+        return utterance
+
+    def speak_and_wait(self, text, timeout=None):
+        return self.speak(text).wait(timeout)
+
+    def _drain(self):
+        while True:
+            try:
+                utterance = self.requests.get_nowait()
+            except queue.Empty:
+                return
+            utterance.interrupted = True
+            utterance.done.set()
+
+    def interrupt(self):
+        """Stop the current utterance and drop everything queued"""
+        self._drain()
+        self.interrupt_event.set()
+
+    def restart(self):
+        """Abandon a hung engine and start a fresh one on a new thread
+
+        A driver stuck inside iterate() can't be interrupted; its thread is left
+        to exit on its own if it ever returns.
+        """
+        self._drain()
+        self.stop_event.set()
+        current, self.current = self.current, None
+        if current is not None:
+            current.interrupted = True
+            current.done.set()
+        self.stop_event = threading.Event()
+        self.interrupt_event = threading.Event()
+        self.ready = threading.Event()
+        self.error = None
+        self.thread = None
+        self.restarts += 1
+        self.start()
+
+    def shutdown(self, timeout=2):
+        self.interrupt()
+        self.stop_event.set()
+        if self.thread:
+            self.thread.join(timeout)
+
+    def _on_started(self, name):
+        current = self.current
+        if current is not None and current.name == name:
+            current.started_at = time.perf_counter()
+
+    def _on_finished(self, name, completed):
+        current = self.current
+        if current is not None and current.name == name:
+            current.interrupted = not completed
+            self.current = None
+            current.done.set()
+
+    def _run(self, stop_event, interrupt_event):
+        try:
+            engine = self.engine_factory()
+            engine.connect('started-utterance', self._on_started)
+            engine.connect('finished-utterance', self._on_finished)
+            engine.startLoop(False)
+        except Exception as e:
+            self.error = e
+            print(f"Local TTS failed to start: {e}")
+            self.ready.set()
+            self._drain()
+            return
+        self.ready.set()
+        try:
+            while not stop_event.is_set():
+                if interrupt_event.is_set():
+                    interrupt_event.clear()
+                    current = self.current
+                    if current is not None:
+                        engine.stop()
+                        # Drivers don't all report a stopped utterance as finished
+                        self._on_finished(current.name, False)
+                if self.current is None:
+                    try:
+                        utterance = self.requests.get(timeout=self.idle_wait)
+                    except queue.Empty:
+                        engine.iterate()
+                        continue
+                    self.current = utterance
+                    engine.say(utterance.text, utterance.name)
+                engine.iterate()
+                time.sleep(self.busy_wait)
+        finally:
+            try:
+                engine.endLoop()
+            except Exception:
+                pass
+
+
+class FakeEngine:
+    """Stand-in for a pyttsx3 engine (say/iterate/stop/connect) with simulated
+    synthesis time - for measuring the worker without a speech driver"""
+    def __init__(self, start_delay=0.02, seconds_per_char=0.002):
+        self.start_delay = start_delay
+        self.seconds_per_char = seconds_per_char
+        self.callbacks = {}
+        self.pending = []
+        self.current = None  # (name, ends_at)
+        self.properties = {}
+
+    def connect(self, topic, callback):
+        self.callbacks.setdefault(topic, []).append(callback)
+
+    def _fire(self, topic, **kwargs):
+        for callback in self.callbacks.get(topic, []):
+            callback(**kwargs)
+
+    def setProperty(self, name, value):
+        self.properties[name] = value
+
+    def getProperty(self, name):
+        return self.properties.get(name)
+
+    def say(self, text, name=None):
+        self.pending.append((name, text, time.perf_counter()))
+
+    def stop(self):
+        if self.current:
+            name = self.current[0]
+            self.current = None
+            self._fire('finished-utterance', name=name, completed=False)
+        self.pending.clear()
+
+    def iterate(self):
+        now = time.perf_counter()
+        if self.current is None and self.pending:
+            name, text, queued = self.pending[0]
+            if now - queued >= self.start_delay:
+                self.pending.pop(0)
+                self.current = (name, now + len(text) * self.seconds_per_char)
+                self._fire('started-utterance', name=name)
+        if self.current and now >= self.current[1]:
+            name = self.current[0]
+            self.current = None
+            self._fire('finished-utterance', name=name, completed=True)
+
+    def runAndWait(self):
+        while self.pending or self.current:
+            self.iterate()
+            time.sleep(0.001)
+
+    def startLoop(self, use_driver_loop=True):
+        pass
+
+    def endLoop(self):
+        pass
+
+
+if __name__ == "__main__":
+    # Time from speak() to the start of audio: old inline path versus the worker
+    texts = ["Yes", "Opening chrome", "Volume set to 50 percent", "Goodbye!"] * 5
+
+    engine = FakeEngine()
+    started = {}
+    engine.connect('started-utterance', lambda name: started.setdefault(name, time.perf_counter()))
+    inline = []
+    for i, text in enumerate(texts):
+        # Old speak(): fixed 0.2 s pause, then a blocking runAndWait on the caller's thread
+        start = time.perf_counter()
+        time.sleep(0.2)
+        engine.say(text, f"inline-{i}")
+        engine.runAndWait()
+        inline.append(started[f"inline-{i}"] - start)
+
+    worker = LocalTTSWorker(FakeEngine)
+    worker.start()
+    worker.ready.wait()
+    queued = []
+    for text in texts:
+        utterance = worker.speak(text)
+        utterance.wait()
+        queued.append(utterance.started_at - utterance.queued_at)
+    worker.shutdown()
+
+    # Interruption: a long utterance cut off right after it starts
+    worker = LocalTTSWorker(lambda: FakeEngine(seconds_per_char=0.05))
+    long_utterance = worker.speak("This is a long reply that the user talks over. " * 3)
+    time.sleep(0.1)
+    start = time.perf_counter()
+    worker.interrupt()
+    long_utterance.wait()
+    stop_ms = (time.perf_counter() - start) * 1000
+    worker.shutdown()
+
+    print(f"inline speak():  {sum(inline) / len(inline) * 1000:6.1f} ms to first audio")
+    print(f"LocalTTSWorker:  {sum(queued) / len(queued) * 1000:6.1f} ms to first audio "
+          f"(interrupt took {stop_ms:.1f} ms, interrupted={long_utterance.interrupted})")
@@ -1,17 +1,117 @@
+import atexit
 import logging
+import logging.handlers
+import queue
 from pathlib import Path
 
-def setup_logging():
-    log_dir = Path(__file__).parent / "logs"
+from config import LOG_LEVEL, LOG_MAX_BYTES, LOG_BACKUP_COUNT
+
+FORMAT = '%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+
+_listener = None
+
+def setup_logging(level=None, log_dir=None, console=True):
+    """Route logging through a queue so callers never wait on console or file I/O
+
+    A QueueListener thread does the writing; the log file rotates by size.
+    console may be False, True (stderr) or a stream to write to.
+    """
+    global _listener
+    if _listener is not None:
+        return logging.getLogger("assistant")
+
+    log_dir = Path(log_dir) if log_dir else Path(__file__).parent / "logs"
     log_dir.mkdir(exist_ok=True)
-    
+
+    formatter = logging.Formatter(FORMAT)
+    handlers = [logging.handlers.RotatingFileHandler(
+        log_dir / "assistant.log", maxBytes=LOG_MAX_BYTES, backupCount=LOG_BACKUP_COUNT, encoding="utf-8")]
+    if console:
+        handlers.append(logging.StreamHandler(None if console is True else console))
+    for handler in handlers:
+        handler.setFormatter(formatter)
+
+    log_queue = queue.SimpleQueue()
+    _listener = logging.handlers.QueueListener(log_queue, *handlers, respect_handler_level=True)
+    _listener.start()
+    atexit.register(stop_logging)
+
+    # The QueueHandler only merges args into the message; the listener's handlers add
+    # the timestamp and level (basicConfig would otherwise give it its own default format)
+    queue_handler = logging.handlers.QueueHandler(log_queue)
+    queue_handler.setFormatter(logging.Formatter('%(message)s'))
     logging.basicConfig(
-        level=logging.INFO,
-        format='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
-        handlers=[
-            logging.FileHandler(log_dir / "assistant.log"),
-            logging.StreamHandler()
-        ]
+        level=getattr(logging, (level or LOG_LEVEL).upper(), logging.INFO),
+        handlers=[queue_handler],
+        force=True
     )
-    
+
     return logging.getLogger("assistant")
+
+def stop_logging():
+    """Flush queued records and stop the writer thread"""
+    global _listener
+    if _listener is not None:
+        _listener.stop()
+        _listener = None
+
+if __name__ == "__main__":
+    # Cost of the wake-word check's tracing per audio window: old prints/sync handlers vs queued, level-gated
+    import os
+    import time
+    import tempfile
+    import contextlib
+
+    class SlowConsole:
+        """A console that takes 200 us per write, like a busy Windows terminal"""
+        def write(self, data):
+            time.sleep(0.0002)
+            return len(data)
+
+        def flush(self):
+            pass
+
+    windows = 2000
+    text = "hey maya open chrome"
+    log_dir = tempfile.mkdtemp()
+    console = SlowConsole()
+
+    def old_check():
+        # Old contains_wake_word: unconditional prints on every window
+        print(f"🔍 Checking for wake word in: '{text}'")
+        print(f"✅ Direct match found: 'maya'")
+        old_logger.info(f"Command parsed as: open_app")
+
+    def new_check():
+        trace.debug("Checking for wake word in: '%s'", text)
+        trace.debug("Direct match found: '%s'", "maya")
+        trace.info("Command parsed as: %s", "open_app")
+
+    # Old setup: synchronous file + console handlers on the calling thread
+    old_logger = logging.getLogger("bench.old")
+    old_logger.propagate = False
+    old_logger.setLevel(logging.INFO)
+    for handler in (logging.FileHandler(os.path.join(log_dir, "old.log")), logging.StreamHandler(console)):
+        handler.setFormatter(logging.Formatter(FORMAT))
+        old_logger.addHandler(handler)
+    with contextlib.redirect_stdout(console):
+        start = time.perf_counter()
+        for _ in range(windows):
+            old_check()
+        old_us = (time.perf_counter() - start) * 1e6 / windows
+
+    results = []
+    for level in ("INFO", "DEBUG"):
+        stop_logging()
+        # Same slow console, but written from the listener thread
+        setup_logging(level, log_dir, console=console)
+        trace = logging.getLogger("assistant")
+        start = time.perf_counter()
+        for _ in range(windows):
+            new_check()
+        results.append((level, (time.perf_counter() - start) * 1e6 / windows))
+    stop_logging()
+
+    print(f"old prints + sync handlers: {old_us:7.2f} us per window")
+    for level, us in results:
+        print(f"queued logging at {level:5s}:   {us:7.2f} us per window")
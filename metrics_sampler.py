@@ -0,0 +1,123 @@
+"""
+Background system metrics sampler for Friday Assistant
+Keeps a small rolling window of CPU, memory, disk and battery readings so
+"system status" answers instantly instead of blocking on cpu_percent(interval=1)
+"""
+
+import sys
+import time
+import threading
+from collections import deque
+
+try:
+    import psutil
+    PSUTIL_AVAILABLE = True
+except ImportError:
+    PSUTIL_AVAILABLE = False
+
+
+def read_psutil_metrics(disk_path):
+    """One reading in the same shape SystemController.get_system_info returns"""
+    # interval=None compares against the previous call - never blocks
+    cpu_percent = psutil.cpu_percent(interval=None)
+    memory = psutil.virtual_memory()
+    disk = psutil.disk_usage(disk_path)
+
+    info = {
+        'cpu': cpu_percent,
+        'memory_percent': memory.percent,
+        'memory_available': round(memory.available / (1024**3), 1),
+        'disk_percent': round((disk.used / disk.total) * 100, 1),
+        'disk_free': round(disk.free / (1024**3), 1)
+    }
+
+    try:
+        battery = psutil.sensors_battery()
+        if battery:
+            info['battery'] = round(battery.percent)
+            info['battery_plugged'] = battery.power_plugged
+    except:
+        pass  # Battery info not critical
+
+    return info
+
+
+class MetricsSampler:
+    """Samples system metrics on a background thread into a ring buffer"""
+    def __init__(self, interval=5.0, window=12, disk_path=None, reader=None):
+        self.interval = interval
+        self.disk_path = disk_path or ("C:\\" if sys.platform == "win32" else "/")
+        self.uses_psutil = reader is None
+        self.reader = reader or (lambda: read_psutil_metrics(self.disk_path))
+        self.samples = deque(maxlen=window)  # (timestamp, reading)
+        self.lock = threading.Lock()
+        self.stop_event = threading.Event()
+        self.ready = threading.Event()
+        self.thread = None
+
+    def sample(self):
+        """Take one reading now"""
+        try:
+            reading = self.reader()
+        except Exception as e:
+            print(f"Metrics sample failed: {e}")
+            return None
+        with self.lock:
+            self.samples.append((time.time(), reading))
+        self.ready.set()
+        return reading
+
+    def _run(self):
+        if self.uses_psutil and PSUTIL_AVAILABLE:
+            try:
+                psutil.cpu_percent(interval=None)  # Prime the CPU counter
+            except Exception:
+                pass
+        # First real reading after a short delay so the CPU figure is meaningful
+        if self.stop_event.wait(min(self.interval, 0.5)):
+            return
+        while not self.stop_event.is_set():
+            self.sample()
+            self.stop_event.wait(self.interval)
+
+    def start(self):
+        if self.thread and self.thread.is_alive():
+            return
+        self.stop_event.clear()
+        self.thread = threading.Thread(target=self._run, daemon=True, name="metrics-sampler")
+        self.thread.start()
+
+    def stop(self):
+        self.stop_event.set()
+        if self.thread:
+            self.thread.join(timeout=2)
+
+    def latest(self, wait=1.0):
+        """Most recent reading; waits briefly for the very first one"""
+        if not self.ready.is_set():
+            self.ready.wait(wait)
+        with self.lock:
+            return dict(self.samples[-1][1]) if self.samples else None
+
+    def average(self, key, seconds=None):
+        """Mean of a metric over the window (or the last `seconds`)"""
+        values = self._values(key, seconds)
+        return round(sum(values) / len(values), 1) if values else None
+
+    def trend(self, key, seconds=None, threshold=5.0):
+        """'rising', 'falling' or 'steady' - first half of the window versus the second"""
+        values = self._values(key, seconds)
+        if len(values) < 4:
+            return 'steady'
+        half = len(values) // 2
+        change = sum(values[half:]) / (len(values) - half) - sum(values[:half]) / half
+        if change > threshold:
+            return 'rising'
+        if change < -threshold:
+            return 'falling'
+        return 'steady'
+
+    def _values(self, key, seconds):
+        cutoff = time.time() - seconds if seconds else 0
+        with self.lock:
+            return [reading[key] for ts, reading in self.samples if ts >= cutoff and key in reading]
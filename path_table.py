@@ -0,0 +1,289 @@
+"""
+Compact path storage for Friday Assistant's in-memory indexes
+Directory prefixes are interned into a parent-pointer array and names live in
+one contiguous buffer, so millions of paths fit in tens of megabytes and the
+whole table can be memory-mapped from a single file
+"""
+
+import os
+import sys
+import mmap
+import struct
+from array import array
+
+MAGIC = b"PTBL"
+VERSION = 1
+HEADER = struct.Struct("<4sBBxxQQ")  # magic, version, byteorder, count, names length
+
+FLAG_DIR = 1
+FLAG_REMOVED = 2
+
+
+def _encode(name):
+    return name.encode("utf-8", "surrogatepass")
+
+
+def _decode(data):
+    return bytes(data).decode("utf-8", "surrogatepass")
+
+
+def _pad(n):
+    return (-n) % 8
+
+
+class PathTable:
+    """Interned path store; each node is (parent index, name, flags)"""
+    def __init__(self):
+        self.parents = array("i")        # parent node index, -1 for a filesystem root
+        self.name_offsets = array("I", [0])  # node i's name is names[offsets[i]:offsets[i + 1]]
+        self.flags = bytearray()
+        self.names = bytearray()
+        self._mmap = None
+        self._dir_lookup = None          # (parent, name) -> index, built lazily
+        self._first_child = None         # Child lists as linked arrays, built lazily:
+        self._next_sibling = None        # first_child[parent] -> next_sibling[child] -> ... -> -1
+        self._last_dir = (None, -1)      # consecutive adds usually share a directory
+
+    def __len__(self):
+        return len(self.parents)
+
+    # === Building ===
+
+    def _ensure_writable(self):
+        """Copy mmap-backed arrays into growable ones before the first change"""
+        if self._mmap is None:
+            return
+        parents = array("i")
+        parents.frombytes(self.parents.tobytes())
+        offsets = array("I")
+        offsets.frombytes(self.name_offsets.tobytes())
+        self.parents, self.name_offsets = parents, offsets
+        self.flags = bytearray(self.flags)
+        self.names = bytearray(self.names)
+        self._mmap.close()
+        self._mmap = None
+
+    def _lookup(self):
+        if self._dir_lookup is None:
+            self._dir_lookup = {}
+            for i in range(len(self)):
+                if self.flags[i] & FLAG_DIR and not self.flags[i] & FLAG_REMOVED:
+                    self._dir_lookup[(self.parents[i], self.name(i))] = i
+        return self._dir_lookup
+
+    def _link(self, idx):
+        self._first_child.append(-1)
+        parent = self.parents[idx]
+        if parent >= 0:
+            self._next_sibling.append(self._first_child[parent])
+            self._first_child[parent] = idx
+        else:
+            self._next_sibling.append(-1)
+
+    def _children(self):
+        """(first_child, next_sibling) arrays, so subtrees can be walked without a full scan"""
+        if self._first_child is None:
+            self._first_child, self._next_sibling = array("i"), array("i")
+            for i in range(len(self)):
+                self._link(i)
+        return self._first_child, self._next_sibling
+
+    def _append(self, parent, name, flags):
+        self._ensure_writable()
+        self.names += _encode(name)
+        if len(self.names) > 0xFFFFFFFF:
+            raise OverflowError("PathTable names buffer exceeds 4 GB")
+        self.parents.append(parent)
+        self.name_offsets.append(len(self.names))
+        self.flags.append(flags)
+        idx = len(self.parents) - 1
+        if self._first_child is not None:
+            self._link(idx)
+        return idx
+
+    def _intern_dir(self, path):
+        if path == self._last_dir[0]:
+            return self._last_dir[1]
+        head, tail = os.path.split(path)
+        if not tail:
+            # Filesystem root such as "/" or "C:\\"
+            parent, name = -1, head
+        else:
+            parent, name = self._intern_dir(head), tail
+        lookup = self._lookup()
+        idx = lookup.get((parent, name))
+        if idx is None:
+            idx = self._append(parent, name, FLAG_DIR)
+            lookup[(parent, name)] = idx
+        self._last_dir = (path, idx)
+        return idx
+
+    def add(self, path, is_dir=False):
+        """Add a path and return its index; directories are only stored once"""
+        path = os.path.normpath(path)
+        if is_dir:
+            return self._intern_dir(path)
+        head, tail = os.path.split(path)
+        return self._append(self._intern_dir(head), tail, 0)
+
+    def remove_tree(self, idx):
+        """Mark a node and everything below it as removed"""
+        self._ensure_writable()
+        lookup = self._lookup()
+        first_child, next_sibling = self._children()
+        self._last_dir = (None, -1)
+        stack = [idx]
+        while stack:
+            i = stack.pop()
+            # Nothing live hangs below a removed node - re-adding a path interns a new one
+            if self.flags[i] & FLAG_REMOVED:
+                continue
+            self.flags[i] |= FLAG_REMOVED
+            if self.flags[i] & FLAG_DIR:
+                lookup.pop((self.parents[i], self.name(i)), None)
+            child = first_child[i]
+            while child >= 0:
+                stack.append(child)
+                child = next_sibling[child]
+
+    # === Reading ===
+
+    def name(self, idx):
+        return _decode(self.names[self.name_offsets[idx]:self.name_offsets[idx + 1]])
+
+    def path(self, idx):
+        """Rebuild the full path of a node"""
+        parts = []
+        while idx >= 0:
+            parts.append(self.name(idx))
+            idx = self.parents[idx]
+        return os.path.join(*reversed(parts))
+
+    def is_dir(self, idx):
+        return bool(self.flags[idx] & FLAG_DIR)
+
+    def is_removed(self, idx):
+        return bool(self.flags[idx] & FLAG_REMOVED)
+
+    def is_within(self, idx, ancestor):
+        """Check if node idx is ancestor itself or lies below it"""
+        while idx >= 0:
+            if idx == ancestor:
+                return True
+            idx = self.parents[idx]
+        return False
+
+    def find_dir(self, path):
+        """Index of a stored directory, or None"""
+        head, tail = os.path.split(os.path.normpath(path))
+        if not tail:
+            return self._lookup().get((-1, head))
+        parent = self.find_dir(head)
+        if parent is None:
+            return None
+        return self._lookup().get((parent, tail))
+
+    def __iter__(self):
+        """Indices of all live nodes"""
+        for i in range(len(self)):
+            if not self.flags[i] & FLAG_REMOVED:
+                yield i
+
+    def nbytes(self):
+        """Approximate memory held by the table arrays"""
+        size = (len(self.parents) * self.parents.itemsize
+                + len(self.name_offsets) * self.name_offsets.itemsize
+                + len(self.flags) + len(self.names))
+        if self._first_child is not None:
+            size += 2 * len(self._first_child) * self._first_child.itemsize
+        return size
+
+    # === Persistence ===
+
+    def save(self, filename):
+        """Write the table to one file (atomically via temp file and rename)"""
+        count = len(self)
+        tmp_name = filename + ".tmp"
+        with open(tmp_name, "wb") as f:
+            f.write(HEADER.pack(MAGIC, VERSION, 0 if sys.byteorder == "little" else 1, count, len(self.names)))
+            for section in (self.parents.tobytes(), self.name_offsets.tobytes(),
+                            bytes(self.flags), bytes(self.names)):
+                f.write(section)
+                f.write(b"\0" * _pad(len(section)))
+        os.replace(tmp_name, filename)
+
+    @classmethod
+    def load(cls, filename):
+        """Memory-map a saved table - no parsing, pages load on first access"""
+        table = cls()
+        with open(filename, "rb") as f:
+            mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, version, byteorder, count, names_len = HEADER.unpack_from(mm, 0)
+        if magic != MAGIC or version != VERSION:
+            mm.close()
+            raise ValueError(f"{filename} is not a path table")
+
+        view = memoryview(mm)
+        offset = HEADER.size
+        sections = []
+        for size in (4 * count, 4 * (count + 1), count, names_len):
+            sections.append(view[offset:offset + size])
+            offset += size + _pad(size)
+        parents, offsets, flags, names = sections
+
+        if byteorder != (0 if sys.byteorder == "little" else 1):
+            # Written on a machine with the other byte order - copy and swap
+            table.parents = array("i", parents.tobytes())
+            table.parents.byteswap()
+            table.name_offsets = array("I", offsets.tobytes())
+            table.name_offsets.byteswap()
+            table.flags = bytearray(flags)
+            table.names = bytearray(names)
+            view.release()
+            mm.close()
+            return table
+
+        table.parents = parents.cast("i")
+        table.name_offsets = offsets.cast("I")
+        table.flags = flags
+        table.names = names
+        table._mmap = mm
+        return table
+
+    def close(self):
+        if self._mmap is not None:
+            self.parents = self.name_offsets = self.flags = self.names = None
+            self._mmap.close()
+            self._mmap = None
+
+
+if __name__ == "__main__":
+    # Memory and load-time comparison against a dict of full path strings
+    import time
+    import tempfile
+
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000
+    base = os.path.join(os.path.expanduser("~"), "Documents", "Projects")
+    paths = [os.path.join(base, f"project_{i // 5000}", f"module_{i // 100 % 50}", f"file_{i}.txt")
+             for i in range(count)]
+
+    start = time.perf_counter()
+    table = PathTable()
+    for p in paths:
+        table.add(p)
+    build_time = time.perf_counter() - start
+
+    dict_bytes = sum(sys.getsizeof(p) for p in paths) + sys.getsizeof(dict.fromkeys(paths))
+    print(f"{count} paths")
+    print(f"  dict of strings: {dict_bytes / 1e6:8.1f} MB")
+    print(f"  PathTable:       {table.nbytes() / 1e6:8.1f} MB (built in {build_time:.1f}s)")
+
+    filename = os.path.join(tempfile.gettempdir(), "path_table_bench.bin")
+    table.save(filename)
+    start = time.perf_counter()
+    loaded = PathTable.load(filename)
+    load_time = time.perf_counter() - start
+    assert loaded.path(len(loaded) - 1) == paths[-1]
+    print(f"  mmap load:       {load_time * 1000:8.2f} ms ({os.path.getsize(filename) / 1e6:.1f} MB file)")
+    loaded.close()
+    os.remove(filename)
@@ -0,0 +1,149 @@
+"""
+Performance profiles for Friday Assistant
+Resolves the active profile from config.py plus an optional per-machine JSON
+overrides file, and re-reads that file when it changes so a running assistant
+can be switched between profiles without a restart
+"""
+
+import os
+import json
+import threading
+
+
+def _same_type(value, default):
+    """Whether an override can stand in for a profile value (ints pass for floats)"""
+    if isinstance(default, bool) or isinstance(value, bool):
+        return isinstance(value, bool) and isinstance(default, bool)
+    if isinstance(default, float):
+        return isinstance(value, (int, float))
+    return isinstance(value, type(default))
+
+
+class PerformanceSettings:
+    """Current tuning values, read as attributes (settings.CHUNK_DURATION)
+
+    The overrides file may name a profile and/or replace single keys:
+        {"profile": "low-power", "COMMAND_TIMEOUT": 20}
+    Unknown profiles and keys, and values of the wrong type, are ignored with
+    a warning. A file that fails to parse (e.g. half-saved) leaves the current
+    values in place, or the default profile's at startup.
+    Listeners are called with the set of keys that changed.
+    """
+    def __init__(self, profiles, profile="balanced", overrides_path=None, poll_interval=2.0):
+        self.profiles = profiles
+        self.default_profile = profile
+        self.overrides_path = overrides_path
+        self.poll_interval = poll_interval
+        self.lock = threading.Lock()
+        self.listeners = []
+        self.values = {}
+        self.profile = None
+        self.mtime = None
+        self.stop_event = threading.Event()
+        self.thread = None
+        self.reload()
+
+    def __getattr__(self, name):
+        values = self.__dict__.get("values", {})
+        if name in values:
+            return values[name]
+        raise AttributeError(name)
+
+    def add_listener(self, callback):
+        self.listeners.append(callback)
+
+    def _mtime(self):
+        try:
+            return os.stat(self.overrides_path).st_mtime_ns if self.overrides_path else None
+        except OSError:
+            return None
+
+    def _read_overrides(self):
+        """Overrides dict, {} when there is no file, or None when it can't be used"""
+        if not self.overrides_path or not os.path.exists(self.overrides_path):
+            return {}
+        try:
+            with open(self.overrides_path, encoding="utf-8") as f:
+                overrides = json.load(f)
+        except (OSError, ValueError) as e:
+            print(f"⚠️  Could not read {self.overrides_path}: {e}")
+            return None
+        if not isinstance(overrides, dict):
+            print(f"⚠️  {self.overrides_path} should contain a JSON object")
+            return None
+        return overrides
+
+    def reload(self):
+        """Re-read the overrides file and apply it; returns the set of changed keys"""
+        with self.lock:
+            self.mtime = self._mtime()
+            overrides = self._read_overrides()
+            if overrides is None:
+                if self.values:
+                    return set()
+                overrides = {}  # Unusable file at startup - run on the default profile
+            overrides = dict(overrides)
+            profile = overrides.pop("profile", self.default_profile)
+            if profile not in self.profiles:
+                print(f"⚠️  Unknown performance profile '{profile}' - using '{self.default_profile}'")
+                profile = self.default_profile
+            values = dict(self.profiles[profile])
+            applied = []
+            for key, value in overrides.items():
+                if key not in values:
+                    print(f"⚠️  Ignoring unknown performance setting '{key}'")
+                elif not _same_type(value, values[key]):
+                    print(f"⚠️  Ignoring {key}={value!r} - expected {type(values[key]).__name__}")
+                    if profile == self.profile and key in self.values:
+                        values[key] = self.values[key]  # Keep what is running now
+                else:
+                    values[key] = value
+                    applied.append(key)
+
+            first_load = not self.values
+            changed = {key for key, value in values.items() if self.values.get(key) != value}
+            if profile == self.profile and not changed:
+                return set()
+            # Swap the whole dict so readers on other threads never see a half-applied profile
+            self.values = values
+            self.profile = profile
+        print(f"Performance profile: {profile}" + (f" (overrides: {', '.join(applied)})" if applied else ""))
+        if not first_load:
+            for callback in self.listeners:
+                try:
+                    callback(changed)
+                except Exception as e:
+                    print(f"Error applying performance settings: {e}")
+        return changed
+
+    def check(self):
+        """Reload if the overrides file was created, edited or removed since the last read"""
+        if self._mtime() != self.mtime:
+            return self.reload()
+        return set()
+
+    def start(self):
+        """Poll the overrides file in the background"""
+        if not self.overrides_path or (self.thread and self.thread.is_alive()):
+            return
+        self.stop_event.clear()
+        self.thread = threading.Thread(target=self._run, daemon=True, name="performance-settings")
+        self.thread.start()
+
+    def _run(self):
+        while not self.stop_event.wait(self.poll_interval):
+            self.check()
+
+    def stop(self):
+        self.stop_event.set()
+        if self.thread:
+            self.thread.join(timeout=2)
+
+
+if __name__ == "__main__":
+    # Show what this machine resolves to: python performance.py
+    from config import PERFORMANCE_PROFILES, PERFORMANCE_PROFILE, PERFORMANCE_OVERRIDES_FILE
+
+    settings = PerformanceSettings(PERFORMANCE_PROFILES, PERFORMANCE_PROFILE, PERFORMANCE_OVERRIDES_FILE)
+    for key, value in sorted(settings.values.items()):
+        print(f"  {key:24s} {value}")
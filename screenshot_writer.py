@@ -0,0 +1,97 @@
+"""
+Asynchronous screenshot encoding for Friday Assistant
+The screen is grabbed on the command path, but compression and the disk write
+happen on a background worker so the response doesn't wait for them
+"""
+
+import os
+import queue
+import threading
+
+try:
+    from PIL import ImageGrab
+    SCREENSHOT_AVAILABLE = True
+except ImportError:
+    SCREENSHOT_AVAILABLE = False
+
+# Save options per format; "bmp" is the uncompressed fast path
+FORMATS = {
+    "png": ("PNG", ".png"),
+    "jpeg": ("JPEG", ".jpg"),
+    "bmp": ("BMP", ".bmp"),
+}
+
+
+class ScreenshotWriter:
+    """Grabs the screen immediately and encodes/writes it on a worker thread"""
+    def __init__(self, image_format="png", compress_level=1, max_queued=3, grab=None):
+        if image_format not in FORMATS:
+            raise ValueError(f"Unsupported screenshot format: {image_format}")
+        self.image_format = image_format
+        self.compress_level = compress_level
+        self.grab = grab or (ImageGrab.grab if SCREENSHOT_AVAILABLE else None)
+        # Each queued capture holds a full-resolution bitmap, so keep the queue short
+        self.pending = queue.Queue(maxsize=max_queued)
+        self.thread = None
+        self.errors = 0
+
+    @property
+    def extension(self):
+        return FORMATS[self.image_format][1]
+
+    def _save_options(self):
+        if self.image_format == "png":
+            return {"compress_level": self.compress_level}
+        if self.image_format == "jpeg":
+            return {"quality": 90}
+        return {}
+
+    def _worker(self):
+        while True:
+            item = self.pending.get()
+            if item is None:
+                self.pending.task_done()
+                return
+            image, filename = item
+            tmp_name = filename + ".part"
+            try:
+                image.save(tmp_name, FORMATS[self.image_format][0], **self._save_options())
+                # Rename so nobody ever opens a half-written file
+                os.replace(tmp_name, filename)
+            except Exception as e:
+                self.errors += 1
+                print(f"Screenshot save error: {e}")
+                try:
+                    os.remove(tmp_name)
+                except OSError:
+                    pass
+            finally:
+                self.pending.task_done()
+
+    def start(self):
+        if self.thread and self.thread.is_alive():
+            return
+        self.thread = threading.Thread(target=self._worker, daemon=True, name="screenshot-writer")
+        self.thread.start()
+
+    def capture(self, filename):
+        """Grab the screen and queue it for saving; returns the target filename,
+        or None if capture failed or too many screenshots are still being written"""
+        if self.grab is None:
+            return None
+        self.start()
+        image = self.grab()
+        try:
+            self.pending.put_nowait((image, filename))
+        except queue.Full:
+            return None
+        return filename
+
+    def flush(self):
+        """Block until every queued screenshot has been written"""
+        self.pending.join()
+
+    def stop(self):
+        if self.thread and self.thread.is_alive():
+            self.pending.put(None)
+            self.thread.join(timeout=5)
@@ -0,0 +1,178 @@
+"""
+On-demand profiling for live Friday Assistant sessions
+Captures cProfile data for the capture, ASR, intent and action stages over the
+next N utterances or seconds, then writes a timestamped .prof file plus a short
+summary of stage timings and the top functions
+"""
+
+import io
+import os
+import time
+import pstats
+import cProfile
+import threading
+from datetime import datetime
+from contextlib import contextmanager
+
+STAGES = ("capture", "asr", "intent", "action")
+
+
+def parse_request(value):
+    """'5' -> (5 utterances, None); '30s' -> (None, 30.0); anything else -> None"""
+    value = (value or "").strip().lower()
+    try:
+        if value.endswith("s"):
+            return None, float(value[:-1])
+        if value:
+            return int(value), None
+    except ValueError:
+        pass
+    return None
+
+
+class SessionProfiler:
+    """Profiles stage() blocks on whichever thread runs them
+
+    cProfile only sees the thread it was enabled on, so each outermost stage
+    gets its own profiler and they are merged when the capture ends. Nested
+    stages are timed exclusively (a parent's time excludes its children).
+    On Python 3.12+ only one profiler can be active per process; a stage that
+    overlaps another thread's is then timed without a profile.
+    """
+    def __init__(self, out_dir="profiles", top=25):
+        self.out_dir = out_dir
+        self.top = top
+        self.lock = threading.Lock()
+        self.local = threading.local()
+        self.active = False
+        self.profiles = []
+        self.timings = {}  # stage -> [calls, total, max]
+        self.unprofiled = 0  # Stages timed without a profile
+        self.utterances_left = None
+        self.started_at = None
+        self.utterances = 0
+        self.timer = None
+        self.last_summary = None
+
+    def start(self, utterances=None, seconds=None):
+        """Profile the next `utterances` commands or `seconds` seconds (whichever ends first)"""
+        with self.lock:
+            if self.active:
+                return False
+            self.active = True
+            self.profiles = []
+            self.timings = {}
+            self.unprofiled = 0
+            self.utterances = 0
+            self.utterances_left = utterances
+            self.started_at = time.time()
+            if seconds:
+                self.timer = threading.Timer(seconds, self.stop)
+                self.timer.daemon = True
+                self.timer.start()
+        print(f"Profiling started ({f'{utterances} utterances' if utterances else f'{seconds} seconds'})")
+        return True
+
+    @contextmanager
+    def stage(self, name):
+        if not self.active:
+            yield
+            return
+        stack = getattr(self.local, "stack", None)
+        if stack is None:
+            stack = self.local.stack = []
+        profiler = None
+        if not stack:
+            # Outermost stage on this thread owns the profiler
+            profiler = cProfile.Profile()
+            try:
+                profiler.enable()
+            except ValueError:
+                # "Another profiling tool is already active" - keep the wall time only
+                profiler = None
+                with self.lock:
+                    self.unprofiled += 1
+        frame = [name, 0.0]  # [stage, time spent in nested stages]
+        stack.append(frame)
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            elapsed = time.perf_counter() - start
+            stack.pop()
+            if stack:
+                stack[-1][1] += elapsed
+            if profiler is not None:
+                profiler.disable()
+            self._record(name, elapsed - frame[1], profiler)
+
+    def _record(self, name, elapsed, profiler):
+        with self.lock:
+            if not self.active:
+                return
+            calls_total_max = self.timings.setdefault(name, [0, 0.0, 0.0])
+            calls_total_max[0] += 1
+            calls_total_max[1] += elapsed
+            calls_total_max[2] = max(calls_total_max[2], elapsed)
+            if profiler is not None:
+                self.profiles.append(profiler)
+
+    def utterance_done(self):
+        """Count one handled command; stops the capture after the requested number"""
+        if not self.active:
+            return
+        with self.lock:
+            self.utterances += 1
+            finished = self.utterances_left is not None and self.utterances >= self.utterances_left
+        if finished:
+            self.stop()
+
+    def stop(self):
+        """End the capture and write the results; returns the summary path or None"""
+        with self.lock:
+            if not self.active:
+                return None
+            self.active = False
+            if self.timer:
+                self.timer.cancel()
+                self.timer = None
+            profiles, timings, unprofiled = self.profiles, self.timings, self.unprofiled
+            self.profiles, self.timings = [], {}
+            duration = time.time() - self.started_at
+            utterances = self.utterances
+        if not profiles:
+            print("Profiling stopped - nothing was captured")
+            return None
+
+        os.makedirs(self.out_dir, exist_ok=True)
+        now = datetime.now()
+        stamp = now.strftime("%Y%m%d-%H%M%S-") + f"{now.microsecond // 1000:03d}"
+        base, suffix = stamp, 1
+        while os.path.exists(os.path.join(self.out_dir, f"profile-{stamp}.prof")):
+            stamp = f"{base}-{suffix}"
+            suffix += 1
+        prof_path = os.path.join(self.out_dir, f"profile-{stamp}.prof")
+        summary_path = os.path.join(self.out_dir, f"profile-{stamp}.txt")
+
+        stats = pstats.Stats(profiles[0])
+        for profiler in profiles[1:]:
+            stats.add(profiler)
+        stats.dump_stats(prof_path)
+
+        lines = [f"Friday profile {stamp} - {utterances} utterances over {duration:.1f} s", "",
+                 f"{'stage':10s} {'calls':>6s} {'total ms':>10s} {'mean ms':>9s} {'max ms':>9s}"]
+        for name in list(STAGES) + sorted(set(timings) - set(STAGES)):
+            if name in timings:
+                calls, total, longest = timings[name]
+                lines.append(f"{name:10s} {calls:6d} {total * 1000:10.1f} {total / calls * 1000:9.1f} {longest * 1000:9.1f}")
+        if unprofiled:
+            lines.append(f"Timed without a profile (overlapped another thread's stage): {unprofiled}")
+        top = io.StringIO()
+        pstats.Stats(prof_path, stream=top).sort_stats("cumulative").print_stats(self.top)
+        lines += ["", f"Top {self.top} functions by cumulative time:", top.getvalue()]
+        with open(summary_path, "w", encoding="utf-8") as f:
+            f.write("\n".join(lines))
+
+        self.last_summary = summary_path
+        print(f"Profile written to {prof_path} (summary: {summary_path})")
+        return summary_path
@@ -0,0 +1,142 @@
+"""
+Non-blocking speech queue for Friday Assistant
+speak() returns immediately; a single worker plays utterances in priority order,
+drops messages that were superseded before they got a turn, and can be interrupted
+"""
+
+import time
+import heapq
+import itertools
+import threading
+
+URGENT = 0
+HIGH = 1
+NORMAL = 2
+LOW = 3
+
+
+class Utterance:
+    """One queued message; done is set once it was played or dropped"""
+    def __init__(self, text, priority, key):
+        self.text = text
+        self.priority = priority
+        self.key = key
+        self.cancelled = False
+        self.done = threading.Event()
+        self.queued_at = time.perf_counter()
+        self.started_at = None
+
+    def cancel(self):
+        self.cancelled = True
+
+    def wait(self, timeout=None):
+        return self.done.wait(timeout)
+
+
+class SpeechQueue:
+    """Priority queue of utterances played one at a time by a worker thread
+
+    render(text) plays one utterance and blocks until it finishes; stop() cuts
+    off the current one. Utterances with the same key coalesce: a newer one
+    replaces an older one that hasn't started yet.
+    """
+    def __init__(self, render, stop=None):
+        self.render = render
+        self.stop_current = stop
+        self.heap = []
+        self.pending = {}  # key -> waiting Utterance
+        self.order = itertools.count()
+        self.cond = threading.Condition()
+        self.current = None
+        self.thread = None
+        self.spoken = 0
+        self.coalesced = 0
+
+    def say(self, text, priority=NORMAL, key=None, interrupt=False):
+        """Queue text and return its Utterance without waiting
+
+        interrupt drops everything queued at a lower priority and cuts off the
+        current utterance if it is less urgent.
+        """
+        key = key if key is not None else text
+        utterance = Utterance(text, priority, key)
+        with self.cond:
+            previous = self.pending.get(key)
+            if previous is not None:
+                previous.cancel()
+                self.coalesced += 1
+            self.pending[key] = utterance
+            if interrupt:
+                for _, _, queued in self.heap:
+                    if queued.priority > priority:
+                        queued.cancel()
+            heapq.heappush(self.heap, (priority, next(self.order), utterance))
+            current = self.current
+            if interrupt and current is not None and current.priority > priority:
+                # Under the lock, so the worker can't have moved on to another utterance
+                self._stop(current)
+            self.cond.notify_all()
+            self._ensure_worker()
+        return utterance
+
+    def speak_and_wait(self, text, priority=NORMAL, key=None, timeout=None):
+        """Queue text and block until it has been spoken"""
+        return self.say(text, priority, key).wait(timeout)
+
+    def cancel_all(self):
+        """Drop everything queued and stop the current utterance"""
+        with self.cond:
+            for _, _, queued in self.heap:
+                queued.cancel()
+            if self.current is not None:
+                self._stop(self.current)
+
+    def is_speaking(self):
+        with self.cond:
+            return self.current is not None or any(not u.cancelled for _, _, u in self.heap)
+
+    def wait_idle(self, timeout=None):
+        """Block until nothing is playing or queued"""
+        with self.cond:
+            return self.cond.wait_for(
+                lambda: self.current is None and all(u.cancelled for _, _, u in self.heap), timeout)
+
+    def _stop(self, utterance):
+        # Called with the lock held; stop_current must not wait on the worker
+        utterance.cancel()
+        if self.stop_current:
+            try:
+                self.stop_current()
+            except Exception as e:
+                print(f"Could not stop speech: {e}")
+
+    def _ensure_worker(self):
+        # Called with the lock held, so concurrent say() calls can't start two workers
+        if self.thread is None or not self.thread.is_alive():
+            self.thread = threading.Thread(target=self._run, daemon=True, name="speech-queue")
+            self.thread.start()
+
+    def _run(self):
+        while True:
+            with self.cond:
+                while not self.heap:
+                    self.cond.wait()
+                _, _, utterance = heapq.heappop(self.heap)
+                if self.pending.get(utterance.key) is utterance:
+                    del self.pending[utterance.key]
+                if utterance.cancelled:
+                    utterance.done.set()
+                    self.cond.notify_all()
+                    continue
+                self.current = utterance
+            utterance.started_at = time.perf_counter()
+            try:
+                self.render(utterance.text)
+                self.spoken += 1
+            except Exception as e:
+                print(f"Speech error: {e}")
+            finally:
+                with self.cond:
+                    self.current = None
+                    utterance.done.set()
+                    self.cond.notify_all()
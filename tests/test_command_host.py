@@ -0,0 +1,81 @@
+import re
+import sys
+import base64
+
+import pytest
+
+from command_host import CommandHost, CommandTimeout, PosixShellTransport, PowerShellTransport
+
+posix_only = pytest.mark.skipif(sys.platform == "win32", reason="drives /bin/sh")
+
+
+@pytest.fixture
+def host():
+    host = CommandHost(PosixShellTransport(), default_timeout=5)
+    yield host
+    host.stop()
+
+
+@posix_only
+def test_commands_share_one_process(host):
+    first = host.run("echo hello")
+    pid = host.process.pid
+    second = host.run("x=1\necho $((x + 1))")
+    assert first.ok and first.output == "hello\n"
+    assert second.ok and second.output == "2\n"
+    assert host.process.pid == pid and host.restarts == 0
+
+
+@posix_only
+def test_failing_command_reports_status(host):
+    result = host.run("echo oops; false")
+    assert not result.ok
+    assert result.output == "oops\n"
+
+
+@posix_only
+def test_stuck_command_times_out_and_next_command_gets_a_fresh_host(host):
+    with pytest.raises(CommandTimeout):
+        host.run("sleep 30", timeout=0.3)
+    assert host.restarts == 1
+    assert host.run("echo back").output == "back\n"
+
+
+@posix_only
+def test_output_without_trailing_newline(host):
+    assert host.run("printf 'no newline'") == (True, "no newline")
+    assert host.run("printf 'one\\n'") == (True, "one\n")
+    assert host.run("printf 'bad'; false") == (False, "bad")
+
+
+@posix_only
+def test_timeout_covers_the_whole_command(host):
+    # Prints well within the timeout every time, but runs for much longer overall
+    with pytest.raises(CommandTimeout):
+        host.run("for i in 1 2 3 4 5 6 7 8 9 10; do echo $i; sleep 0.1; done", timeout=0.35)
+    assert host.restarts == 1
+
+
+@posix_only
+def test_host_that_exits_is_restarted(host):
+    result = host.run("exit 3")
+    assert not result.ok
+    assert host.run("echo alive").ok
+    assert host.restarts == 1
+
+
+def test_powershell_framing_round_trips_multiline_scripts():
+    script = "Get-Process |\n  Where-Object { $_.Name -eq 'explorer' }"
+    line = PowerShellTransport().wrap(script, "__MARK__")
+    assert line.endswith("Write-Output ('__MARK__' + $__ok)\n") and line.count("\n") == 1
+    encoded = re.search(r"FromBase64String\('([^']+)'\)", line).group(1)
+    assert base64.b64decode(encoded).decode("utf-8") == script
+    assert PowerShellTransport().parse_status("1\r\n") and not PowerShellTransport().parse_status("0")
+
+
+def test_powershell_error_preference_is_scoped_to_each_command():
+    transport = PowerShellTransport()
+    assert not any("ErrorActionPreference" in command for command in transport.init_commands)
+    line = transport.wrap("Get-Item missing", "__MARK__")
+    assert "$ErrorActionPreference = 'Stop'" in line
+    assert "finally { $ErrorActionPreference = $__eap }" in line
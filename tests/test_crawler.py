@@ -0,0 +1,53 @@
+import os
+
+import pytest
+
+from crawler import crawl, CrawlRules
+
+
+def make_tree(base, depth, fanout):
+    open(os.path.join(base, "notes.txt"), "w").close()
+    if depth == 0:
+        return
+    for i in range(fanout):
+        sub = os.path.join(base, f"dir_{i}")
+        os.mkdir(sub)
+        make_tree(sub, depth - 1, fanout)
+
+
+def expected_paths(root):
+    paths = set()
+    for r, dirs, files in os.walk(root):
+        paths.update(os.path.join(r, name) for name in dirs + files)
+    return paths
+
+
+@pytest.mark.parametrize("workers", [1, 4, 8])
+def test_crawl_finds_every_entry(tmp_path, workers):
+    make_tree(str(tmp_path), depth=3, fanout=6)
+    expected = expected_paths(str(tmp_path))
+    for _ in range(5):
+        found = [item.path for item in crawl(str(tmp_path), workers=workers)]
+        assert len(found) == len(set(found))
+        assert set(found) == expected
+
+
+def test_crawl_prunes_excluded_and_venv_folders(tmp_path):
+    (tmp_path / "node_modules" / "pkg").mkdir(parents=True)
+    (tmp_path / ".git").mkdir()
+    (tmp_path / "env1" / "lib").mkdir(parents=True)
+    (tmp_path / "env1" / "lib" / "site.py").write_text("")
+    (tmp_path / "env1" / "pyvenv.cfg").write_text("")
+    (tmp_path / "docs").mkdir()
+    (tmp_path / "docs" / "report.pdf").write_text("")
+
+    found = {os.path.relpath(item.path, tmp_path) for item in crawl(str(tmp_path), workers=4)}
+    # A virtualenv's own entries are listed, but it is not descended into
+    assert found == {"env1", os.path.join("env1", "lib"), os.path.join("env1", "pyvenv.cfg"),
+                     "docs", os.path.join("docs", "report.pdf")}
+
+
+def test_crawl_respects_max_depth(tmp_path):
+    make_tree(str(tmp_path), depth=3, fanout=2)
+    found = list(crawl(str(tmp_path), CrawlRules(max_depth=1), workers=4))
+    assert found and all(item.depth == 1 for item in found)
@@ -0,0 +1,87 @@
+import os
+
+import pytest
+
+from file_index import FileIndex
+
+
+@pytest.fixture
+def index(tmp_path):
+    root = tmp_path / "root"
+    for rel in ("Foo/a.txt", "foo/a.txt", "foo/b.txt", "foo/sub/c.txt", "Foobar/d.txt", "Foo_x/e.txt"):
+        path = root / rel
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text("")
+    index = FileIndex(str(tmp_path / "index.db"), str(root), workers=1)
+    index.build()
+    return index
+
+
+def paths(index):
+    rows = index._connect().execute("SELECT path FROM entries").fetchall()
+    return {os.path.relpath(r[0], index.root) for r in rows}
+
+
+def test_remove_path_matches_case_and_separator_exactly(index):
+    before = paths(index)
+    removed = index.remove_path(os.path.join(index.root, "Foo"))
+    assert removed == 2
+    assert paths(index) == before - {"Foo", os.path.join("Foo", "a.txt")}
+
+
+def test_remove_path_treats_like_wildcards_literally(index):
+    before = paths(index)
+    index.remove_path(os.path.join(index.root, "Foo_x"))
+    assert paths(index) == before - {"Foo_x", os.path.join("Foo_x", "e.txt")}
+
+
+def test_move_path_only_moves_the_renamed_folder(index):
+    old = os.path.join(index.root, "foo")
+    new = os.path.join(index.root, "renamed")
+    os.rename(old, new)
+    index.move_path(old, new)
+    result = paths(index)
+    assert not any(p == "foo" or p.startswith("foo" + os.sep) for p in result)
+    assert {"renamed", os.path.join("renamed", "sub", "c.txt"), os.path.join("Foo", "a.txt"),
+            os.path.join("Foobar", "d.txt")} <= result
+
+
+@pytest.fixture
+def report_index(tmp_path):
+    root = tmp_path / "root"
+    names = [f"Documents/report_{i:02d}.pdf" for i in range(20)] + \
+            [f"Desktop/report_{i}.txt" for i in range(5)] + [f"misc/deep/report_{i}.pdf" for i in range(10)]
+    for rel in names:
+        path = root / rel
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text("")
+    index = FileIndex(str(tmp_path / "index.db"), str(root), workers=4)
+    index.build()
+    return index
+
+
+@pytest.mark.parametrize("query", ["report", "rt_"])
+def test_iter_search_pages_through_every_match_in_rank_order(report_index, query):
+    expected = list(report_index.iter_search(query, page_size=1024))
+    assert len(expected) == 35
+    keys = [(-priority, len(path), path) for path, priority in expected]
+    assert keys == sorted(keys)
+    assert list(report_index.iter_search(query, page_size=3)) == expected
+
+
+def test_iter_search_filters_extensions_in_the_query(report_index):
+    results = list(report_index.iter_search("report", extensions=[".txt"], page_size=2))
+    assert len(results) == 5 and all(path.endswith(".txt") for path, _ in results)
+    assert report_index.search("report", extensions=[".pdf"], limit=4) == \
+        [path for path, _ in report_index.iter_search("report", extensions=[".pdf"])][:4]
+
+
+def test_iter_search_stops_at_the_first_page(report_index):
+    statements = []
+    conn = report_index._connect()
+    conn.set_trace_callback(statements.append)
+    first = next(report_index.iter_search("report", page_size=4))
+    conn.set_trace_callback(None)
+    assert first[1] == 2  # Desktop first
+    queries = [s for s in statements if s.startswith("SELECT path, priority")]
+    assert len(queries) == 1 and queries[0].endswith("LIMIT 4")
@@ -0,0 +1,71 @@
+import os
+import sys
+import time
+import pathlib
+import threading
+
+import pytest
+
+from file_index import FileIndex
+from index_watcher import IndexWatcher, InotifyBackend, PollingBackend
+
+
+@pytest.fixture
+def index(tmp_path):
+    root = tmp_path / "root"
+    for rel in ("docs/old.txt", "docs/keep.txt", "music/song.mp3", "projects/alpha/main.py"):
+        path = root / rel
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text("")
+    index = FileIndex(str(tmp_path / "index.db"), str(root), workers=1)
+    index.build()
+    time.sleep(0.05)  # Later changes get a newer mtime than the build
+    return index
+
+
+def change_while_not_watching(root):
+    (root / "docs" / "old.txt").unlink()
+    (root / "docs" / "new.txt").write_text("")
+    (root / "projects" / "alpha").rename(root / "projects" / "beta")
+    (root / "music" / "live").mkdir()
+    (root / "music" / "live" / "set.mp3").write_text("")
+
+
+def indexed(index):
+    rows = index._connect().execute("SELECT path FROM entries").fetchall()
+    return {os.path.relpath(r[0], index.root) for r in rows}
+
+
+EXPECTED = {"docs", os.path.join("docs", "keep.txt"), os.path.join("docs", "new.txt"),
+            "music", os.path.join("music", "song.mp3"), os.path.join("music", "live"),
+            os.path.join("music", "live", "set.mp3"),
+            "projects", os.path.join("projects", "beta"), os.path.join("projects", "beta", "main.py")}
+
+
+@pytest.mark.skipif(not sys.platform.startswith("linux"), reason="inotify")
+def test_inotify_startup_reconciles_changes_made_while_stopped(index):
+    change_while_not_watching(pathlib.Path(index.root))
+    watcher = IndexWatcher(index, scan_rate=0)
+    backend = InotifyBackend(watcher)
+    try:
+        started = time.time()
+        assert backend.add_tree(index.root, threading.Event(), since=index.last_build())
+        index.mark_synced(started)
+    finally:
+        backend.close()
+    assert indexed(index) == EXPECTED
+    assert index.last_build() == started
+
+
+def test_polling_backend_reconciles_the_same_changes(index):
+    change_while_not_watching(pathlib.Path(index.root))
+    watcher = IndexWatcher(index, scan_rate=0)
+    backend = PollingBackend(watcher)
+    baseline = index.last_build()
+    for directory in index.directories():
+        backend._watch(directory, baseline)
+    for _ in range(2):  # New directories are polled on the next round
+        for idx in range(len(backend.dirs)):
+            if backend.mtimes[idx] >= 0 and not backend.dirs.is_removed(idx):
+                backend._check_directory(idx)
+    assert indexed(index) == EXPECTED
@@ -0,0 +1,94 @@
+import time
+import shutil
+
+import pytest
+
+from launcher_index import LauncherIndex, StaticSource, CommonPathsSource
+
+
+def make_index(entries, **kwargs):
+    source = StaticSource(entries)
+    index = LauncherIndex([source], **kwargs)
+    index.build()
+    return index, source
+
+
+def wait_for_build(index, builds):
+    deadline = time.monotonic() + 5
+    while index.stats['builds'] < builds and time.monotonic() < deadline:
+        time.sleep(0.01)
+    assert index.stats['builds'] >= builds
+
+
+def test_miss_is_cached_until_ttl(tmp_path):
+    index, source = make_index({}, negative_ttl=60)
+    assert index.find("spotify") is None
+    source.items.append(("Spotify", str(tmp_path)))
+    assert index.find("spotify") is None
+    assert index.stats['negative_hits'] == 1
+    assert index.stats['builds'] == 1
+
+
+def test_expired_miss_rebuilds_and_finds_new_install(tmp_path):
+    index, source = make_index({}, negative_ttl=0.05)
+    assert index.find("spotify") is None
+    source.items.append(("Spotify", str(tmp_path)))
+    time.sleep(0.1)
+    index.find("spotify")  # Expired miss - answers from the old snapshot, rebuilds behind it
+    wait_for_build(index, 2)
+    assert index.find("spotify") == str(tmp_path)
+
+
+def test_old_index_is_rebuilt_in_background(tmp_path):
+    index, source = make_index({"Chrome": str(tmp_path)}, max_age=0.05)
+    assert index.find("chrome") == str(tmp_path)
+    source.items.append(("Slack", str(tmp_path)))
+    time.sleep(0.1)
+    index.find("chrome")
+    wait_for_build(index, 2)
+    assert index.find("slack") == str(tmp_path)
+
+
+def test_hit_for_deleted_path_is_searched_again(tmp_path):
+    app = tmp_path / "app.exe"
+    app.write_text("")
+    index, source = make_index({"App": str(app), "App Helper": str(tmp_path)})
+    assert index.find("app") == str(app)
+    app.unlink()
+    source.items.pop(0)
+    index.build()
+    assert index.find("app") == str(tmp_path)
+
+
+@pytest.mark.filterwarnings("ignore::pytest.PytestUnhandledThreadExceptionWarning")
+def test_find_falls_back_to_direct_search_when_build_dies(tmp_path):
+    index = LauncherIndex([StaticSource({"Notepad": str(tmp_path)})], build_wait=0.1)
+
+    def broken_build():
+        raise RuntimeError("build thread died")
+
+    index.build = broken_build
+    start = time.monotonic()
+    assert index.find("notepad") == str(tmp_path)
+    assert time.monotonic() - start < 2
+    assert index.stats['direct_searches'] == 1
+
+
+def test_common_paths_only_relists_changed_directories(tmp_path):
+    for sub in ("Vendor/App/bin", "Vendor/Tool", "Other"):
+        (tmp_path / sub).mkdir(parents=True)
+    (tmp_path / "Vendor/App/bin/app.exe").touch()
+    (tmp_path / "Vendor/Tool/tool.exe").touch()
+    (tmp_path / "Other/readme.txt").touch()
+    source = CommonPathsSource(roots=[(str(tmp_path), '.exe')])
+
+    assert sorted(name for name, _ in source.entries()) == ["app", "tool"]
+    assert source.scanned == 6
+    assert sorted(name for name, _ in source.entries()) == ["app", "tool"]
+    assert source.scanned == 0  # Nothing changed - every directory was only stat'ed
+
+    (tmp_path / "Vendor/App/bin/helper.exe").touch()
+    shutil.rmtree(tmp_path / "Vendor/Tool")
+    assert sorted(name for name, _ in source.entries()) == ["app", "helper"]
+    assert source.scanned == 2  # bin gained a file, Vendor lost a folder
+    assert (str(tmp_path / "Vendor/Tool"), '.exe') not in source.listings
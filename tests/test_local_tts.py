@@ -0,0 +1,40 @@
+import time
+import threading
+
+from local_tts import LocalTTSWorker, FakeEngine, speech_timeout
+
+
+class HangingEngine(FakeEngine):
+    """Gets stuck inside iterate() once an utterance starts, like a wedged driver"""
+    def __init__(self):
+        super().__init__()
+        self.release = threading.Event()
+
+    def iterate(self):
+        if self.current:
+            self.release.wait()
+        super().iterate()
+
+
+def test_speech_timeout_grows_with_text():
+    assert speech_timeout("Yes") < speech_timeout("Yes " * 50)
+
+
+def test_restart_replaces_a_hung_engine():
+    engines = []
+
+    def factory():
+        engines.append(HangingEngine() if not engines else FakeEngine(start_delay=0, seconds_per_char=0))
+        return engines[-1]
+
+    worker = LocalTTSWorker(factory)
+    stuck = worker.speak("hello there")
+    assert not stuck.wait(0.3)
+
+    worker.restart()
+    assert stuck.done.is_set() and stuck.interrupted
+    assert worker.speak_and_wait("again", timeout=2)
+    assert len(engines) == 2 and worker.restarts == 1
+
+    engines[0].release.set()  # The abandoned thread exits once its driver returns
+    worker.shutdown()
@@ -0,0 +1,24 @@
+import io
+import logging
+
+import logger
+
+
+def test_records_are_formatted_once(tmp_path):
+    console = io.StringIO()
+    log = logger.setup_logging("INFO", tmp_path, console=console)
+    try:
+        log.info("hello %s", "world")
+        try:
+            1 / 0
+        except ZeroDivisionError:
+            log.exception("failed")
+    finally:
+        logger.stop_logging()
+        logging.basicConfig(force=True)
+
+    lines = console.getvalue().splitlines()
+    assert lines[0].endswith(" - assistant - INFO - hello world")
+    assert lines[1].endswith(" - assistant - ERROR - failed")
+    assert console.getvalue().count("Traceback") == 1
+    assert (tmp_path / "assistant.log").read_text(encoding="utf-8") == console.getvalue()
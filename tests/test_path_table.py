@@ -0,0 +1,86 @@
+import os
+
+import pytest
+
+from path_table import PathTable
+
+
+@pytest.fixture
+def root(tmp_path):
+    return str(tmp_path)
+
+
+def live_paths(table):
+    return {table.path(i) for i in table}
+
+
+def build(root, rels, dirs=()):
+    table = PathTable()
+    for rel in dirs:
+        table.add(os.path.join(root, rel), is_dir=True)
+    for rel in rels:
+        table.add(os.path.join(root, rel))
+    return table
+
+
+def test_add_interns_directories_once(root):
+    table = build(root, ["a/x.txt", "a/y.txt", "a/b/z.txt"], dirs=["a/b", "c"])
+    assert table.find_dir(os.path.join(root, "a")) == table.add(os.path.join(root, "a"), is_dir=True)
+    assert table.find_dir(os.path.join(root, "missing")) is None
+    files = {table.path(i) for i in table if not table.is_dir(i)}
+    assert files == {os.path.join(root, rel) for rel in ("a/x.txt", "a/y.txt", "a/b/z.txt")}
+    dirs = [table.path(i) for i in table if table.is_dir(i)]
+    assert len(dirs) == len(set(dirs))
+
+
+def test_remove_tree_only_removes_the_subtree(root):
+    table = build(root, ["a/x.txt", "a/b/z.txt", "ab/y.txt", "c/w.txt"])
+    before = live_paths(table)
+    table.remove_tree(table.find_dir(os.path.join(root, "a")))
+    removed = {os.path.join(root, rel) for rel in ("a", "a/x.txt", "a/b", "a/b/z.txt")}
+    assert live_paths(table) == before - removed
+    assert table.find_dir(os.path.join(root, "a")) is None
+    assert table.find_dir(os.path.join(root, "ab")) is not None
+
+
+def test_rename_is_remove_and_add(root):
+    table = build(root, ["old/x.txt", "old/sub/y.txt", "other/z.txt"])
+    table.remove_tree(table.find_dir(os.path.join(root, "old")))
+    table.add(os.path.join(root, "new/x.txt"))
+    table.add(os.path.join(root, "new/sub/y.txt"))
+    table.add(os.path.join(root, "old/fresh.txt"))  # The old name comes back as a new node
+
+    paths = live_paths(table)
+    assert os.path.join(root, "new/sub/y.txt") in paths
+    assert os.path.join(root, "old/x.txt") not in paths
+    assert os.path.join(root, "old/fresh.txt") in paths
+
+    table.remove_tree(table.find_dir(os.path.join(root, "old")))
+    assert os.path.join(root, "old/fresh.txt") not in live_paths(table)
+    assert os.path.join(root, "new/x.txt") in live_paths(table)
+
+
+def test_reload_through_mmap(root, tmp_path):
+    table = build(root, ["a/x.txt", "a/b/z.txt", "c/w.txt"])
+    table.remove_tree(table.find_dir(os.path.join(root, "c")))
+    filename = str(tmp_path / "table.bin")
+    table.save(filename)
+
+    loaded = PathTable.load(filename)
+    try:
+        assert loaded._mmap is not None
+        assert live_paths(loaded) == live_paths(table)
+        assert loaded.find_dir(os.path.join(root, "a", "b")) == table.find_dir(os.path.join(root, "a", "b"))
+
+        # Changes copy the arrays out of the mapping and leave the file alone
+        loaded.remove_tree(loaded.find_dir(os.path.join(root, "a", "b")))
+        loaded.add(os.path.join(root, "a", "b", "new.txt"))
+        assert loaded._mmap is None
+        assert live_paths(loaded) == live_paths(table) - {
+            os.path.join(root, "a", "b", "z.txt")} | {os.path.join(root, "a", "b", "new.txt")}
+    finally:
+        loaded.close()
+
+    reloaded = PathTable.load(filename)
+    assert live_paths(reloaded) == live_paths(table)
+    reloaded.close()
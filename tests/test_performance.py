@@ -0,0 +1,75 @@
+import json
+
+import pytest
+
+from performance import PerformanceSettings
+
+PROFILES = {
+    "balanced": {"CHUNK_DURATION": 3.0, "COMMAND_TIMEOUT": 30, "WHISPER_WAKE_MODEL": "tiny", "WHISPER_DECODE": {}},
+    "low-power": {"CHUNK_DURATION": 4.0, "COMMAND_TIMEOUT": 20, "WHISPER_WAKE_MODEL": "tiny",
+                  "WHISPER_DECODE": {"fp16": False}},
+}
+
+
+def write(path, content):
+    path.write_text(content if isinstance(content, str) else json.dumps(content), encoding="utf-8")
+
+
+@pytest.mark.parametrize("content", ["{not json", "[1]", "", "null"])
+def test_bad_file_at_startup_falls_back_to_default_profile(tmp_path, content):
+    path = tmp_path / "performance.json"
+    write(path, content)
+    settings = PerformanceSettings(PROFILES, "balanced", str(path))
+    assert settings.profile == "balanced"
+    assert settings.CHUNK_DURATION == 3.0
+    assert settings.COMMAND_TIMEOUT == 30
+
+
+def test_missing_file_uses_default_profile(tmp_path):
+    settings = PerformanceSettings(PROFILES, "balanced", str(tmp_path / "missing.json"))
+    assert settings.values == PROFILES["balanced"]
+
+
+def test_profile_and_overrides_are_applied(tmp_path):
+    path = tmp_path / "performance.json"
+    write(path, {"profile": "low-power", "COMMAND_TIMEOUT": 15, "CHUNK_DURATION": 5})
+    settings = PerformanceSettings(PROFILES, "balanced", str(path))
+    assert settings.profile == "low-power"
+    assert (settings.CHUNK_DURATION, settings.COMMAND_TIMEOUT) == (5, 15)
+
+
+def test_wrongly_typed_and_unknown_overrides_are_rejected(tmp_path):
+    path = tmp_path / "performance.json"
+    write(path, {"CHUNK_DURATION": "fast", "COMMAND_TIMEOUT": True, "WHISPER_DECODE": [], "BOGUS": 1})
+    settings = PerformanceSettings(PROFILES, "balanced", str(path))
+    assert settings.values == PROFILES["balanced"]
+
+
+def test_bad_edit_while_running_keeps_previous_values(tmp_path):
+    path = tmp_path / "performance.json"
+    write(path, {"COMMAND_TIMEOUT": 12})
+    settings = PerformanceSettings(PROFILES, "balanced", str(path))
+    changes = []
+    settings.add_listener(changes.append)
+
+    write(path, "{half saved")
+    assert settings.reload() == set()
+    assert settings.COMMAND_TIMEOUT == 12
+
+    write(path, {"COMMAND_TIMEOUT": "soon", "CHUNK_DURATION": 2.5})
+    assert settings.reload() == {"CHUNK_DURATION"}
+    assert settings.COMMAND_TIMEOUT == 12  # Rejected - the running value stays
+    assert changes == [{"CHUNK_DURATION"}]
+
+
+def test_switching_profile_notifies_listeners(tmp_path):
+    path = tmp_path / "performance.json"
+    settings = PerformanceSettings(PROFILES, "balanced", str(path))
+    changes = []
+    settings.add_listener(changes.append)
+    write(path, {"profile": "low-power"})
+    settings.check()
+    assert changes == [{"CHUNK_DURATION", "COMMAND_TIMEOUT", "WHISPER_DECODE"}]
+    path.unlink()
+    settings.check()
+    assert settings.profile == "balanced"
@@ -0,0 +1,68 @@
+import os
+import threading
+import cProfile
+
+import session_profiler
+from session_profiler import SessionProfiler
+
+
+class ExclusiveProfile(cProfile.Profile):
+    """Behaves like cProfile on Python 3.12+: one active profiler per process"""
+    active = 0
+    lock = threading.Lock()
+
+    def enable(self, *args, **kwargs):
+        with self.lock:
+            if ExclusiveProfile.active:
+                raise ValueError("Another profiling tool is already active")
+            ExclusiveProfile.active += 1
+        super().enable(*args, **kwargs)
+
+    def disable(self):
+        super().disable()
+        with self.lock:
+            ExclusiveProfile.active -= 1
+
+
+def test_overlapping_stages_on_two_threads_are_timed_not_raised(tmp_path, monkeypatch):
+    monkeypatch.setattr(session_profiler.cProfile, "Profile", ExclusiveProfile)
+    profiler = SessionProfiler(str(tmp_path))
+    profiler.start(utterances=10)
+    inside = threading.Event()
+    release = threading.Event()
+    errors = []
+
+    def action():
+        try:
+            with profiler.stage("action"):
+                inside.set()
+                release.wait(2)
+        except Exception as e:
+            errors.append(e)
+
+    thread = threading.Thread(target=action)
+    thread.start()
+    inside.wait(2)
+    with profiler.stage("asr"):
+        sum(range(1000))
+    release.set()
+    thread.join()
+
+    summary = profiler.stop()
+    assert not errors
+    text = open(summary, encoding="utf-8").read()
+    assert "asr" in text and "action" in text
+    assert "Timed without a profile (overlapped another thread's stage): 1" in text
+
+
+def test_sessions_in_the_same_second_get_separate_files(tmp_path):
+    paths = []
+    for _ in range(3):
+        profiler = SessionProfiler(str(tmp_path))
+        profiler.start(utterances=1)
+        with profiler.stage("intent"):
+            sum(range(100))
+        profiler.utterance_done()
+        paths.append(profiler.last_summary)
+    assert len(set(paths)) == 3
+    assert len([name for name in os.listdir(tmp_path) if name.endswith(".prof")]) == 3
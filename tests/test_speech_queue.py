@@ -0,0 +1,73 @@
+import time
+import threading
+
+from speech_queue import SpeechQueue, HIGH, NORMAL, LOW
+
+
+class FakeRenderer:
+    """Plays each utterance for `duration` seconds unless stopped"""
+    def __init__(self, duration=0.5):
+        self.duration = duration
+        self.stopped = threading.Event()
+        self.log = []
+
+    def render(self, text):
+        self.stopped.clear()
+        self.log.append(text)
+        if self.stopped.wait(self.duration):
+            self.log.append(f"cut {text}")
+
+    def stop(self):
+        self.stopped.set()
+
+
+def test_interrupt_cuts_off_less_urgent_speech_only():
+    renderer = FakeRenderer()
+    queue = SpeechQueue(renderer.render, renderer.stop)
+    queue.say("long reply", LOW)
+    time.sleep(0.05)
+    queue.say("later", LOW)
+    urgent = queue.say("Yes", HIGH, interrupt=True)
+    assert urgent.wait(3)
+    assert queue.wait_idle(3)
+    assert renderer.log == ["long reply", "cut long reply", "Yes"]
+
+
+def test_waiting_utterances_with_same_key_coalesce():
+    renderer = FakeRenderer(duration=0.1)
+    queue = SpeechQueue(renderer.render, renderer.stop)
+    queue.say("first", NORMAL)
+    time.sleep(0.02)
+    queue.say("Volume 10", NORMAL, key="volume")
+    queue.say("Volume 20", NORMAL, key="volume")
+    assert queue.wait_idle(3)
+    assert renderer.log == ["first", "Volume 20"]
+    assert queue.coalesced == 1
+
+
+def test_concurrent_callers_start_a_single_worker(monkeypatch):
+    renderer = FakeRenderer(duration=0.01)
+    queue = SpeechQueue(renderer.render, renderer.stop)
+    started = []
+    real_thread = threading.Thread
+
+    def counting_thread(*args, **kwargs):
+        thread = real_thread(*args, **kwargs)
+        started.append(thread)
+        return thread
+
+    monkeypatch.setattr(threading, "Thread", counting_thread)
+    barrier = threading.Barrier(8)
+
+    def caller(i):
+        barrier.wait()
+        queue.say(f"message {i}", NORMAL)
+
+    callers = [real_thread(target=caller, args=(i,)) for i in range(8)]
+    for thread in callers:
+        thread.start()
+    for thread in callers:
+        thread.join()
+    assert queue.wait_idle(timeout=2)
+    assert len(started) == 1
+    assert sorted(renderer.log) == sorted(f"message {i}" for i in range(8))
@@ -0,0 +1,90 @@
+from tts_failover import CircuitBreaker, FailoverSpeaker, CLOSED, OPEN, HALF_OPEN
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+def test_breaker_opens_after_threshold_and_half_opens_after_cooldown():
+    clock = FakeClock()
+    breaker = CircuitBreaker(failure_threshold=3, cooldown=60, clock=clock)
+    for _ in range(2):
+        assert breaker.allow()
+        breaker.record_failure()
+    assert breaker.state == CLOSED
+    assert breaker.allow()
+    breaker.record_failure()
+    assert breaker.state == OPEN
+    assert breaker.trips == 1
+    assert not breaker.allow()
+
+    clock.now = 59
+    assert not breaker.allow()
+    clock.now = 60
+    assert breaker.allow()  # One trial request
+    assert breaker.state == HALF_OPEN
+    assert not breaker.allow()  # ...and only one
+
+
+def test_failed_trial_reopens_and_successful_trial_closes():
+    clock = FakeClock()
+    breaker = CircuitBreaker(failure_threshold=1, cooldown=10, clock=clock)
+    breaker.record_failure()
+    clock.now = 10
+    assert breaker.allow()
+    breaker.record_failure()
+    assert breaker.state == OPEN
+    assert breaker.trips == 2
+    assert not breaker.allow()
+
+    clock.now = 20
+    assert breaker.allow()
+    breaker.record_success()
+    assert breaker.state == CLOSED
+    assert breaker.failures == 0
+    assert breaker.allow()
+
+
+def test_success_resets_consecutive_failures():
+    breaker = CircuitBreaker(failure_threshold=2, clock=FakeClock())
+    breaker.record_failure()
+    breaker.record_success()
+    breaker.record_failure()
+    assert breaker.state == CLOSED
+
+
+def test_speaker_skips_remote_while_open_but_plays_cached_phrases():
+    calls = []
+
+    def remote(text):
+        calls.append(text)
+        raise ConnectionError("offline")
+
+    local = []
+    speaker = FailoverSpeaker(remote, local.append, CircuitBreaker(failure_threshold=2, clock=FakeClock()),
+                              is_cached=lambda text: text == "Yes")
+    assert [speaker.speak("one"), speaker.speak("two"), speaker.speak("three")] == ["local"] * 3
+    assert calls == ["one", "two"]  # Breaker opened after two failures
+    assert local == ["one", "two", "three"]
+
+    calls.clear()
+    speaker.remote = lambda text: calls.append(text) or True
+    assert speaker.speak("Yes") == "remote"  # Cached - no network, so the breaker is bypassed
+    assert speaker.speak("four") == "local"
+    assert calls == ["Yes"]
+
+
+def test_remote_error_is_recorded_and_counted_as_a_failure():
+    def remote(text):
+        raise ConnectionResetError("stream dropped")
+
+    local = []
+    speaker = FailoverSpeaker(remote, local.append, CircuitBreaker(failure_threshold=5, clock=FakeClock()))
+    assert speaker.speak("Opening chrome") == "local"
+    assert isinstance(speaker.last_error, ConnectionResetError)
+    assert speaker.breaker.failures == 1
+    assert local == ["Opening chrome"]
@@ -0,0 +1,176 @@
+import time
+import threading
+import types
+import urllib.error
+
+import pytest
+
+import tts_stream
+from tts_stream import (PersistentOutput, OutputStalled, JitterBuffer, StreamingPlayer, FirstByteTimeout,
+                        http_chunks, clocked_output)
+from tts_stub_server import StubTTSServer, tone_pcm
+
+
+class FakeRawOutputStream:
+    """sounddevice.RawOutputStream stand-in that calls back `blocks` times, then hangs"""
+    blocks = None
+    instances = []
+
+    def __init__(self, samplerate, channels, dtype, blocksize, callback):
+        self.blocksize = blocksize
+        self.channels = channels
+        self.callback = callback
+        self.aborted = False
+        self.closed = False
+        self.thread = None
+        FakeRawOutputStream.instances.append(self)
+
+    def start(self):
+        self.thread = threading.Thread(target=self._run, daemon=True)
+        self.thread.start()
+
+    def _run(self):
+        count = 0
+        while not self.closed and (self.blocks is None or count < self.blocks):
+            outdata = bytearray(self.blocksize * self.channels * 2)
+            self.callback(outdata, self.blocksize, None, None)
+            count += 1
+            time.sleep(0.001)
+
+    def stop(self):
+        self.closed = True
+
+    def abort(self):
+        self.aborted = True
+        self.closed = True
+
+    def close(self):
+        self.closed = True
+
+
+@pytest.fixture
+def fake_sd(monkeypatch):
+    FakeRawOutputStream.instances = []
+    monkeypatch.setattr(tts_stream, "sd", types.SimpleNamespace(RawOutputStream=FakeRawOutputStream), raising=False)
+    return FakeRawOutputStream
+
+
+def pull_for(blocks):
+    state = {"left": blocks}
+
+    def pull(nbytes):
+        state["left"] -= 1
+        return b"\0" * nbytes, state["left"] <= 0
+    return pull
+
+
+def test_play_returns_when_the_source_is_done(fake_sd):
+    fake_sd.blocks = None
+    output = PersistentOutput(blocksize=256, stall_timeout=1.0)
+    output.play(22050, 1, pull_for(5))
+    output.play(22050, 1, pull_for(5))
+    assert len(fake_sd.instances) == 1  # Stream reused across utterances
+    output.close()
+
+
+def test_stalled_device_raises_and_resets_the_stream(fake_sd):
+    fake_sd.blocks = 3
+    output = PersistentOutput(blocksize=256, stall_timeout=0.2)
+    start = time.monotonic()
+    with pytest.raises(OutputStalled):
+        output.play(22050, 1, pull_for(10**6))
+    assert time.monotonic() - start < 2
+    assert fake_sd.instances[0].aborted
+    assert output.stream is None and output.source is None
+
+    fake_sd.blocks = None
+    output.play(22050, 1, pull_for(3))  # Next utterance opens a fresh stream
+    assert len(fake_sd.instances) == 2
+    output.close()
+
+
+def fast_output(sample_rate, channels, pull):
+    clocked_output(sample_rate, channels, pull, speed=20.0)
+
+
+@pytest.fixture
+def stub():
+    server = StubTTSServer(tone_pcm(0.5), chunk_size=2048).start()
+    yield server
+    server.stop()
+
+
+def stream(stub, text="Opening chrome"):
+    url = f"{stub.url}/v1/text-to-speech/stub-voice/stream?output_format=pcm_22050"
+    return http_chunks(url, {"text": text})
+
+
+def test_jitter_buffer_pads_underruns_with_silence():
+    buffer = JitterBuffer(prebuffer_bytes=4, max_bytes=16)
+    buffer.put(b"\x01\x02")
+    data, done = buffer.read(6)
+    assert data == b"\x01\x02" + b"\0" * 4 and not done
+    assert buffer.underruns == 1
+    buffer.put(b"\x03\x04")
+    buffer.close()
+    assert buffer.read(2) == (b"\x03\x04", True)
+
+
+def test_jitter_buffer_blocks_producer_when_full_until_cancelled():
+    buffer = JitterBuffer(prebuffer_bytes=2, max_bytes=4)
+    assert buffer.put(b"\0" * 4)
+    results = []
+    producer = threading.Thread(target=lambda: results.append(buffer.put(b"\0\0")))
+    producer.start()
+    producer.join(0.1)
+    assert producer.is_alive()
+    buffer.cancel()
+    producer.join(1)
+    assert results == [False]
+
+
+def test_player_streams_all_audio_from_stub(stub):
+    stats = StreamingPlayer(output=fast_output).play(stream(stub))
+    assert stats.bytes == len(stub.audio)
+    assert stats.first_audio < stats.total
+
+
+def test_first_byte_deadline_raises(stub):
+    stub.first_byte_delay = 1.0
+    start = time.monotonic()
+    with pytest.raises(FirstByteTimeout):
+        StreamingPlayer(output=fast_output).play(stream(stub), first_byte_timeout=0.2)
+    assert time.monotonic() - start < 0.8
+
+
+def test_server_error_before_audio_is_raised(stub):
+    stub.fail_status = 500
+    with pytest.raises(urllib.error.HTTPError):
+        StreamingPlayer(output=fast_output).play(stream(stub))
+
+
+def test_stop_cuts_playback_short(stub):
+    stub.audio = tone_pcm(5.0)
+    player = StreamingPlayer(output=clocked_output)
+    threading.Timer(0.3, player.stop).start()
+    start = time.monotonic()
+    player.play(stream(stub))
+    assert time.monotonic() - start < 2
+
+
+def test_error_after_first_audio_is_raised_once_received_audio_has_played():
+    played = []
+
+    def chunks():
+        yield b"\1\0" * 4096
+        raise ConnectionResetError("stream dropped")
+
+    def output(rate, channels, pull):
+        done = False
+        while not done:
+            chunk, done = pull(1024)
+            played.append(chunk)
+
+    with pytest.raises(ConnectionResetError):
+        StreamingPlayer(prebuffer_ms=0, output=output).play(chunks())
+    assert b"".join(played).startswith(b"\1\0" * 4096)
@@ -0,0 +1,59 @@
+import json
+
+from usage_store import UsageStore, VERSION, _empty_buckets
+
+
+def buckets(**hours):
+    result = _empty_buckets()
+    for hour, count in hours.items():
+        result[int(hour[1:])] = count
+    return result
+
+
+def write(path, data):
+    path.write_text(json.dumps(data), encoding="utf-8")
+
+
+def test_file_without_kinds_is_seeded_from_known_apps(tmp_path):
+    path = tmp_path / "usage.json"
+    write(path, {
+        'version': VERSION,
+        'apps': {'chrome': buckets(h9=5), 'notepad': buckets(h9=2, h14=1), 'cat videos': buckets(h9=9)},
+        'commands': {},
+        'suggestions': {'t0': 0, 'scores': [{'cat videos': 9.0}] * 24},
+    })
+    store = UsageStore(str(path), flush_interval=3600)
+    assert store.suggest_targets(9) == []
+
+    assert store.seed_suggestions(lambda name: name in {'chrome', 'notepad'}) == 2
+    assert store.suggest_targets(9) == [('app', 'chrome'), ('app', 'notepad')]
+    assert store.suggest_targets(14) == [('app', 'notepad')]
+    assert store.app_count('cat videos') == 9  # Counts are kept, only suggestions are filtered
+
+    store.close()
+    reloaded = UsageStore(str(path), flush_interval=3600)
+    assert reloaded.suggest_targets(9) == [('app', 'chrome'), ('app', 'notepad')]
+    assert reloaded.seed_suggestions(lambda name: True) == 0
+
+
+def test_migrated_legacy_file_is_seeded(tmp_path):
+    path = tmp_path / "usage.json"
+    write(path, {'app_usage': {'spotify': {'count': 3, 'hours': [20, 20, 21]}}})
+    store = UsageStore(str(path), flush_interval=3600)
+    store.seed_suggestions(lambda name: True)
+    assert store.suggest_targets(20) == [('app', 'spotify')]
+    store.close()
+
+
+def test_new_launches_outweigh_seeded_counts(tmp_path):
+    path = tmp_path / "usage.json"
+    write(path, {'version': VERSION, 'apps': {'chrome': buckets(h8=1)}, 'commands': {}})
+    store = UsageStore(str(path), flush_interval=3600)
+    store.seed_suggestions(lambda name: True)
+    store.record("open_folder", "Downloads", 8, kind="folder")
+    store.record("open_folder", "Downloads", 8, kind="folder")
+    store.record("search_web", "cat videos", 8)
+    assert store.suggest_targets(8)[0] == ('folder', 'Downloads')
+    assert ('app', 'chrome') in store.suggest_targets(8)
+    assert all(name != 'cat videos' for _, name in store.suggest_targets(8))
+    store.close()
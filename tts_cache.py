@@ -0,0 +1,145 @@
+"""
+Content-addressed TTS phrase cache for Friday Assistant
+Rendered audio is stored on disk under a hash of (backend, voice, settings, text)
+with LRU eviction by total size, plus a small in-memory tier for the hottest phrases
+"""
+
+import os
+import json
+import hashlib
+import threading
+from collections import OrderedDict
+
+SUFFIX = ".pcm"
+
+
+def phrase_key(backend, voice_id, settings, text):
+    """Stable key for one rendering of a phrase"""
+    material = json.dumps([backend, voice_id, settings, text.strip()], sort_keys=True)
+    return hashlib.sha256(material.encode("utf-8")).hexdigest()
+
+
+class PhraseCache:
+    """Size-bounded on-disk LRU of audio blobs with an in-memory hot tier"""
+    def __init__(self, directory="tts_cache", max_bytes=50 * 1024**2, hot_bytes=4 * 1024**2):
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self.hot_bytes = hot_bytes
+        self.lock = threading.Lock()
+        self.hot = OrderedDict()   # key -> bytes
+        self.hot_size = 0
+        self.disk = OrderedDict()  # key -> size, least recently used first
+        self.disk_size = 0
+        self.hot_hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._scan()
+
+    def _path(self, key):
+        return os.path.join(self.directory, key + SUFFIX)
+
+    def _scan(self):
+        """Rebuild the LRU order from file access times"""
+        try:
+            os.makedirs(self.directory, exist_ok=True)
+            entries = []
+            with os.scandir(self.directory) as it:
+                for entry in it:
+                    if entry.name.endswith(SUFFIX):
+                        st = entry.stat()
+                        entries.append((st.st_mtime, entry.name[:-len(SUFFIX)], st.st_size))
+        except OSError as e:
+            print(f"Could not read TTS cache: {e}")
+            return
+        for _, key, size in sorted(entries):
+            self.disk[key] = size
+            self.disk_size += size
+
+    def _remember_hot(self, key, data):
+        if len(data) > self.hot_bytes:
+            return
+        if key in self.hot:
+            self.hot_size -= len(self.hot.pop(key))
+        self.hot[key] = data
+        self.hot_size += len(data)
+        while self.hot_size > self.hot_bytes:
+            _, old = self.hot.popitem(last=False)
+            self.hot_size -= len(old)
+
+    def get(self, key):
+        with self.lock:
+            data = self.hot.get(key)
+            if data is not None:
+                self.hot.move_to_end(key)
+                self.disk.move_to_end(key)
+                self.hot_hits += 1
+                return data
+            if key not in self.disk:
+                self.misses += 1
+                return None
+        try:
+            path = self._path(key)
+            with open(path, "rb") as f:
+                data = f.read()
+            os.utime(path)  # Survives restarts as the LRU order
+        except OSError:
+            with self.lock:
+                self.disk_size -= self.disk.pop(key, 0)
+                self.misses += 1
+            return None
+        with self.lock:
+            if key in self.disk:
+                self.disk.move_to_end(key)
+            self._remember_hot(key, data)
+            self.disk_hits += 1
+        return data
+
+    def contains(self, key):
+        with self.lock:
+            return key in self.disk
+
+    def put(self, key, data):
+        if not data or len(data) > self.max_bytes:
+            return
+        path = self._path(key)
+        try:
+            tmp_path = path + ".tmp"
+            with open(tmp_path, "wb") as f:
+                f.write(data)
+            os.replace(tmp_path, path)
+        except OSError as e:
+            print(f"Could not write TTS cache entry: {e}")
+            return
+        with self.lock:
+            self.disk_size -= self.disk.pop(key, 0)
+            self.disk[key] = len(data)
+            self.disk_size += len(data)
+            self._remember_hot(key, data)
+            evicted = []
+            while self.disk_size > self.max_bytes:
+                old_key, size = self.disk.popitem(last=False)
+                self.disk_size -= size
+                if old_key in self.hot:
+                    self.hot_size -= len(self.hot.pop(old_key))
+                evicted.append(old_key)
+            self.evictions += len(evicted)
+        for old_key in evicted:
+            try:
+                os.remove(self._path(old_key))
+            except OSError:
+                pass
+
+    def stats(self):
+        with self.lock:
+            lookups = self.hot_hits + self.disk_hits + self.misses
+            return {
+                'hot_hits': self.hot_hits,
+                'disk_hits': self.disk_hits,
+                'misses': self.misses,
+                'evictions': self.evictions,
+                'hit_rate': round((self.hot_hits + self.disk_hits) / lookups, 3) if lookups else 0.0,
+                'entries': len(self.disk),
+                'disk_bytes': self.disk_size,
+                'hot_bytes': self.hot_size,
+            }
@@ -0,0 +1,134 @@
+"""
+TTS backend failover for Friday Assistant
+Tries the remote (ElevenLabs) voice under a first-byte deadline and falls back to
+local TTS straight away; after repeated failures a circuit breaker skips the
+remote backend entirely until a cooldown has passed
+"""
+
+import time
+import threading
+
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half-open"
+
+
+class CircuitBreaker:
+    """Opens after `failure_threshold` consecutive failures; after `cooldown`
+    seconds a single trial request is let through to test the backend again"""
+    def __init__(self, failure_threshold=3, cooldown=60, clock=time.monotonic):
+        self.failure_threshold = failure_threshold
+        self.cooldown = cooldown
+        self.clock = clock
+        self.lock = threading.Lock()
+        self.state = CLOSED
+        self.failures = 0
+        self.opened_at = 0.0
+        self.trial_running = False
+        self.trips = 0
+
+    def allow(self):
+        with self.lock:
+            if self.state == CLOSED:
+                return True
+            if self.state == OPEN and self.clock() - self.opened_at >= self.cooldown:
+                self.state = HALF_OPEN
+            if self.state == HALF_OPEN and not self.trial_running:
+                self.trial_running = True
+                return True
+            return False
+
+    def record_success(self):
+        with self.lock:
+            self.state = CLOSED
+            self.failures = 0
+            self.trial_running = False
+
+    def record_failure(self):
+        with self.lock:
+            self.failures += 1
+            self.trial_running = False
+            if self.state == HALF_OPEN or self.failures >= self.failure_threshold:
+                if self.state != OPEN:
+                    self.trips += 1
+                self.state = OPEN
+                self.opened_at = self.clock()
+
+
+class FailoverSpeaker:
+    """Speaks through remote(text) when it is healthy, local(text) otherwise
+
+    remote must enforce its own deadlines (e.g. StreamingPlayer's first-byte
+    timeout) and return False or raise on failure. Phrases the remote backend
+    can play from cache (is_cached) skip the breaker, since they need no network.
+    """
+    def __init__(self, remote, local, breaker=None, is_remote_ready=None, is_cached=None):
+        self.remote = remote
+        self.local = local
+        self.breaker = breaker or CircuitBreaker()
+        self.is_remote_ready = is_remote_ready or (lambda: True)
+        self.is_cached = is_cached or (lambda text: False)
+        self.last_error = None
+        self.remote_count = 0
+        self.local_count = 0
+
+    def speak(self, text):
+        """Speak text; returns 'remote' or 'local'"""
+        self.last_error = None
+        if self.is_remote_ready():
+            cached = self.is_cached(text)
+            if cached or self.breaker.allow():
+                try:
+                    ok = self.remote(text)
+                except Exception as e:
+                    ok = False
+                    self.last_error = e
+                if not cached:
+                    if ok:
+                        self.breaker.record_success()
+                    else:
+                        self.breaker.record_failure()
+                if ok:
+                    self.remote_count += 1
+                    return "remote"
+        self.local(text)
+        self.local_count += 1
+        return "local"
+
+
+if __name__ == "__main__":
+    # Per-utterance latency with a slow and then a failing remote, with and without failover
+    from tts_stub_server import StubTTSServer, tone_pcm
+    from tts_stream import StreamingPlayer, http_chunks, clocked_output
+
+    stub = StubTTSServer(tone_pcm(0.2)).start()
+    url = f"{stub.url}/v1/text-to-speech/stub-voice/stream?output_format=pcm_22050"
+    fast_output = lambda rate, channels, pull: clocked_output(rate, channels, pull, speed=10.0)
+
+    def remote(first_byte_timeout):
+        def speak(text):
+            StreamingPlayer(output=fast_output).play(http_chunks(url, {"text": text}), first_byte_timeout)
+            return True
+        return speak
+
+    def local(text):
+        time.sleep(0.05)  # Stand-in for pyttsx3
+
+    scenarios = [("healthy", dict(first_byte_delay=0.05, fail_status=None)),
+                 ("slow", dict(first_byte_delay=1.5, fail_status=None)),
+                 ("failing", dict(first_byte_delay=0.3, fail_status=500))]
+    utterances = 8
+
+    for name, settings in scenarios:
+        for key, value in settings.items():
+            setattr(stub, key, value)
+        row = []
+        for label, speaker in (
+                ("try remote, then local", FailoverSpeaker(remote(None), local, CircuitBreaker(failure_threshold=10**9))),
+                ("deadline + breaker", FailoverSpeaker(remote(0.4), local, CircuitBreaker(3, cooldown=60)))):
+            start = time.perf_counter()
+            backends = [speaker.speak("Opening chrome") for _ in range(utterances)]
+            per_utterance = (time.perf_counter() - start) * 1000 / utterances
+            row.append(f"{label}: {per_utterance:7.1f} ms ({backends.count('remote')} remote)")
+        print(f"{name:8s} " + " | ".join(row))
+    stub.stop()
@@ -0,0 +1,262 @@
+"""
+Streaming TTS playback for Friday Assistant
+Plays 16-bit PCM while the rest of it is still downloading, through a bounded
+jitter buffer that absorbs uneven network delivery
+"""
+
+import json
+import time
+import threading
+import urllib.request
+from collections import namedtuple
+
+try:
+    import sounddevice as sd
+    SOUNDDEVICE_AVAILABLE = True
+except ImportError:
+    SOUNDDEVICE_AVAILABLE = False
+
+SAMPLE_WIDTH = 2  # int16
+
+PlaybackStats = namedtuple("PlaybackStats", ["first_audio", "total", "underruns", "bytes"])
+
+
+class FirstByteTimeout(Exception):
+    """No audio arrived before the deadline"""
+
+
+class OutputStalled(Exception):
+    """The audio device stopped asking for data"""
+
+
+class JitterBuffer:
+    """Bounded byte FIFO between the network producer and the audio callback
+
+    put() blocks while the buffer is full; read() never blocks and pads with
+    silence on underrun, since it runs on the audio thread.
+    """
+    def __init__(self, prebuffer_bytes, max_bytes):
+        self.prebuffer_bytes = prebuffer_bytes
+        self.max_bytes = max(max_bytes, prebuffer_bytes)
+        self.data = bytearray()
+        self.cond = threading.Condition()
+        self.closed = False
+        self.cancelled = False
+        self.error = None
+        self.received = 0
+        self.underruns = 0
+
+    def put(self, chunk):
+        """Append a chunk; returns False if playback was cancelled"""
+        with self.cond:
+            while len(self.data) >= self.max_bytes and not self.cancelled:
+                self.cond.wait()
+            if self.cancelled:
+                return False
+            self.data += chunk
+            self.received += len(chunk)
+            self.cond.notify_all()
+            return True
+
+    def close(self, error=None):
+        """No more data is coming (error is set if the producer failed)"""
+        with self.cond:
+            self.closed = True
+            self.error = error
+            self.cond.notify_all()
+
+    def cancel(self):
+        with self.cond:
+            self.cancelled = True
+            self.data.clear()
+            self.cond.notify_all()
+
+    def wait_for_data(self, timeout=None):
+        """Block until the first bytes arrive or the stream ended; False on timeout"""
+        with self.cond:
+            return self.cond.wait_for(lambda: self.received or self.closed or self.cancelled, timeout)
+
+    def wait_ready(self, timeout=None):
+        """Block until enough audio is buffered to start, or the stream ended"""
+        with self.cond:
+            return self.cond.wait_for(
+                lambda: len(self.data) >= self.prebuffer_bytes or self.closed or self.cancelled, timeout)
+
+    def read(self, nbytes):
+        """Exactly nbytes of audio (silence-padded) and whether playback is done"""
+        with self.cond:
+            size = min(nbytes, len(self.data))
+            size -= size % SAMPLE_WIDTH
+            chunk = bytes(self.data[:size])
+            del self.data[:size]
+            done = self.cancelled or (self.closed and not self.data)
+            if size < nbytes and not done:
+                self.underruns += 1
+            self.cond.notify_all()
+        return chunk + b"\0" * (nbytes - size), done
+
+
+class PersistentOutput:
+    """One output stream kept open across utterances
+
+    Opening a device stream per utterance costs tens of milliseconds, so the
+    stream stays running and plays silence while idle. play() hands it a pull
+    function and waits on an event the audio callback sets when that source is done.
+    If the callback stops firing for stall_timeout seconds (default: 20 blocks,
+    at least a second) the stream is reset and OutputStalled is raised.
+    """
+    def __init__(self, blocksize=1024, stall_timeout=None):
+        self.blocksize = blocksize
+        self.stall_timeout = stall_timeout
+        self.stream = None
+        self.format = None
+        self.source = None  # (pull, finished event)
+        self.last_callback = 0.0
+        self.lock = threading.Lock()  # One utterance at a time
+
+    def _callback(self, outdata, frames, time_info, status):
+        self.last_callback = time.monotonic()
+        source = self.source
+        if source is None:
+            outdata[:] = b"\0" * len(outdata)
+            return
+        pull, finished = source
+        data, done = pull(len(outdata))
+        outdata[:] = data
+        if done:
+            self.source = None
+            finished.set()
+
+    def _ensure_stream(self, sample_rate, channels):
+        if self.stream is not None and self.format == (sample_rate, channels):
+            return
+        self.close()
+        self.stream = sd.RawOutputStream(samplerate=sample_rate, channels=channels, dtype='int16',
+                                         blocksize=self.blocksize, callback=self._callback)
+        self.stream.start()
+        self.format = (sample_rate, channels)
+
+    def play(self, sample_rate, channels, pull):
+        """Play pull()ed audio until it reports done"""
+        finished = threading.Event()
+        stall_timeout = self.stall_timeout or max(1.0, 20 * self.blocksize / sample_rate)
+        with self.lock:
+            self._ensure_stream(sample_rate, channels)
+            self.last_callback = time.monotonic()
+            self.source = (pull, finished)
+            while not finished.wait(stall_timeout / 4):
+                if time.monotonic() - self.last_callback > stall_timeout:
+                    self.source = None
+                    self.close(abort=True)  # Reopened on the next play
+                    raise OutputStalled(f"No audio callback for {stall_timeout:.1f}s")
+
+    def close(self, abort=False):
+        if self.stream is not None:
+            try:
+                # abort() drops queued buffers instead of waiting for a stuck device to drain them
+                self.stream.abort() if abort else self.stream.stop()
+                self.stream.close()
+            except Exception:
+                pass
+            self.stream = None
+            self.format = None
+
+
+def clocked_output(sample_rate, channels, pull, blocksize=1024, speed=1.0):
+    """Consume audio at (speed x) real time without a sound card - for benchmarks"""
+    block_bytes = blocksize * channels * SAMPLE_WIDTH
+    block_seconds = blocksize / sample_rate / speed
+    next_block = time.perf_counter()
+    while True:
+        _, done = pull(block_bytes)
+        if done:
+            return
+        next_block += block_seconds
+        time.sleep(max(0.0, next_block - time.perf_counter()))
+
+
+class StreamingPlayer:
+    """Starts playback once prebuffer_ms of audio has arrived"""
+    def __init__(self, sample_rate=22050, channels=1, prebuffer_ms=200, buffer_ms=3000, output=None):
+        self.sample_rate = sample_rate
+        self.channels = channels
+        bytes_per_ms = sample_rate * channels * SAMPLE_WIDTH / 1000
+        self.prebuffer_bytes = int(prebuffer_ms * bytes_per_ms)
+        self.max_bytes = int(buffer_ms * bytes_per_ms)
+        self.output = output or PersistentOutput().play
+        self.current = None
+
+    def _produce(self, chunks, buffer):
+        try:
+            for chunk in chunks:
+                if chunk and not buffer.put(chunk):
+                    break
+            buffer.close()
+        except Exception as e:
+            buffer.close(e)
+
+    def play(self, chunks, first_byte_timeout=None):
+        """Play an iterable of PCM chunks; blocks until done, returns PlaybackStats
+
+        Raises the producer's error if it failed - before any audio arrived, or once
+        the audio received up to the failure has played - and FirstByteTimeout if
+        nothing arrived within first_byte_timeout seconds.
+        """
+        start = time.perf_counter()
+        buffer = JitterBuffer(self.prebuffer_bytes, self.max_bytes)
+        self.current = buffer
+        threading.Thread(target=self._produce, args=(chunks, buffer), daemon=True, name="tts-stream").start()
+        try:
+            if not buffer.wait_for_data(first_byte_timeout):
+                buffer.cancel()  # The producer stops at its next chunk
+                raise FirstByteTimeout(f"No audio after {first_byte_timeout}s")
+            buffer.wait_ready()
+            if buffer.error and not buffer.received:
+                raise buffer.error
+            first_audio = time.perf_counter() - start
+            if buffer.received:
+                self.output(self.sample_rate, self.channels, buffer.read)
+            if buffer.error:
+                raise buffer.error  # Cut off mid-stream - the reply was not spoken in full
+            return PlaybackStats(first_audio, time.perf_counter() - start, buffer.underruns, buffer.received)
+        finally:
+            buffer.cancel()  # Releases the producer if playback ended early (stop, stall, error)
+            self.current = None
+
+    def stop(self):
+        """Cut off whatever is playing"""
+        if self.current:
+            self.current.cancel()
+
+
+def http_chunks(url, payload, headers=None, chunk_size=4096, timeout=10):
+    """POST JSON and yield the response body as it arrives"""
+    request = urllib.request.Request(url, data=json.dumps(payload).encode("utf-8"), method="POST",
+                                     headers={"Content-Type": "application/json", **(headers or {})})
+    with urllib.request.urlopen(request, timeout=timeout) as response:
+        while True:
+            chunk = response.read1(chunk_size) if hasattr(response, "read1") else response.read(chunk_size)
+            if not chunk:
+                return
+            yield chunk
+
+
+if __name__ == "__main__":
+    # Time-to-first-audio: download-then-play versus streaming, against the stub server
+    from tts_stub_server import StubTTSServer, tone_pcm
+
+    stub = StubTTSServer(tone_pcm(3.0), chunk_size=4096, first_byte_delay=0.15, chunk_delay=0.04).start()
+    url = f"{stub.url}/v1/text-to-speech/stub-voice/stream?output_format=pcm_22050"
+    payload = {"text": "Hello! I'm Friday, your advanced AI assistant."}
+
+    start = time.perf_counter()
+    audio = b"".join(http_chunks(url, payload))
+    download = time.perf_counter() - start
+    buffered_first = download + StreamingPlayer(output=clocked_output).play([audio]).first_audio
+
+    streamed = StreamingPlayer(output=clocked_output).play(http_chunks(url, payload))
+    stub.stop()
+
+    print(f"{len(audio)} bytes of audio, {stub.chunk_delay * 1000:.0f} ms between chunks")
+    print(f"  download then play: first audio after {buffered_first * 1000:7.1f} ms")
+    print(f"  streaming:          first audio after {streamed.first_audio * 1000:7.1f} ms ({streamed.underruns} underruns)")
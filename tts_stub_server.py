@@ -0,0 +1,108 @@
+"""
+Local stand-in for the ElevenLabs text-to-speech API
+Streams canned PCM audio with controllable delays and failures, so streaming
+playback and failover can be exercised without a network or an API key
+"""
+
+import re
+import json
+import math
+import time
+import threading
+from array import array
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+TTS_PATH = re.compile(r"^/v1/text-to-speech/([^/?]+)(/stream)?")
+
+
+def tone_pcm(seconds, sample_rate=22050, frequency=440.0):
+    """16-bit mono sine tone - the canned "speech" the stub returns"""
+    samples = array('h', (int(8000 * math.sin(2 * math.pi * frequency * i / sample_rate))
+                          for i in range(int(seconds * sample_rate))))
+    return samples.tobytes()
+
+
+class StubTTSServer:
+    """HTTP server answering POST /v1/text-to-speech/<voice_id>[/stream]
+
+    first_byte_delay and chunk_delay are in seconds; per_char_delay adds render
+    time that grows with the request text. fail_status makes every request fail
+    with that HTTP status. All can be changed while running.
+    """
+    def __init__(self, audio=None, chunk_size=4096, first_byte_delay=0.0, chunk_delay=0.0, fail_status=None,
+                 per_char_delay=0.0):
+        self.audio = audio if audio is not None else tone_pcm(1.0)
+        self.chunk_size = chunk_size
+        self.first_byte_delay = first_byte_delay
+        self.per_char_delay = per_char_delay
+        self.chunk_delay = chunk_delay
+        self.fail_status = fail_status
+        self.requests = 0
+        self.server = None
+        self.thread = None
+
+    def _handler(self):
+        stub = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.0"  # Body ends when the connection closes
+
+            def log_message(self, format, *args):
+                pass
+
+            def do_POST(self):
+                stub.requests += 1
+                body = self.rfile.read(int(self.headers.get("Content-Length") or 0))
+                if not TTS_PATH.match(self.path):
+                    self.send_error(404)
+                    return
+                try:
+                    text = json.loads(body or b"{}").get("text", "")
+                except ValueError:
+                    text = ""
+                time.sleep(stub.first_byte_delay + stub.per_char_delay * len(text))
+                if stub.fail_status:
+                    self.send_error(stub.fail_status)
+                    return
+                self.send_response(200)
+                self.send_header("Content-Type", "audio/pcm")
+                self.end_headers()
+                try:
+                    for start in range(0, len(stub.audio), stub.chunk_size):
+                        if start:
+                            time.sleep(stub.chunk_delay)
+                        self.wfile.write(stub.audio[start:start + stub.chunk_size])
+                        self.wfile.flush()
+                except (BrokenPipeError, ConnectionResetError):
+                    pass  # Client gave up - fine for a stub
+
+        return Handler
+
+    @property
+    def url(self):
+        host, port = self.server.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def start(self):
+        self.server = ThreadingHTTPServer(("127.0.0.1", 0), self._handler())
+        self.server.daemon_threads = True
+        self.thread = threading.Thread(target=self.server.serve_forever, daemon=True, name="tts-stub")
+        self.thread.start()
+        return self
+
+    def stop(self):
+        if self.server:
+            self.server.shutdown()
+            self.server.server_close()
+            self.server = None
+
+
+if __name__ == "__main__":
+    # Run standalone and point elevenlabs_config.json's "base_url" at it
+    stub = StubTTSServer(tone_pcm(2.0), first_byte_delay=0.3, chunk_delay=0.05).start()
+    print(f"Stub TTS server on {stub.url} - Ctrl+C to stop")
+    try:
+        while True:
+            time.sleep(1)
+    except KeyboardInterrupt:
+        stub.stop()
@@ -0,0 +1,291 @@
+"""
+Usage pattern storage for Friday Assistant's contextual intelligence
+Keeps a fixed 24-bucket hour histogram per app and per command in memory;
+updates are O(1) and get written behind in periodic atomic flushes
+"""
+
+import os
+import json
+import time
+import threading
+from collections import Counter
+
+HOURS = 24
+VERSION = 2
+
+
+def _empty_buckets():
+    return [0] * HOURS
+
+
+class HourlyTopK:
+    """Per-hour top-k apps by recency-weighted launch count
+
+    Uses forward decay: each launch adds 2 ** ((now - t0) / half_life), so newer
+    launches weigh more without ever touching older scores. Only the launched app's
+    score changes on an update, which keeps each hour's top-k list exact.
+    """
+    def __init__(self, k=5, half_life_days=14, t0=None):
+        self.k = k
+        self.half_life = half_life_days * 86400
+        self.t0 = t0 if t0 is not None else time.time()
+        self.scores = [{} for _ in range(HOURS)]  # hour -> {app: score}
+        self.top = [[] for _ in range(HOURS)]     # hour -> apps, best first
+
+    def _weight(self, now):
+        return 2.0 ** ((now - self.t0) / self.half_life)
+
+    def _rescale(self, now):
+        # Keep weights in floating point range by moving t0 forward
+        factor = self._weight(now)
+        for hour_scores in self.scores:
+            for app in hour_scores:
+                hour_scores[app] /= factor
+        self.t0 = now
+
+    def add(self, app, hour, now=None, count=1):
+        now = now if now is not None else time.time()
+        if now - self.t0 > 100 * self.half_life:
+            self._rescale(now)
+        scores = self.scores[hour]
+        scores[app] = scores.get(app, 0.0) + count * self._weight(now)
+
+        top = self.top[hour]
+        if app in top:
+            top.sort(key=scores.__getitem__, reverse=True)
+        elif len(top) < self.k or scores[app] > scores[top[-1]]:
+            top.append(app)
+            top.sort(key=scores.__getitem__, reverse=True)
+            del top[self.k:]
+
+    def suggest(self, hour, limit=None):
+        """Best apps for an hour - O(k)"""
+        return self.top[hour][:limit or self.k]
+
+    def to_dict(self):
+        return {'t0': self.t0, 'scores': [dict(h) for h in self.scores]}
+
+    @classmethod
+    def from_dict(cls, data, k=5, half_life_days=14):
+        index = cls(k, half_life_days, t0=data['t0'])
+        for hour, hour_scores in enumerate(data['scores'][:HOURS]):
+            index.scores[hour] = dict(hour_scores)
+            index.top[hour] = sorted(hour_scores, key=hour_scores.__getitem__, reverse=True)[:k]
+        return index
+
+
+class UsageStore:
+    """Bounded per-hour usage counters with write-behind persistence"""
+    def __init__(self, path="usage_patterns.json", flush_interval=30, top_k=5, half_life_days=14):
+        self.path = path
+        self.top_k = top_k
+        self.half_life_days = half_life_days
+        self.suggestions = HourlyTopK(top_k, half_life_days)
+        self.flush_interval = flush_interval
+        self.lock = threading.Lock()
+        self.dirty = False
+        self.stop_event = threading.Event()
+        self.flush_thread = None
+        self.hourly = _empty_buckets()
+        self.apps = {}       # name -> 24 hour buckets
+        self.commands = {}   # name -> 24 hour buckets
+        self.kinds = {}      # launch target -> kind ('app', 'folder') it was last launched as
+        # Totals migrated from the old format, which had no per-hour breakdown
+        self.legacy = {'apps': {}, 'commands': {}}
+        self.needs_seed = False  # Loaded a file without kinds - see seed_suggestions
+        self.load()
+
+    # === Persistence ===
+
+    def load(self):
+        try:
+            if not os.path.exists(self.path):
+                return
+            with open(self.path, 'r') as f:
+                data = json.load(f)
+        except Exception as e:
+            print(f"Could not load usage patterns: {e}")
+            return
+
+        if data.get('version') == VERSION:
+            self.hourly = (data.get('hourly_usage') or _empty_buckets())[:HOURS]
+            self.apps = data.get('apps', {})
+            self.commands = data.get('commands', {})
+            self.legacy = data.get('legacy', {'apps': {}, 'commands': {}})
+        else:
+            self._migrate(data)
+            self.dirty = True  # Rewrite in the new format on the next flush
+
+        if 'kinds' in data:
+            self.kinds = data['kinds']
+            if data.get('suggestions'):
+                self.suggestions = HourlyTopK.from_dict(data['suggestions'], self.top_k, self.half_life_days)
+        else:
+            # Older files counted the target of every command (searches, files, settings) as an
+            # app and recorded no kinds - their suggestions are rebuilt by seed_suggestions
+            self.needs_seed = bool(self.apps)
+
+    def seed_suggestions(self, is_app):
+        """Rebuild the suggestion index from the per-app hour buckets of an older file
+
+        Only names accepted by is_app are kept, as kind 'app'. The old counts have no
+        timestamps, so they weigh as launches made when the store was created.
+        Returns the number of apps seeded.
+        """
+        with self.lock:
+            if not self.needs_seed:
+                return 0
+            self.needs_seed = False
+            seeded = 0
+            for name, buckets in self.apps.items():
+                if name in self.kinds or not is_app(name):
+                    continue
+                self.kinds[name] = 'app'
+                for hour, count in enumerate(buckets):
+                    if count:
+                        self.suggestions.add(name, hour, now=self.suggestions.t0, count=count)
+                seeded += 1
+            if seeded:
+                self.dirty = True
+            return seeded
+
+    def _migrate(self, data):
+        """Convert the old layout with an ever-growing 'hours' list per app"""
+        for hour, count in data.get('hourly_usage', {}).items():
+            try:
+                self.hourly[int(hour) % HOURS] += count
+            except ValueError:
+                continue
+        for app, info in data.get('app_usage', {}).items():
+            buckets = _empty_buckets()
+            for hour, count in Counter(info.get('hours', [])).items():
+                buckets[int(hour) % HOURS] += count
+            self.apps[app] = buckets
+            extra = info.get('count', 0) - sum(buckets)
+            if extra > 0:
+                self.legacy['apps'][app] = extra
+        for command, count in data.get('command_frequency', {}).items():
+            self.commands[command] = _empty_buckets()
+            self.legacy['commands'][command] = count
+
+    def flush(self):
+        """Write to disk if anything changed (temp file + rename)"""
+        with self.lock:
+            if not self.dirty:
+                return False
+            data = {
+                'version': VERSION,
+                'hourly_usage': list(self.hourly),
+                'apps': {name: list(b) for name, b in self.apps.items()},
+                'commands': {name: list(b) for name, b in self.commands.items()},
+                'legacy': {kind: dict(v) for kind, v in self.legacy.items()},
+                'suggestions': self.suggestions.to_dict(),
+                'kinds': dict(self.kinds),
+            }
+            self.dirty = False
+        try:
+            tmp_path = self.path + ".tmp"
+            with open(tmp_path, 'w') as f:
+                json.dump(data, f)
+            os.replace(tmp_path, self.path)
+            return True
+        except Exception as e:
+            print(f"Could not save usage patterns: {e}")
+            with self.lock:
+                self.dirty = True
+            return False
+
+    def _flush_loop(self):
+        while not self.stop_event.wait(self.flush_interval):
+            self.flush()
+
+    def _ensure_flusher(self):
+        if self.flush_thread is None:
+            self.flush_thread = threading.Thread(target=self._flush_loop, daemon=True, name="usage-flush")
+            self.flush_thread.start()
+
+    def close(self):
+        self.stop_event.set()
+        self.flush()
+
+    # === Updates and queries ===
+
+    def record(self, command, app_name=None, hour=0, kind=None):
+        """Count one command and its target in the given hour - no I/O
+
+        Only targets with a launch kind ('app', 'folder') feed the suggestions.
+        """
+        with self.lock:
+            self.hourly[hour] += 1
+            self.commands.setdefault(command, _empty_buckets())[hour] += 1
+            if app_name:
+                self.apps.setdefault(app_name, _empty_buckets())[hour] += 1
+                if kind:
+                    self.kinds[app_name] = kind
+                    self.suggestions.add(app_name, hour)
+            self.dirty = True
+        self._ensure_flusher()
+
+    def app_count(self, app_name):
+        buckets = self.apps.get(app_name)
+        return (sum(buckets) if buckets else 0) + self.legacy['apps'].get(app_name, 0)
+
+    def command_count(self, command):
+        buckets = self.commands.get(command)
+        return (sum(buckets) if buckets else 0) + self.legacy['commands'].get(command, 0)
+
+    def app_hour_count(self, app_name, hour):
+        buckets = self.apps.get(app_name)
+        return buckets[hour] if buckets else 0
+
+    def suggest_apps(self, hour, limit=3):
+        """Top apps for an hour, most used (recently) first"""
+        with self.lock:
+            return self.suggestions.suggest(hour, limit)
+
+    def suggest_targets(self, hour, limit=3):
+        """Top launch targets for an hour as (kind, name), most used (recently) first"""
+        with self.lock:
+            return [(self.kinds[name], name) for name in self.suggestions.suggest(hour, limit) if name in self.kinds]
+
+
+if __name__ == "__main__":
+    # Suggestion latency after tens of thousands of logged launches
+    import random
+    import tempfile
+
+    launches = 50000
+    apps = [f"app_{i}" for i in range(300)]
+    rng = random.Random(42)
+    log = [(rng.choice(apps[:rng.choice([10, 50, 300])]), rng.randrange(HOURS)) for _ in range(launches)]
+
+    # Old layout: one hours list per app, linear membership test, full sort
+    old = {}
+    start = time.perf_counter()
+    for app, hour in log:
+        entry = old.setdefault(app, {'count': 0, 'hours': []})
+        entry['count'] += 1
+        entry['hours'].append(hour)
+    old_log_us = (time.perf_counter() - start) * 1e6 / launches
+
+    start = time.perf_counter()
+    for hour in range(HOURS):
+        found = [(app, d['count']) for app, d in old.items() if hour in d['hours']]
+        found.sort(key=lambda x: x[1], reverse=True)
+    old_suggest_ms = (time.perf_counter() - start) * 1000 / HOURS
+
+    store = UsageStore(os.path.join(tempfile.mkdtemp(), "usage.json"), flush_interval=3600)
+    start = time.perf_counter()
+    for app, hour in log:
+        store.record("open_app", app, hour, kind="app")
+    new_log_us = (time.perf_counter() - start) * 1e6 / launches
+
+    start = time.perf_counter()
+    for hour in range(HOURS):
+        store.suggest_apps(hour, 3)
+    new_suggest_ms = (time.perf_counter() - start) * 1000 / HOURS
+    store.close()
+
+    print(f"{launches} launches over {len(apps)} apps")
+    print(f"  old: log {old_log_us:6.2f} us, suggest {old_suggest_ms:8.3f} ms (+ full JSON rewrite per log)")
+    print(f"  new: log {new_log_us:6.2f} us, suggest {new_suggest_ms:8.3f} ms")
@@ -0,0 +1,135 @@
+"""
+Cached audio endpoint session for Friday Assistant
+Activates the speaker endpoint once and reuses it for every volume command,
+re-acquiring it only when the device goes away
+"""
+
+import time
+import threading
+
+try:
+    from pycaw.pycaw import AudioUtilities, IAudioEndpointVolume
+    from comtypes import CLSCTX_ALL, COMError
+    from ctypes import cast, POINTER
+    PYCAW_AVAILABLE = True
+except ImportError:
+    PYCAW_AVAILABLE = False
+    COMError = OSError
+
+
+class VolumeEndpoint:
+    """Master volume of one output device, as a 0.0-1.0 scalar"""
+    def get_scalar(self):
+        raise NotImplementedError
+
+    def set_scalar(self, value):
+        raise NotImplementedError
+
+
+class PycawEndpoint(VolumeEndpoint):
+    """Windows default speakers through pycaw / Core Audio"""
+    def __init__(self):
+        devices = AudioUtilities.GetSpeakers()
+        interface = devices.Activate(IAudioEndpointVolume._iid_, CLSCTX_ALL, None)
+        self.volume = cast(interface, POINTER(IAudioEndpointVolume))
+
+    def get_scalar(self):
+        return self.volume.GetMasterScalarVolume()
+
+    def set_scalar(self, value):
+        self.volume.SetMasterScalarVolume(value, None)
+
+
+class FakeEndpoint(VolumeEndpoint):
+    """In-memory endpoint for exercising VolumeSession off Windows"""
+    activations = 0
+
+    def __init__(self, activation_cost=0.0, state=None):
+        FakeEndpoint.activations += 1
+        time.sleep(activation_cost)  # Stand-in for COM device activation
+        self.state = state if state is not None else {'value': 0.5, 'fail_next': 0}
+        self.calls = 0
+
+    def _check(self):
+        self.calls += 1
+        if self.state['fail_next']:
+            # Simulate the device being unplugged or switched
+            self.state['fail_next'] -= 1
+            raise OSError("device invalidated")
+
+    def get_scalar(self):
+        self._check()
+        return self.state['value']
+
+    def set_scalar(self, value):
+        self._check()
+        self.state['value'] = value
+
+
+class VolumeSession:
+    """Holds an activated endpoint per thread and re-acquires it on device errors"""
+    def __init__(self, endpoint_factory=None):
+        self.endpoint_factory = endpoint_factory or PycawEndpoint
+        self.local = threading.local()  # COM interfaces belong to the thread that created them
+        self.activations = 0
+
+    def _endpoint(self, refresh=False):
+        endpoint = getattr(self.local, "endpoint", None)
+        if endpoint is None or refresh:
+            endpoint = self.endpoint_factory()
+            self.local.endpoint = endpoint
+            self.activations += 1
+        return endpoint
+
+    def _call(self, operation):
+        try:
+            return operation(self._endpoint())
+        except (COMError, OSError):
+            # Default device changed or disappeared - activate again and retry once
+            return operation(self._endpoint(refresh=True))
+
+    def get(self):
+        """Current volume (0-100)"""
+        return int(round(self._call(lambda ep: ep.get_scalar()) * 100))
+
+    def set(self, level):
+        level = min(100, max(0, level))
+        self._call(lambda ep: ep.set_scalar(level / 100.0))
+        return level
+
+    def adjust(self, delta):
+        """Change the volume by delta percent in one go; returns the new level"""
+        def operation(ep):
+            level = min(100, max(0, int(round(ep.get_scalar() * 100)) + delta))
+            ep.set_scalar(level / 100.0)
+            return level
+        return self._call(operation)
+
+
+if __name__ == "__main__":
+    # "Turn volume up" before and after, with a fake 20 ms device activation
+    runs = 50
+    cost = 0.02
+
+    FakeEndpoint.activations = 0
+    state = {'value': 0.5, 'fail_next': 0}
+    start = time.perf_counter()
+    for _ in range(runs):
+        # Old path: get_volume() and set_volume() each activate the device
+        current = int(FakeEndpoint(cost, state).get_scalar() * 100)
+        FakeEndpoint(cost, state).set_scalar(min(100, current + 1) / 100.0)
+    old_ms = (time.perf_counter() - start) * 1000 / runs
+    old_activations = FakeEndpoint.activations
+
+    FakeEndpoint.activations = 0
+    state = {'value': 0.5, 'fail_next': 0}
+    session = VolumeSession(lambda: FakeEndpoint(cost, state))
+    start = time.perf_counter()
+    for i in range(runs):
+        if i == runs // 2:
+            state['fail_next'] = 1  # Device change halfway through
+        session.adjust(1)
+    new_ms = (time.perf_counter() - start) * 1000 / runs
+
+    print(f"per-call activation: {old_ms:6.2f} ms/command, {old_activations} activations")
+    print(f"VolumeSession:       {new_ms:6.2f} ms/command, {session.activations} activations")